@@ -0,0 +1,36 @@
+import copy
+
+from game.caravan.enums import CaravanId
+from game.moves.types import DiscardCaravan
+from game.engine.apply import apply_move
+from network.shared.card_ids import CardIdMap
+from network.shared.deserializers import payload_to_game_state
+from network.shared.serializers import game_state_to_payload
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_REPEAT = 2000
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	card_ids = CardIdMap()
+
+	def clone_and_change_one_caravan() -> None:
+		clone = state.clone(copy_on_write=True)
+		owned_caravan = next(caravan_id for caravan_id in CaravanId if caravan_id.owner == clone.current_player)
+		apply_move(clone, DiscardCaravan(player_id=clone.current_player, caravan_id=owned_caravan))
+
+	timings = {
+		"copy.deepcopy": time_per_call(lambda: copy.deepcopy(state), _REPEAT),
+		"payload round trip": time_per_call(lambda: payload_to_game_state(game_state_to_payload(state, card_ids), card_ids),
+											 _REPEAT),
+		"GameState.clone": time_per_call(lambda: state.clone(), _REPEAT),
+		"GameState.clone (copy-on-write)": time_per_call(lambda: state.clone(copy_on_write=True), _REPEAT),
+		"copy-on-write + one caravan move": time_per_call(clone_and_change_one_caravan, _REPEAT),
+	}
+
+	print_timings(f"Cloning a state at turn {state.turn_number}:", timings)
+
+
+if __name__ == "__main__":
+	main()
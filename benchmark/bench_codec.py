@@ -0,0 +1,33 @@
+import json
+
+from network.shared.card_ids import CardIdMap
+from network.shared.codec import encode_game_state, decode_game_state
+from network.shared.deserializers import payload_to_game_state
+from network.shared.serializers import game_state_to_payload
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_REPEAT = 500
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	buffer = bytearray()
+	card_ids = CardIdMap()
+
+	message = json.dumps(game_state_to_payload(state, card_ids))
+	data = bytes(encode_game_state(state, buffer))
+
+	timings = {
+		"JSON encode": time_per_call(lambda: json.dumps(game_state_to_payload(state, card_ids)), _REPEAT),
+		"JSON decode": time_per_call(lambda: payload_to_game_state(json.loads(message), card_ids), _REPEAT),
+		"binary encode": time_per_call(lambda: encode_game_state(state, buffer), _REPEAT),
+		"binary decode": time_per_call(lambda: decode_game_state(data), _REPEAT),
+	}
+
+	print_timings(f"Encoding a state at turn {state.turn_number}:", timings)
+	print(f"JSON: {len(message.encode())} bytes, binary: {len(data)} bytes "
+		  f"({len(message.encode()) / len(data):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+	main()
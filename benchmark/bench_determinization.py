@@ -0,0 +1,50 @@
+from numpy.random import Generator, default_rng
+
+from game.player.enums import PlayerId
+from game.search.determinization import DeterminizationSampler
+from game.state.game_state import GameState
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_SAMPLES = 64
+_REPEAT = 50
+
+
+# One sample at a time: a clone of the state, shuffled piles and every hidden card placed again in the index.
+def _determinize_one_by_one(state: GameState, observer: PlayerId, rng: Generator) -> GameState:
+	determinization = state.clone(copy_on_write=True)
+
+	for player_id, player in determinization.players.items():
+		hand_size = len(player.hand)
+		cards = player.deck if player_id == observer else player.deck + list(player.hand.values())
+		rng.shuffle(cards)
+
+		if player_id != observer:
+			player.hand = {card.id: card for card in cards[:hand_size]}
+			player.deck = cards[hand_size:]
+
+			for card in player.hand.values():
+				determinization.card_index.place_in_hand(card, player_id)
+
+		for position, card in enumerate(player.deck):
+			determinization.card_index.place_in_deck(card, player_id, position)
+
+	return determinization
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	observer = state.current_player
+	rng = default_rng(0)
+
+	timings = {
+		"clone + shuffle per sample": time_per_call(
+			lambda: [_determinize_one_by_one(state, observer, rng) for _ in range(_SAMPLES)], _REPEAT),
+		"DeterminizationSampler": time_per_call(
+			lambda: DeterminizationSampler(state, observer).sample(_SAMPLES, rng), _REPEAT),
+	}
+
+	print_timings(f"Sampling {_SAMPLES} determinizations at turn {state.turn_number}:", timings)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,30 @@
+import json
+
+import numpy as np
+
+from game.state.encoding import ENCODING_SIZE, encode_state
+from network.shared.card_ids import CardIdMap
+from network.shared.serializers import game_state_to_payload
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_REPEAT = 2000
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	out = np.zeros(ENCODING_SIZE, dtype=np.float32)
+	card_ids = CardIdMap()
+
+	timings = {
+		"game_state_to_payload": time_per_call(lambda: game_state_to_payload(state, card_ids), _REPEAT),
+		"encode_state": time_per_call(lambda: encode_state(state, state.current_player), _REPEAT),
+		"encode_state (preallocated)": time_per_call(lambda: encode_state(state, state.current_player, out), _REPEAT),
+	}
+
+	print_timings(f"Encoding a state at turn {state.turn_number}:", timings)
+	print(f"\tpayload {len(json.dumps(game_state_to_payload(state, card_ids)))} bytes of JSON, encoding {out.nbytes} bytes "
+		  f"as float32 or {ENCODING_SIZE} as int8")
+
+
+if __name__ == "__main__":
+	main()
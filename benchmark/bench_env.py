@@ -0,0 +1,39 @@
+import os
+import time
+
+from numpy.random import default_rng
+
+from game.env.vec_env import VecEnv
+from game.vector.actions import DISCARD_CARAVAN_OFFSET, sample_action_indices
+
+_ENV_COUNT = 64
+_STEPS = 100
+
+
+def _env_steps_per_second(workers: int) -> float:
+	rng = default_rng(0)
+
+	with VecEnv(_ENV_COUNT, seed=0, workers=workers) as vec_env:
+		vec_env.reset()
+		start = time.perf_counter()
+
+		for _ in range(_STEPS):
+			# Caravan discards and concessions are left out, so that games last.
+			vec_env.step(sample_action_indices(vec_env.buffers.action_masks[:, :DISCARD_CARAVAN_OFFSET], rng))
+
+		return _ENV_COUNT * _STEPS / (time.perf_counter() - start)
+
+
+def main() -> None:
+	worker_counts = [0] + [2 ** power for power in range((os.cpu_count() or 1).bit_length())]
+	rates = {workers: _env_steps_per_second(workers) for workers in worker_counts}
+
+	print(f"Stepping {_ENV_COUNT} environments, opponent moves included:")
+
+	for workers, rate in rates.items():
+		name = "in-process" if workers == 0 else f"{workers} worker{'s' if workers > 1 else ''}"
+		print(f"\t{name:<32} {rate:>12,.0f} env-steps/s  {rate / rates[0]:>7.1f}x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,59 @@
+import tracemalloc
+from dataclasses import dataclass, field
+
+from game.caravan.enums import CaravanId
+from game.cards.card_id import CardId
+from game.moves.types import MoveType, PlayCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import generate_legal_moves
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_MOVE_COUNT = 1_000_000
+_REPEAT = 5
+
+
+# How moves were declared before they had slots, as a baseline.
+@dataclass(frozen=True)
+class _DictPlayCard:
+	player_id: PlayerId
+	card_id: CardId
+	caravan_id: CaravanId
+	move_type: MoveType = field(init=False, default=MoveType.PLAY_BASE)
+
+
+def _create_moves(move_class: type) -> list:
+	return [move_class(player_id=PlayerId.P1, card_id=card_id, caravan_id=CaravanId.P1_A)
+			for card_id in range(_MOVE_COUNT)]
+
+
+def _bytes_per_move(move_class: type) -> float:
+	tracemalloc.start()
+	moves = _create_moves(move_class)
+	allocated, _ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	return allocated / len(moves)
+
+
+def main() -> None:
+	print(f"Creating {_MOVE_COUNT:,} moves:")
+
+	for move_class in (_DictPlayCard, PlayCard):
+		seconds = time_per_call(lambda: _create_moves(move_class), _REPEAT)
+		print(f"\t{move_class.__name__:<16} {seconds * 1e9 / _MOVE_COUNT:>8.1f} ns/move  "
+			  f"{_bytes_per_move(move_class):>8.1f} B/move")
+
+	state = create_mid_game_state()
+	caravans = list(state.caravans.values())
+
+	timings = {
+		"caravan direction and suit": time_per_call(
+			lambda: [(caravan.direction, caravan.current_suit) for caravan in caravans], 20000),
+		"generate_legal_moves": time_per_call(lambda: generate_legal_moves(state), 20000),
+	}
+
+	print_timings(f"Reading a state at turn {state.turn_number}:", timings)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,53 @@
+from game.engine.apply import make_move
+from game.engine.journal import undo_move
+from game.rules.legal_moves import generate_legal_moves
+from game.search.symmetry import canonicalize, apply_symmetry
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.game_state import GameState
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_REPEAT = 500
+
+
+# Positions two moves on, counted once per Zobrist hash and once per canonical key.
+def _count_positions(state: GameState) -> tuple[int, int]:
+	hashes = set()
+	keys = set()
+
+	for move in generate_legal_moves(state):
+		_, record = make_move(state, move)
+
+		for reply in generate_legal_moves(state):
+			_, reply_record = make_move(state, reply)
+			hashes.add(state.zobrist_hash)
+			keys.add(canonicalize(state).key)
+			undo_move(state, reply_record)
+
+		undo_move(state, record)
+
+	return len(hashes), len(keys)
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	symmetry = canonicalize(state).symmetry
+
+	timings = {
+		"compute_zobrist_hash": time_per_call(state.compute_zobrist_hash, _REPEAT),
+		"canonicalize": time_per_call(lambda: canonicalize(state), _REPEAT),
+		"apply_symmetry": time_per_call(lambda: apply_symmetry(state, symmetry), _REPEAT),
+	}
+
+	print_timings(f"Canonical form of a state at turn {state.turn_number}:", timings)
+
+	for name, counted_state in (("Setup", init_game(GameConfig(deck_builder=build_standard_deck))),
+								("Mid game", state)):
+		position_count, class_count = _count_positions(counted_state)
+		print(f"{name}: {position_count} positions two moves on, {class_count} up to symmetry "
+			  f"({position_count / class_count:.2f}x fewer table entries)")
+
+
+if __name__ == "__main__":
+	main()
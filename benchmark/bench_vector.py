@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+from numpy.random import Generator, default_rng
+
+from game.engine.apply import apply_move
+from game.moves.types import MoveType
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.vector.actions import ACTION_COUNT, DISCARD_CARAVAN_OFFSET, legal_action_masks, decode_actions, \
+	sample_action_indices
+from game.vector.batch import GameBatch, create_batch
+from game.vector.engine import reset_games, step_batch
+
+_BATCH_SIZE = 4096
+_STEPS = 200
+_PYTHON_MOVES = 20000
+
+
+# A uniformly random legal action per game, leaving caravan discards and concessions to games without another one.
+def _pick_actions(batch: GameBatch, masks: np.ndarray, rng: Generator) -> np.ndarray:
+	legal_action_masks(batch, out=masks)
+	masks[:, DISCARD_CARAVAN_OFFSET:] = False
+
+	return decode_actions(batch, sample_action_indices(masks, rng))
+
+
+def _python_moves_per_second() -> float:
+	rng = default_rng(0)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=rng))
+	seconds = 0.0
+
+	for _ in range(_PYTHON_MOVES):
+		if state.game_phase == GamePhase.FINISHED:
+			state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=rng))
+
+		move = sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0})
+
+		start = time.perf_counter()
+		apply_move(state, move)
+		seconds += time.perf_counter() - start
+
+	return _PYTHON_MOVES / seconds
+
+
+def _batch_moves_per_second() -> tuple[float, float]:
+	rng = default_rng(0)
+	batch = create_batch(_BATCH_SIZE)
+	reset_games(batch, np.arange(_BATCH_SIZE), rng)
+	masks = np.zeros((_BATCH_SIZE, ACTION_COUNT), dtype=bool)
+	seconds = 0.0
+	mask_seconds = 0.0
+	moves = 0
+
+	for _ in range(_STEPS):
+		finished = np.flatnonzero(batch.phases == GamePhase.FINISHED)
+		reset_games(batch, finished, rng)
+
+		start = time.perf_counter()
+		actions = _pick_actions(batch, masks, rng)
+		mask_seconds += time.perf_counter() - start
+
+		start = time.perf_counter()
+		step_result = step_batch(batch, actions)
+		seconds += time.perf_counter() - start
+		moves += _BATCH_SIZE - int(step_result.illegal.sum())
+
+	return moves / seconds, _BATCH_SIZE * _STEPS / mask_seconds
+
+
+def main() -> None:
+	python_rate = _python_moves_per_second()
+	batch_rate, mask_rate = _batch_moves_per_second()
+
+	print("Applying moves, move choice excluded:")
+	print(f"\t{'apply_move':<32} {python_rate:>12,.0f} moves/s")
+	print(f"\t{f'step_batch ({_BATCH_SIZE} games)':<32} {batch_rate:>12,.0f} moves/s  {batch_rate / python_rate:>7.1f}x")
+
+	print("Choosing moves from the legality masks:")
+	print(f"\t{f'masks + sampling ({_BATCH_SIZE} games)':<32} {mask_rate:>12,.0f} moves/s")
+
+
+if __name__ == "__main__":
+	main()
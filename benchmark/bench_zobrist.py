@@ -0,0 +1,27 @@
+from game.engine.apply import make_move
+from game.engine.journal import undo_move
+from game.rules.legal_moves import generate_legal_moves
+from benchmark.functions import create_mid_game_state, time_per_call, print_timings
+
+_REPEAT = 2000
+
+
+def main() -> None:
+	state = create_mid_game_state()
+	move = generate_legal_moves(state)[0]
+
+	def make_and_undo() -> None:
+		_, record = make_move(state, move)
+		undo_move(state, record)
+
+	timings = {
+		"compute_zobrist_hash": time_per_call(state.compute_zobrist_hash, _REPEAT),
+		"make + undo (hash kept up to date)": time_per_call(make_and_undo, _REPEAT),
+		"zobrist_hash": time_per_call(lambda: state.zobrist_hash, _REPEAT),
+	}
+
+	print_timings(f"Hashing a state at turn {state.turn_number}:", timings)
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,57 @@
+import time
+from typing import Callable
+
+from numpy.random import Generator, default_rng
+
+from game.engine.apply import apply_move
+from game.moves.types import Move, DiscardCaravan, Concede
+from game.rules.legal_moves import generate_legal_moves
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+
+
+def _pick_move(state: GameState, rng: Generator) -> Move | None:
+	moves = [move for move in generate_legal_moves(state) if not isinstance(move, (DiscardCaravan, Concede))]
+
+	if not moves:
+		return None
+
+	return moves[rng.integers(len(moves))]
+
+
+# A game some way past setup, with face cards on the caravans, to benchmark against.
+def create_mid_game_state(seed: int = 42, moves: int = 30) -> GameState:
+	rng = default_rng(seed)
+
+	while True:
+		state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=rng))
+
+		for _ in range(moves):
+			move = _pick_move(state, rng)
+
+			if move is None or apply_move(state, move) is not None:
+				break
+
+		if state.game_phase == GamePhase.MAIN:
+			return state
+
+
+def time_per_call(fn: Callable[[], object], repeat: int) -> float:
+	start = time.perf_counter()
+
+	for _ in range(repeat):
+		fn()
+
+	return (time.perf_counter() - start) / repeat
+
+
+def print_timings(title: str, timings: dict[str, float]) -> None:
+	baseline = max(timings.values())
+
+	print(title)
+
+	for name, seconds in timings.items():
+		print(f"\t{name:<32} {seconds * 1e6:>10.1f} µs/call  {baseline / seconds:>7.1f}x")
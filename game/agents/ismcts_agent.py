@@ -0,0 +1,235 @@
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from numpy.random import Generator, default_rng
+
+from game.engine.apply import apply_move
+from game.engine.victory import get_route_winner_caravans
+from game.moves.types import Move, MoveType, Concede
+from game.player.enums import PlayerId
+from game.rules.legal_moves import generate_legal_moves, sample_legal_move
+from game.search.determinization import DeterminizationSampler
+from game.search.endgame import is_endgame, solve_endgame
+from game.search.transposition import TranspositionTable
+from game.state.enums import GamePhase
+from game.state.game_state import GameState, GameResult
+from network.shared.codec import encode_game_state, decode_game_state
+
+# Leaves room under a 200ms decision for merging the statistics of parallel searches.
+DEFAULT_TIME_BUDGET = 0.15
+DEFAULT_EXPLORATION = 0.7
+# Random games mostly run out of cards after more than 100 moves, so rollouts stop early and the position is scored.
+_ROLLOUT_PLIES = 20
+_ROLLOUT_WEIGHTS = {MoveType.CONCEDE: 0.0}
+# Determinizations are sampled this many at a time, each iteration playing on its own.
+_DETERMINIZATION_BATCH = 16
+
+
+@dataclass(slots=True, eq=False)
+class _Node:
+	# Player who made the move leading to this node, who the rewards are counted for.
+	player_id: PlayerId | None
+	visits: int = field(default=0)
+	# Iterations in which the move was legal, as determinizations do not all allow the same moves.
+	availability: int = field(default=0)
+	reward: float = field(default=0.0)
+	children: dict[Move, '_Node'] = field(default_factory=dict)
+
+
+# Concessions are only searched when nothing else is possible.
+def _get_tree_moves(state: GameState) -> list[Move]:
+	moves = [move for move in generate_legal_moves(state) if not isinstance(move, Concede)]
+
+	return moves or [Concede(player_id=state.current_player)]
+
+
+# Share of the routes held by P1, for games stopped before their end.
+def _score_position(state: GameState) -> float:
+	balance = sum(1 if caravan_id.owner == PlayerId.P1 else -1 for caravan_id in get_route_winner_caravans(state))
+
+	return 0.5 + balance / 6
+
+
+def _rollout(state: GameState, rng: Generator) -> float:
+	for _ in range(_ROLLOUT_PLIES):
+		move = sample_legal_move(state, rng, _ROLLOUT_WEIGHTS) or Concede(player_id=state.current_player)
+		game_result = apply_move(state, move)
+
+		if game_result is not None:
+			return _get_result_reward(game_result)
+
+	return _score_position(state)
+
+
+def _get_result_reward(game_result: GameResult) -> float:
+	return 1.0 if game_result.winner_id == PlayerId.P1 else 0.0
+
+
+def _select_move(node: _Node, moves: list[Move], exploration: float) -> Move:
+	def upper_bound(move: Move) -> float:
+		child = node.children[move]
+
+		return child.reward / child.visits + exploration * math.sqrt(math.log(child.availability) / child.visits)
+
+	return max(moves, key=upper_bound)
+
+
+def _run_iteration(root: _Node, state: GameState, rng: Generator, exploration: float) -> None:
+	node = root
+	path = list()
+	game_result = None
+
+	while game_result is None and state.game_phase != GamePhase.FINISHED:
+		moves = _get_tree_moves(state)
+		untried = [move for move in moves if move not in node.children]
+
+		for move in moves:
+			if move in node.children:
+				node.children[move].availability += 1
+
+		if untried:
+			move = untried[rng.integers(len(untried))]
+			node.children[move] = _Node(player_id=state.current_player, availability=1)
+		else:
+			move = _select_move(node, moves, exploration)
+
+		node = node.children[move]
+		path.append(node)
+		game_result = apply_move(state, move)
+
+		if untried:
+			break
+
+	if game_result is not None:
+		p1_reward = _get_result_reward(game_result)
+	elif state.game_phase == GamePhase.FINISHED:
+		p1_reward = 0.5
+	else:
+		p1_reward = _rollout(state, rng)
+
+	for visited_node in path:
+		visited_node.visits += 1
+		visited_node.reward += p1_reward if visited_node.player_id == PlayerId.P1 else 1.0 - p1_reward
+
+
+# Visits of every root move, after "iterations" iterations or once "time.monotonic()" passes "deadline", whichever
+# comes first. At least one iteration is run.
+def search(state: GameState, rng: Generator, *,
+		   iterations: int | None = None,
+		   deadline: float | None = None,
+		   exploration: float = DEFAULT_EXPLORATION) -> dict[Move, int]:
+	root = _Node(player_id=None)
+	sampler = DeterminizationSampler(state, state.current_player)
+	determinizations = list()
+	iteration = 0
+
+	while True:
+		if not determinizations:
+			determinizations = sampler.sample(_DETERMINIZATION_BATCH, rng)
+
+		_run_iteration(root, determinizations.pop(), rng, exploration)
+		iteration += 1
+
+		if iterations is not None and iteration >= iterations:
+			break
+
+		if deadline is not None and time.monotonic() >= deadline:
+			break
+
+	return {move: child.visits for move, child in root.children.items()}
+
+
+def _search_with_seed(state: GameState, seed: int, iterations: int | None, deadline: float | None,
+					  exploration: float) -> dict[Move, int]:
+	return search(state, default_rng(seed), iterations=iterations, deadline=deadline, exploration=exploration)
+
+
+# Workers are sent the codec bytes of the state, a few hundred bytes, rather than a pickle of the whole GameState with
+# its card index, journal and caches, and rebuild the state on their side.
+def _search_encoded(data: bytes, seed: int, iterations: int | None, deadline: float | None,
+					exploration: float) -> dict[Move, int]:
+	return _search_with_seed(decode_game_state(data), seed, iterations, deadline, exploration)
+
+
+def _warm_up() -> None:
+	pass
+
+
+# Information set Monte Carlo tree search, a "GetMoveFn". With "workers" above 1, as many trees are searched at once,
+# one here and the others in a pool kept for the agent's lifetime, and the move visited most across all trees is played.
+# The pool is started with the agent, so that starting processes does not eat into the first decision's budget, and
+# is shut down by "close". Without "iterations", every decision takes "time_budget" seconds. Endgames are solved
+# exactly when time allows.
+class IsmctsAgent:
+	def __init__(self, rng: Generator, *,
+				 iterations: int | None = None,
+				 time_budget: float = DEFAULT_TIME_BUDGET,
+				 workers: int = 1,
+				 exploration: float = DEFAULT_EXPLORATION) -> None:
+		self.rng = rng
+		self.iterations = iterations
+		self.time_budget = time_budget
+		self.workers = workers
+		self.exploration = exploration
+
+		self._executor: ProcessPoolExecutor | None = None
+
+		if workers > 1:
+			self._executor = ProcessPoolExecutor(max_workers=workers - 1)
+
+			# Every task is sent before any is done, so that each one starts a process of its own.
+			for future in [self._executor.submit(_warm_up) for _ in range(workers - 1)]:
+				future.result()
+
+		# Kept from one decision to the next, as the positions of an endgame keep coming back.
+		self._endgame_table = TranspositionTable()
+
+	def __call__(self, state: GameState) -> Move:
+		moves = _get_tree_moves(state)
+
+		if len(moves) == 1:
+			return moves[0]
+
+		start = time.monotonic()
+
+		# Nothing is hidden once both decks are empty, the game is solved instead, given half of the time.
+		if is_endgame(state):
+			self._endgame_table.new_search()
+			solution = solve_endgame(state, start + self.time_budget / 2, self._endgame_table)
+
+			if solution is not None:
+				return solution.move
+
+		# Shared by every tree, "time.monotonic" being the same clock in every process.
+		deadline = start + self.time_budget if self.iterations is None else None
+		seeds = self.rng.integers(2 ** 63, size=self.workers)
+
+		futures = list()
+
+		if self._executor is not None:
+			data = bytes(encode_game_state(state))
+			futures = [self._executor.submit(_search_encoded, data, int(seed), self.iterations, deadline,
+											 self.exploration)
+					   for seed in seeds[1:]]
+
+		visits = _search_with_seed(state, int(seeds[0]), self.iterations, deadline, self.exploration)
+
+		for future in futures:
+			for move, move_visits in future.result().items():
+				visits[move] = visits.get(move, 0) + move_visits
+
+		return max(visits, key=visits.get)
+
+	def close(self) -> None:
+		if self._executor is not None:
+			self._executor.shutdown()
+			self._executor = None
+
+
+def make_ismcts_agent(rng: Generator, *,
+					  iterations: int | None = None,
+					  time_budget: float = DEFAULT_TIME_BUDGET,
+					  workers: int = 1) -> IsmctsAgent:
+	return IsmctsAgent(rng, iterations=iterations, time_budget=time_budget, workers=workers)
@@ -0,0 +1,23 @@
+from numpy.random import Generator
+
+from game.engine.loop import GetMoveFn
+from game.moves.types import Move, MoveType, Concede
+from game.rules.legal_moves import sample_legal_move
+from game.state.game_state import GameState
+
+# Conceding ends a game before anything interesting happens, so it is left out unless weighted back in.
+_DEFAULT_WEIGHTS = {MoveType.CONCEDE: 0.0}
+
+
+def make_random_agent(rng: Generator, weights: dict[MoveType, float] | None = None) -> GetMoveFn:
+	move_weights = _DEFAULT_WEIGHTS if weights is None else weights
+
+	def _get_move(state: GameState) -> Move:
+		move = sample_legal_move(state, rng, move_weights)
+
+		if move is None:
+			return Concede(player_id=state.current_player)
+
+		return move
+
+	return _get_move
@@ -0,0 +1,16 @@
+from collections.abc import Callable
+
+from numpy.random import Generator
+
+from game.agents.ismcts_agent import make_ismcts_agent
+from game.agents.random_agent import make_random_agent
+from game.engine.loop import GetMoveFn
+
+type AgentFactory = Callable[[Generator], GetMoveFn]
+
+# Agents are picked by name, as only names can be handed to worker processes, e.g. by "game.simulation.simulate" and
+# "game.env.vec_env".
+AGENT_FACTORIES: dict[str, AgentFactory] = {
+	"random": make_random_agent,
+	"ismcts": make_ismcts_agent,
+}
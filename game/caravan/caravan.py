@@ -1,16 +1,40 @@
 from dataclasses import dataclass, field
-from typing import Callable
-from uuid import UUID
+from typing import Callable, Protocol
 
 from game.caravan.enums import Direction, CaravanId
 from game.cards.card import Card, PlayedCard
-from game.cards.enums import Suit, Rank
+from game.cards.card_id import CardId
+from game.cards.enums import Suit
+
+
+# Notified after every change to a caravan's pile, so that state kept outside the caravan can follow it.
+class CaravanListener(Protocol):
+	# Called once the card is in, the cards from "position" upwards have already moved up.
+	def on_base_card_added(self, caravan: 'Caravan', position: int) -> None: ...
+
+	def on_face_card_attached(self, caravan: 'Caravan', played_card: PlayedCard, face_card: Card) -> None: ...
+
+	def on_face_card_detached(self, caravan: 'Caravan', played_card: PlayedCard, face_card: Card) -> None: ...
+
+	# Called once the card has been taken out, the cards above "position" have already moved down.
+	def on_base_card_removed(self, caravan: 'Caravan', position: int, played_card: PlayedCard) -> None: ...
 
 
 @dataclass
 class Caravan:
 	id: CaravanId
 	pile: list[PlayedCard] = field(default_factory=list)
+	# Running total of the pile's score. Only the methods below mutate the pile, and each of them keeps this in sync.
+	_score: int = field(default=0, init=False, repr=False, compare=False)
+	# Base card id -> position of its PlayedCard in the pile, so targets are found without scanning the pile.
+	_positions: dict[CardId, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+	# Set by the GameState holding the caravan.
+	listener: CaravanListener | None = field(default=None, init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		# A pile can be passed in already built, e.g. by "network.shared.deserializers".
+		self._score = sum(played_card.score for played_card in self.pile)
+		self._positions = {played_card.base_card.id: position for position, played_card in enumerate(self.pile)}
 
 	@property
 	def top_card(self) -> PlayedCard | None:
@@ -54,42 +78,124 @@ class Caravan:
 
 	@property
 	def score(self) -> int:
-		score = 0
+		return self._score
+
+	# The clone is not bound to any listener, the GameState taking it sets its own.
+	def clone(self) -> 'Caravan':
+		caravan = Caravan.__new__(Caravan)
+		caravan.id = self.id
+		caravan.pile = [played_card.clone() for played_card in self.pile]
+		caravan._score = self._score
+		caravan._positions = dict(self._positions)
+		caravan.listener = None
+
+		return caravan
+
+	def has_base_card(self, base_card_id: CardId) -> bool:
+		return base_card_id in self._positions
 
-		for card in self.pile:
-			card_value = card.base_card.base_value
-			kings = sum(1 for face_card in card.attachments if face_card.rank == Rank.KING)
-			# Score of a numeric card is multiplied by 2 for each King attached.
-			# Ex: 3 with 2 Kings -> 3 * 2 * 2 = 12.
-			score += card_value * (2 ** kings)
+	def get_position(self, base_card_id: CardId) -> int | None:
+		return self._positions.get(base_card_id)
 
-		return score
+	def get_played_card(self, base_card_id: CardId) -> PlayedCard | None:
+		position = self._positions.get(base_card_id)
+
+		return self.pile[position] if position is not None else None
 
 	def add_base_card(self, card: Card) -> None:
 		if not card.rank.is_numeric:
 			# TODO: Check raised errors later.
 			raise ValueError("Base cards in caravan must be ACE–TEN.")
 
-		self.pile.append(PlayedCard(base_card=card))
+		played_card = PlayedCard(base_card=card)
+
+		self._positions[card.id] = len(self.pile)
+		self.pile.append(played_card)
+		self._score += played_card.score
 
-	def attach(self, target_card_id: UUID, face_card: Card) -> None:
+		if self.listener is not None:
+			self.listener.on_base_card_added(self, len(self.pile) - 1)
+
+	def attach(self, target_card_id: CardId, face_card: Card) -> None:
 		if face_card.rank.is_numeric:
 			# TODO: Check raised errors later.
 			raise ValueError("Face cards in caravan must be JACK-KING or JOKER.")
 
-		for played_card in self.pile:
-			if played_card.base_card.id == target_card_id:
-				played_card.attachments.append(face_card)
-				return
+		played_card = self.get_played_card(target_card_id)
+
+		if played_card is None:
+			# TODO: Check raised errors later.
+			raise KeyError(f"Target card id {target_card_id} not found in pile")
+
+		previous_score = played_card.score
+		played_card.attach(face_card)
+		self._score += played_card.score - previous_score
+
+		if self.listener is not None:
+			self.listener.on_face_card_attached(self, played_card, face_card)
+
+	def insert_played_card(self, position: int, played_card: PlayedCard) -> None:
+		# Puts back a card taken out by "remove_base_card", attachments included, e.g. when a move is undone.
+		self.pile.insert(position, played_card)
+		self._score += played_card.score
 
-		# TODO: Check raised errors later.
-		raise KeyError(f"Target card id {target_card_id} not found in pile")
+		for shifted_position in range(position, len(self.pile)):
+			self._positions[self.pile[shifted_position].base_card.id] = shifted_position
 
-	def remove_base_card(self, target_base_id: UUID) -> None:
-		self.pile = [played_card for played_card in self.pile if played_card.base_card.id != target_base_id]
+		if self.listener is not None:
+			self.listener.on_base_card_added(self, position)
+
+	def detach_last(self, target_card_id: CardId) -> Card:
+		played_card = self.get_played_card(target_card_id)
+
+		if played_card is None or not played_card.attachments:
+			# TODO: Check raised errors later.
+			raise KeyError(f"Target card id {target_card_id} has no attachments in pile")
+
+		previous_score = played_card.score
+		face_card = played_card.detach_last()
+		self._score += played_card.score - previous_score
+
+		if self.listener is not None:
+			self.listener.on_face_card_detached(self, played_card, face_card)
+
+		return face_card
+
+	def _remove_at(self, position: int) -> PlayedCard:
+		played_card = self.pile.pop(position)
+
+		del self._positions[played_card.base_card.id]
+		self._score -= played_card.score
+
+		# Only the cards after the removed one have moved.
+		for shifted_position in range(position, len(self.pile)):
+			self._positions[self.pile[shifted_position].base_card.id] = shifted_position
+
+		if self.listener is not None:
+			self.listener.on_base_card_removed(self, position, played_card)
+
+		return played_card
+
+	def remove_base_card(self, target_base_id: CardId) -> PlayedCard | None:
+		position = self._positions.get(target_base_id)
+
+		if position is None:
+			return None
+
+		return self._remove_at(position)
 
 	def remove_base_cards_where(self, predicate: Callable[[Card], bool]) -> None:
-		self.pile = [played_card for played_card in self.pile if not predicate(played_card.base_card)]
+		# Removing from the top down keeps the positions of the cards still to be checked valid.
+		for position in range(len(self.pile) - 1, -1, -1):
+			if predicate(self.pile[position].base_card):
+				self._remove_at(position)
 
 	def discard_caravan(self) -> None:
+		if self.listener is not None:
+			# Taking the cards off one by one from the top lets the listener follow each of them without any card moving.
+			for position in range(len(self.pile) - 1, -1, -1):
+				self._remove_at(position)
+
 		self.pile.clear()
+		self._positions.clear()
+		self._score = 0
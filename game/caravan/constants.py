@@ -0,0 +1,5 @@
+from game.caravan.enums import CaravanId
+
+CARAVAN_COUNT = len(CaravanId)
+# Base cards in a caravan all come from its owner's 40 numeric cards.
+MAX_PILE = 40
@@ -26,13 +26,20 @@ class CaravanId(IntEnum):
 
 	@property
 	def owner(self) -> PlayerId:
-		return PlayerId.P1 if self in {CaravanId.P1_A, CaravanId.P1_B, CaravanId.P1_C} else PlayerId.P2
+		return _CARAVAN_OWNERS[self]
 
 	@property
 	def route(self) -> RouteId:
-		if self in {CaravanId.P1_A, CaravanId.P2_A}:
-			return RouteId.A
-		elif self in {CaravanId.P1_B, CaravanId.P2_B}:
-			return RouteId.B
-		else:
-			return RouteId.C
+		return _CARAVAN_ROUTES[self]
+
+
+_CARAVAN_OWNERS = {
+	CaravanId.P1_A: PlayerId.P1, CaravanId.P1_B: PlayerId.P1, CaravanId.P1_C: PlayerId.P1,
+	CaravanId.P2_A: PlayerId.P2, CaravanId.P2_B: PlayerId.P2, CaravanId.P2_C: PlayerId.P2,
+}
+
+_CARAVAN_ROUTES = {
+	CaravanId.P1_A: RouteId.A, CaravanId.P2_A: RouteId.A,
+	CaravanId.P1_B: RouteId.B, CaravanId.P2_B: RouteId.B,
+	CaravanId.P1_C: RouteId.C, CaravanId.P2_C: RouteId.C,
+}
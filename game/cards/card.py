@@ -1,13 +1,13 @@
 from dataclasses import dataclass, field
-from uuid import UUID
 
+from game.cards.card_id import CardId
 from game.cards.enums import Rank, Suit
 
 
 # frozen=True, Card instances cannot change their values, modifications will not alter base values.
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Card:
-	id: UUID
+	id: CardId
 	rank: Rank
 	# 'None' for joker.
 	suit: Suit | None
@@ -31,21 +31,73 @@ class Card:
 		return f"{rank_name}{suit_name}"
 
 
-@dataclass()
+@dataclass(slots=True)
 class PlayedCard:
 	base_card: Card
 	attachments: list[Card] = field(default_factory=list)
-
+	# Counts below are kept up to date by "attach" and "detach_last", instead of rescanning the attachments every time a
+	# caravan's score, direction or suit is read.
+	king_count: int = field(default=0, init=False, repr=False, compare=False)
+	# Each King attached doubles the value of the base card.
+	king_multiplier: int = field(default=1, init=False, repr=False, compare=False)
 	# Count of queens is used to determine how the direction of the caravan is changed.
 	# Odd queens change direction, even queens revert direction to its original state.
-	@property
-	def queen_count(self) -> int:
-		return sum(1 for face_card in self.attachments if face_card.rank == Rank.QUEEN)
+	queen_count: int = field(default=0, init=False, repr=False, compare=False)
+	last_queen_suit: Suit | None = field(default=None, init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		self._count_face_cards()
+
+	def _count_face_cards(self) -> None:
+		self.king_count = 0
+		self.queen_count = 0
+		self.last_queen_suit = None
+
+		for face_card in self.attachments:
+			if face_card.rank == Rank.KING:
+				self.king_count += 1
+			elif face_card.rank == Rank.QUEEN:
+				self.queen_count += 1
+				self.last_queen_suit = face_card.suit
+
+		self.king_multiplier = 2 ** self.king_count
 
+	# Score of a numeric card is multiplied by 2 for each King attached.
+	# Ex: 3 with 2 Kings -> 3 * 2 * 2 = 12.
 	@property
-	def last_queen_suit(self) -> Suit | None:
-		for face_card in reversed(self.attachments):
-			if face_card.rank == Rank.QUEEN:
-				return face_card.suit
+	def score(self) -> int:
+		return self.base_card.base_value * self.king_multiplier
+
+	# Cards are immutable and shared with the clone, only the attachments list is copied.
+	def clone(self) -> 'PlayedCard':
+		played_card = PlayedCard.__new__(PlayedCard)
+		played_card.base_card = self.base_card
+		played_card.attachments = list(self.attachments)
+		played_card.king_count = self.king_count
+		played_card.king_multiplier = self.king_multiplier
+		played_card.queen_count = self.queen_count
+		played_card.last_queen_suit = self.last_queen_suit
+
+		return played_card
+
+	def attach(self, face_card: Card) -> None:
+		self.attachments.append(face_card)
+
+		if face_card.rank == Rank.KING:
+			self.king_count += 1
+			self.king_multiplier *= 2
+		elif face_card.rank == Rank.QUEEN:
+			self.queen_count += 1
+			self.last_queen_suit = face_card.suit
+
+	def detach_last(self) -> Card:
+		face_card = self.attachments.pop()
+
+		if face_card.rank == Rank.KING:
+			self.king_count -= 1
+			self.king_multiplier //= 2
+		elif face_card.rank == Rank.QUEEN:
+			# The Queen before it, if any, is only found again by looking through the attachments.
+			self._count_face_cards()
 
-		return None
+		return face_card
@@ -0,0 +1,32 @@
+from game.cards.enums import Rank, Suit
+from game.player.enums import PlayerId
+
+# Cards are identified by "owner * STANDARD_DECK_SIZE + index", with owner 0 for P1 and 1 for P2, and index the place of
+# the card in a standard deck: Ace to Jack of each suit in "Suit" order, then the two Jokers.
+type CardId = int
+
+STANDARD_DECK_SIZE = 54
+STANDARD_CARD_COUNT = STANDARD_DECK_SIZE * len(PlayerId)
+# Ids from here on are free for cards that are not part of a standard deck, e.g. in tests.
+FIRST_CUSTOM_CARD_ID = STANDARD_CARD_COUNT
+
+_STANDARD_DECK_LAYOUT: list[tuple[Rank, Suit | None]] = (
+		[(rank, suit) for suit in Suit for rank in Rank if rank != Rank.JOKER] + [(Rank.JOKER, None)] * 2)
+
+# Indexed by the id of a standard card.
+CARD_RANKS: tuple[Rank, ...] = tuple(rank for rank, _ in _STANDARD_DECK_LAYOUT) * len(PlayerId)
+CARD_SUITS: tuple[Suit | None, ...] = tuple(suit for _, suit in _STANDARD_DECK_LAYOUT) * len(PlayerId)
+# 0 for face cards, which have no base value.
+CARD_VALUES: tuple[int, ...] = tuple(rank.value if rank.is_numeric else 0 for rank in CARD_RANKS)
+
+
+def make_card_id(owner: PlayerId, index: int) -> CardId:
+	return (owner - PlayerId.P1) * STANDARD_DECK_SIZE + index
+
+
+def is_standard_card_id(card_id: CardId) -> bool:
+	return 0 <= card_id < STANDARD_CARD_COUNT
+
+
+def get_card_owner(card_id: CardId) -> PlayerId:
+	return PlayerId(card_id // STANDARD_DECK_SIZE + PlayerId.P1)
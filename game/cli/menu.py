@@ -1,6 +1,5 @@
-from uuid import UUID
-
 from game.caravan.enums import CaravanId
+from game.cards.card_id import CardId
 from game.moves.types import PlayCard, Move, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.state.game_state import GameState
 from game.cli.printer import print_player_hand_and_deck_count, print_routes, print_caravan_pile_with_indices
@@ -20,7 +19,7 @@ def _ask_int(min_input: int, max_input: int) -> int | None:
 		print("Choose within input range.")
 
 
-def _choose_card_from_hand(state: GameState) -> UUID:
+def _choose_card_from_hand(state: GameState) -> CardId:
 	current_player = state.players.get(state.current_player)
 
 	print("Choose card:")
@@ -51,7 +50,7 @@ def _choose_caravan(state: GameState, any_caravan=False) -> CaravanId:
 	return caravan_id_options[index]
 
 
-def _choose_target_base_card_from_caravan(state: GameState, caravan_id: CaravanId) -> UUID:
+def _choose_target_base_card_from_caravan(state: GameState, caravan_id: CaravanId) -> CardId:
 	caravan = state.get_caravan(caravan_id)
 
 	if caravan is None:
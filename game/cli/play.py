@@ -4,6 +4,7 @@ from game.cli.hooks import get_move_from_cli, on_turn_start_cli, on_error_cli
 from game.engine.dynamic_hooks import make_get_move_by_player, make_on_turn_start_by_player, make_on_error_by_player
 from game.engine.loop import run
 from game.player.enums import PlayerId
+from game.rules.constants import STARTING_HAND_SIZE
 from game.setup.deck_builder import build_standard_deck
 from game.setup.game_config import GameConfig
 from game.setup.game_initializer import init_game
@@ -12,7 +13,7 @@ from game.setup.game_initializer import init_game
 def main() -> None:
 	game_config = GameConfig(
 		deck_builder=build_standard_deck,
-		starting_hand_size=8,
+		starting_hand_size=STARTING_HAND_SIZE,
 		starting_player=PlayerId.P1,
 		shuffle_decks=True,
 		random_generator=default_rng(42)
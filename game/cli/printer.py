@@ -103,20 +103,14 @@ def print_applied_moves(state: GameState, move: Move) -> None:
 		caravan_id = move.caravan_id
 		caravan = state.get_caravan(caravan_id)
 
-		base = next(
-			(pc.base_card for pc in caravan.pile if pc.base_card.id == move.card_id),
-			None
-		)
-		card_name = base.get_name(full_name=True, suit_symbolized=False) if base else "<unknown card>"
+		played = caravan.get_played_card(move.card_id)
+		card_name = played.base_card.get_name(full_name=True, suit_symbolized=False) if played else "<unknown card>"
 
 		print(f"P{move.player_id} played {card_name} on Caravan P{caravan_id.owner}.{caravan_id.route.value}")
 	elif isinstance(move, AttachFaceCard):
 		caravan = state.get_caravan(move.caravan_id)
 
-		played = next(
-			(pc for pc in caravan.pile if pc.base_card.id == move.target_base_id),
-			None
-		)
+		played = caravan.get_played_card(move.target_base_id)
 		target_name = played.base_card.get_name(full_name=True, suit_symbolized=False) if played else "<unknown target>"
 
 		face = None
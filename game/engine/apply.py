@@ -1,15 +1,21 @@
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId
+from game.cards.card import Card
+from game.cards.card_id import CardId
 from game.cards.enums import Rank
 from game.engine.exceptions import IllegalMove
+from game.engine.journal import MoveRecord, RemovedBaseCard
 from game.engine.victory import check_victory
 from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.player.enums import PlayerId
 from game.rules.ruleset import can_play_base, can_attach_face, can_discard_card, can_discard_caravan, can_concede
+from game.state.card_index import CardZone
 from game.state.enums import GamePhase
 from game.state.functions import get_move_player
 from game.state.game_state import GameState, GameResult
 
 
-def _draw_one_if_possible(state: GameState, move: Move) -> None:
+def _draw_one_if_possible(state: GameState, move: Move, record: MoveRecord | None) -> None:
 	player = get_move_player(state, move)
 
 	if not player.deck or state.game_phase == GamePhase.SETUP:
@@ -17,8 +23,32 @@ def _draw_one_if_possible(state: GameState, move: Move) -> None:
 		# A player losing due to having no cards left, i.e. empty hand and empty deck, is handled in "game.engine.victory.check_victory".
 		return
 
-	new_card = player.deck.pop()
-	player.add_card_to_hand_card(new_card)
+	drawn_card = state.draw_card(move.player_id)
+
+	if record is not None:
+		record.drawn_card = drawn_card
+
+
+def _take_card_from_hand(state: GameState, move: PlayCard | AttachFaceCard | DiscardCard,
+						 record: MoveRecord | None) -> Card:
+	if record is not None:
+		record.hand_position = list(state.players[move.player_id].hand).index(move.card_id)
+
+	card = state.take_card_from_hand(move.player_id, move.card_id)
+
+	if record is not None:
+		record.hand_card = card
+
+	return card
+
+
+def _remove_base_card(caravan: Caravan, base_card_id: CardId, record: MoveRecord | None) -> None:
+	position = caravan.get_position(base_card_id)
+	played_card = caravan.remove_base_card(base_card_id)
+
+	if record is not None and played_card is not None:
+		record.removed_base_cards.append(RemovedBaseCard(caravan_id=caravan.id, position=position,
+														 played_card=played_card))
 
 
 def _setup_complete_for_player(state: GameState, player_id: PlayerId) -> bool:
@@ -41,65 +71,72 @@ def _setup_complete_for_both(state: GameState) -> bool:
 def _advance_after_play(state: GameState) -> None:
 	if state.game_phase == GamePhase.SETUP:
 		if _setup_complete_for_both(state):
-			state.game_phase = GamePhase.MAIN
+			state.set_game_phase(GamePhase.MAIN)
 
 	state.turn_number += 1
-	state.current_player = PlayerId.P2 if state.current_player == PlayerId.P1 else PlayerId.P1
+	state.set_current_player(PlayerId.P2 if state.current_player == PlayerId.P1 else PlayerId.P1)
 
 
-def _resolve_jack_effect(state: GameState, move: AttachFaceCard) -> None:
-	caravan = state.get_caravan(move.caravan_id)
+def _resolve_jack_effect(state: GameState, move: AttachFaceCard, record: MoveRecord | None) -> None:
+	caravan = state.get_mutable_caravan(move.caravan_id)
 
 	if not caravan:
 		return
 
-	caravan.remove_base_card(move.target_base_id)
+	_remove_base_card(caravan, move.target_base_id, record)
 
 
-def _resolve_joker_effect(state: GameState, move: AttachFaceCard) -> None:
-	caravan = state.get_caravan(move.caravan_id)
+def _resolve_joker_effect(state: GameState, move: AttachFaceCard, record: MoveRecord | None) -> None:
+	caravan = state.get_mutable_caravan(move.caravan_id)
 
 	if not caravan:
 		return
 
-	target_played_card = next(
-		(played_card for played_card in caravan.pile if played_card.base_card.id == move.target_base_id), None)
+	target_played_card = caravan.get_played_card(move.target_base_id)
 
 	if not target_played_card:
 		return
 
 	target_base_card = target_played_card.base_card
 
+	# Only cards sharing the suit (for an Ace) or the rank of the target are looked at, instead of every caravan pile.
 	if target_base_card.rank == Rank.ACE:
-		suit_to_remove = target_base_card.suit
+		matching_card_ids = state.card_index.card_ids_by_suit(target_base_card.suit)
+	else:
+		matching_card_ids = state.card_index.card_ids_by_rank(target_base_card.rank)
 
-		for caravan in state.caravans.values():
-			caravan.remove_base_cards_where(
-				lambda card: (card.id != move.target_base_id) and (card.suit == suit_to_remove) and card.rank.is_numeric
-			)
+	positions_to_remove: dict[CaravanId, list[int]] = {}
 
-	else:
-		rank_to_remove = target_base_card.rank
+	for card_id in matching_card_ids:
+		location = state.card_index.get_location(card_id)
+
+		# Face cards in caravans are in the attachment zone, so this also keeps only numeric cards.
+		if card_id == move.target_base_id or location.zone != CardZone.CARAVAN:
+			continue
+
+		positions_to_remove.setdefault(location.caravan_id, []).append(location.position)
 
-		for caravan in state.caravans.values():
-			caravan.remove_base_cards_where(
-				lambda card: (card.id != move.target_base_id) and (card.rank == rank_to_remove) and card.rank.is_numeric
-			)
+	for caravan_id, positions in positions_to_remove.items():
+		caravan = state.get_mutable_caravan(caravan_id)
 
+		# Removing from the top down keeps the remaining positions valid.
+		for position in sorted(positions, reverse=True):
+			_remove_base_card(caravan, caravan.pile[position].base_card.id, record)
 
-def _apply_play_base(state: GameState, move: PlayCard) -> GameResult | None:
+
+def _apply_play_base(state: GameState, move: PlayCard, record: MoveRecord | None) -> GameResult | None:
 	if not can_play_base(state, move):
 		# TODO: Check raised errors later.
 		raise IllegalMove("Play base move is not legal.")
 
 	player = get_move_player(state, move)
-	caravan = state.get_caravan(move.caravan_id)
+	caravan = state.get_mutable_caravan(move.caravan_id)
 
 	if player is None or caravan is None:
 		# TODO: Check raised errors later.
 		raise IllegalMove("Invalid player or caravan.")
 
-	played_card = player.hand.pop(move.card_id)
+	played_card = _take_card_from_hand(state, move, record)
 
 	caravan.add_base_card(played_card)
 
@@ -108,46 +145,46 @@ def _apply_play_base(state: GameState, move: PlayCard) -> GameResult | None:
 	if game_result is not None:
 		return game_result
 
-	_draw_one_if_possible(state, move)
+	_draw_one_if_possible(state, move, record)
 	_advance_after_play(state)
 
 	return None
 
 
-def _apply_attach_face_card(state: GameState, move: AttachFaceCard) -> GameResult | None:
+def _apply_attach_face_card(state: GameState, move: AttachFaceCard, record: MoveRecord | None) -> GameResult | None:
 	if not can_attach_face(state, move):
 		# TODO: Check raised errors later.
 		raise IllegalMove("Attach face move is not legal.")
 
 	player = get_move_player(state, move)
-	caravan = state.get_caravan(move.caravan_id)
+	caravan = state.get_mutable_caravan(move.caravan_id)
 
 	if player is None or caravan is None:
 		# TODO: Check raised errors later.
 		raise IllegalMove("Invalid player or caravan.")
 
-	face_card = player.hand.pop(move.card_id)
+	face_card = _take_card_from_hand(state, move, record)
 
 	caravan.attach(move.target_base_id, face_card)
 
 	if face_card.rank == Rank.JACK:
-		_resolve_jack_effect(state, move)
+		_resolve_jack_effect(state, move, record)
 
 	elif face_card.rank == Rank.JOKER:
-		_resolve_joker_effect(state, move)
+		_resolve_joker_effect(state, move, record)
 
 	game_result = check_victory(state)
 
 	if game_result is not None:
 		return game_result
 
-	_draw_one_if_possible(state, move)
+	_draw_one_if_possible(state, move, record)
 	_advance_after_play(state)
 
 	return None
 
 
-def _apply_discard_card(state: GameState, move: DiscardCard) -> GameResult | None:
+def _apply_discard_card(state: GameState, move: DiscardCard, record: MoveRecord | None) -> GameResult | None:
 	if not can_discard_card(state, move):
 		# TODO: Check raised errors later.
 		raise IllegalMove("Discard card move is not legal.")
@@ -158,30 +195,35 @@ def _apply_discard_card(state: GameState, move: DiscardCard) -> GameResult | Non
 		# TODO: Check raised errors later.
 		raise IllegalMove("Invalid player.")
 
-	player.hand.pop(move.card_id)
+	_take_card_from_hand(state, move, record)
 
 	game_result = check_victory(state)
 
 	if game_result is not None:
 		return game_result
 
-	_draw_one_if_possible(state, move)
+	_draw_one_if_possible(state, move, record)
 	_advance_after_play(state)
 
 	return None
 
 
-def _apply_discard_caravan(state: GameState, move: DiscardCaravan) -> GameResult | None:
+def _apply_discard_caravan(state: GameState, move: DiscardCaravan, record: MoveRecord | None) -> GameResult | None:
 	if not can_discard_caravan(state, move):
 		# TODO: Check raised errors later.
 		raise IllegalMove("Discard caravan move is not legal.")
 
-	caravan = state.get_caravan(move.caravan_id)
+	caravan = state.get_mutable_caravan(move.caravan_id)
 
 	if caravan is None:
 		# TODO: Check raised errors later.
 		raise IllegalMove("Invalid caravan.")
 
+	if record is not None:
+		for position in range(len(caravan.pile) - 1, -1, -1):
+			record.removed_base_cards.append(RemovedBaseCard(caravan_id=caravan.id, position=position,
+															 played_card=caravan.pile[position]))
+
 	caravan.discard_caravan()
 
 	game_result = check_victory(state)
@@ -194,7 +236,7 @@ def _apply_discard_caravan(state: GameState, move: DiscardCaravan) -> GameResult
 	return None
 
 
-def _apply_concede(state: GameState, move: Concede) -> GameResult | None:
+def _apply_concede(state: GameState, move: Concede, record: MoveRecord | None) -> GameResult | None:
 	if not can_concede(state, move):
 		# TODO: Check raised errors later.
 		raise IllegalMove("Concede move is not legal.")
@@ -207,19 +249,36 @@ def _apply_concede(state: GameState, move: Concede) -> GameResult | None:
 	return None
 
 
-def apply_move(state: GameState, move: Move) -> GameResult | None:
+# "record", when given, is filled with everything the move changes, see "make_move".
+def apply_move(state: GameState, move: Move, record: MoveRecord | None = None) -> GameResult | None:
 	if isinstance(move, PlayCard):
-		game_result = _apply_play_base(state, move)
+		game_result = _apply_play_base(state, move, record)
 	elif isinstance(move, AttachFaceCard):
-		game_result = _apply_attach_face_card(state, move)
+		game_result = _apply_attach_face_card(state, move, record)
 	elif isinstance(move, DiscardCard):
-		game_result = _apply_discard_card(state, move)
+		game_result = _apply_discard_card(state, move, record)
 	elif isinstance(move, DiscardCaravan):
-		game_result = _apply_discard_caravan(state, move)
+		game_result = _apply_discard_caravan(state, move, record)
 	elif isinstance(move, Concede):
-		game_result = _apply_concede(state, move)
+		game_result = _apply_concede(state, move, record)
 	else:
 		# TODO: Check raised errors later.
 		raise IllegalMove(f"Unsupported move: {type(move).__name__}")
 
 	return game_result
+
+
+# Same as "apply_move", but also returns what is needed to take the move back with "game.engine.journal.undo_move".
+# Lets a search go down and back up a line of play on a single state instead of copying it for every node.
+def make_move(state: GameState, move: Move) -> tuple[GameResult | None, MoveRecord]:
+	record = MoveRecord(
+		move=move,
+		previous_player=state.current_player,
+		previous_turn_number=state.turn_number,
+		previous_phase=state.game_phase,
+		previous_game_result=state.game_result,
+	)
+
+	game_result = apply_move(state, move, record)
+
+	return game_result, record
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+
+from game.caravan.enums import CaravanId
+from game.cards.card import Card, PlayedCard
+from game.moves.types import Move, PlayCard, AttachFaceCard
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase
+from game.state.game_state import GameState, GameResult
+
+
+@dataclass(slots=True)
+class RemovedBaseCard:
+	caravan_id: CaravanId
+	# Position the card had in the pile when it was removed.
+	position: int
+	played_card: PlayedCard
+
+
+# Everything "game.engine.apply.make_move" changed, so that "undo_move" can put the state back exactly as it was.
+@dataclass(slots=True)
+class MoveRecord:
+	move: Move
+	previous_player: PlayerId
+	previous_turn_number: int
+	previous_phase: GamePhase
+	previous_game_result: GameResult | None
+	hand_card: Card | None = field(default=None)
+	# Position of the played or discarded card in the hand, as hands keep their insertion order.
+	hand_position: int | None = field(default=None)
+	drawn_card: Card | None = field(default=None)
+	# In order of removal, by a Jack, a Joker or a caravan discard.
+	removed_base_cards: list[RemovedBaseCard] = field(default_factory=list)
+
+
+# Moves have to be undone in the reverse order they were made in.
+def undo_move(state: GameState, record: MoveRecord) -> None:
+	move = record.move
+
+	if record.drawn_card is not None:
+		state.return_card_to_deck(move.player_id, record.drawn_card.id)
+
+	for removed in reversed(record.removed_base_cards):
+		state.get_mutable_caravan(removed.caravan_id).insert_played_card(removed.position, removed.played_card)
+
+	if isinstance(move, PlayCard):
+		state.get_mutable_caravan(move.caravan_id).remove_base_card(move.card_id)
+	elif isinstance(move, AttachFaceCard):
+		# The removed cards are back in place by now, so a Jack's target is found again with the Jack still on it.
+		state.get_mutable_caravan(move.caravan_id).detach_last(move.target_base_id)
+
+	if record.hand_card is not None:
+		state.return_card_to_hand(move.player_id, record.hand_card, record.hand_position)
+
+	state.set_current_player(record.previous_player)
+	state.turn_number = record.previous_turn_number
+	state.set_game_phase(record.previous_phase)
+	state.game_result = record.previous_game_result
@@ -3,8 +3,9 @@ from typing import Callable
 
 from game.engine.apply import apply_move
 from game.engine.exceptions import IllegalMove
+from game.engine.victory import adjudicate
 from game.moves.types import Move
-from game.state.enums import GamePhase
+from game.state.enums import GamePhase, WinReason
 from game.state.game_state import GameResult, GameState
 
 
@@ -20,6 +21,9 @@ type OnErrorFn = Callable[[GameState, str], None]
 type OnAppliedFn = Callable[[GameState, Move], None]
 type OnGameEndFn = Callable[[GameState, GameResult], None]
 
+# Reasons of the games "run" stops before their end.
+CAPPED_REASONS = frozenset({WinReason.TURN_LIMIT, WinReason.REPETITION})
+
 
 def step(state: GameState, move: Move) -> StepResult:
 	if state.game_phase == GamePhase.FINISHED:
@@ -36,12 +40,38 @@ def step(state: GameState, move: Move) -> StepResult:
 	return StepResult()
 
 
+# Discarding a caravan draws no card, so players can go round in circles without the game ever ending. Positions are
+# told apart by "GameState.zobrist_hash", which leaves out the order of the decks, but decks only ever lose their top.
+# Rejected moves count toward "max_turns" as well, so that a player who only makes illegal moves cannot hold the game.
+def _get_cap_reason(state: GameState, max_turns: int | None, max_repetitions: int | None,
+					repetitions: dict[int, int], rejected_count: int = 0) -> WinReason | None:
+	if max_turns is not None and state.turn_number + rejected_count >= max_turns:
+		return WinReason.TURN_LIMIT
+
+	if max_repetitions is not None:
+		repetition_count = repetitions.get(state.zobrist_hash, 0) + 1
+		repetitions[state.zobrist_hash] = repetition_count
+
+		if repetition_count >= max_repetitions:
+			return WinReason.REPETITION
+
+	return None
+
+
 # Keyword argument force (*) added as future safety with optional function callables, so if some are removed, it is easier to adapt later on
+# Games reaching "max_turns", or a position for the "max_repetitions"-th time, are adjudicated with a reason of
+# CAPPED_REASONS.
 def run(state: GameState, get_move: GetMoveFn, *,
 		on_turn_start: OnTurnStartFn | None = None,
 		on_error: OnErrorFn | None = None,
 		on_applied: OnAppliedFn | None = None,
-		on_game_end: OnGameEndFn | None = None, ) -> GameResult:
+		on_game_end: OnGameEndFn | None = None,
+		max_turns: int | None = None,
+		max_repetitions: int | None = None, ) -> GameResult:
+	repetitions = dict()
+	rejected_count = 0
+	_get_cap_reason(state, None, max_repetitions, repetitions)
+
 	while state.game_phase != GamePhase.FINISHED:
 		if on_turn_start is not None:
 			on_turn_start(state)
@@ -54,15 +84,30 @@ def run(state: GameState, get_move: GetMoveFn, *,
 			if on_error is not None:
 				on_error(state, step_result.error)
 
-			continue
+			rejected_count += 1
+			# The position is unchanged, so it is not counted as repeated.
+			cap_reason = _get_cap_reason(state, max_turns, None, repetitions, rejected_count)
+
+			if cap_reason is None:
+				continue
+
+			game_result = adjudicate(state, cap_reason)
+		else:
+			if on_applied is not None:
+				on_applied(state, move)
+
+			game_result = step_result.game_result
+
+			if game_result is None:
+				cap_reason = _get_cap_reason(state, max_turns, max_repetitions, repetitions, rejected_count)
 
-		if on_applied is not None:
-			on_applied(state, move)
+				if cap_reason is not None:
+					game_result = adjudicate(state, cap_reason)
 
-		if step_result.game_result is not None:
+		if game_result is not None:
 			if on_game_end is not None:
-				on_game_end(state, step_result.game_result)
+				on_game_end(state, game_result)
 
-			return step_result.game_result
+			return game_result
 
 	raise RuntimeError("Game finished without returning a GameResult")
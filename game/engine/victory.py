@@ -43,6 +43,19 @@ def _route_winner_between(
 
 
 def _get_route_winner(state: GameState, route_id: RouteId) -> CaravanId | None:
+	route_winners = state.victory_cache.route_winners
+
+	# Only the routes whose caravans changed since the last check are compared again.
+	if route_id in route_winners:
+		return route_winners[route_id]
+
+	route_winner = _compare_route(state, route_id)
+	route_winners[route_id] = route_winner
+
+	return route_winner
+
+
+def _compare_route(state: GameState, route_id: RouteId) -> CaravanId | None:
 	caravan_p1_tuple = state.get_caravan_by_route_player(PlayerId.P1, route_id)
 	caravan_p2_tuple = state.get_caravan_by_route_player(PlayerId.P2, route_id)
 
@@ -56,7 +69,7 @@ def _get_route_winner(state: GameState, route_id: RouteId) -> CaravanId | None:
 	return _route_winner_between(caravan_p1_id, caravan_p1, caravan_p2_id, caravan_p2)
 
 
-def _get_route_winner_caravans(state: GameState) -> set[CaravanId]:
+def get_route_winner_caravans(state: GameState) -> set[CaravanId]:
 	winners = set()
 
 	for route in RouteId:
@@ -77,7 +90,7 @@ def _all_routes_sold(state: GameState) -> bool:
 
 
 def _get_caravan_sales_winner(state: GameState) -> GameResult | None:
-	winners = _get_route_winner_caravans(state)
+	winners = get_route_winner_caravans(state)
 
 	p1_wins = 0
 	p2_wins = 0
@@ -109,15 +122,15 @@ def _get_caravan_sales_winner(state: GameState) -> GameResult | None:
 
 
 def _player_out_of_cards(state: GameState) -> PlayerId | None:
-	for player_id, player_state in state.players.items():
-		if len(player_state.hand) == 0 and len(player_state.deck) == 0:
+	for player_id in state.players:
+		if state.count_cards_left(player_id) == 0:
 			return player_id
 
 	return None
 
 
 def _set_game_phase_to_finished(state: GameState) -> None:
-	state.game_phase = GamePhase.FINISHED
+	state.set_game_phase(GamePhase.FINISHED)
 
 
 def check_victory(state: GameState, move: Concede | None = None) -> GameResult | None:
@@ -144,3 +157,19 @@ def check_victory(state: GameState, move: Concede | None = None) -> GameResult |
 						  reason=WinReason.OUT_OF_CARDS, end_turn_number=state.turn_number)
 
 	return None
+
+
+# Winner of a game that is stopped before its end: the player winning the most routes, then the one with the most cards
+# left, then the player to move, as the other one moved into the position.
+def adjudicate(state: GameState, reason: WinReason) -> GameResult:
+	route_counts = {player_id: 0 for player_id in state.players}
+
+	for caravan_id in get_route_winner_caravans(state):
+		route_counts[caravan_id.owner] += 1
+
+	winner_id = max(state.players, key=lambda player_id: (route_counts[player_id], state.count_cards_left(player_id),
+														  player_id == state.current_player))
+
+	_set_game_phase_to_finished(state)
+
+	return GameResult(winner_id=winner_id, reason=reason, end_turn_number=state.turn_number)
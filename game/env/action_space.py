@@ -0,0 +1,103 @@
+import numpy as np
+
+from game.caravan.enums import CaravanId
+from game.cards.card_id import CardId
+from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
+from game.player.enums import PlayerId
+from game.state.game_state import GameState
+from game.vector.actions import OWN_CARAVAN_COUNT, ATTACH_OFFSET, DISCARD_OFFSET, DISCARD_CARAVAN_OFFSET, \
+	CONCEDE_INDEX, ACTION_COUNT, legal_action_masks
+from game.vector.batch import CARAVAN_COUNT, MAX_PILE, batch_from_states
+
+
+def _relative_caravan(caravan_id: CaravanId, player_id: PlayerId) -> int:
+	return (caravan_id - OWN_CARAVAN_COUNT * (player_id - PlayerId.P1)) % CARAVAN_COUNT
+
+
+def _absolute_caravan(caravan_number: int, player_id: PlayerId) -> CaravanId:
+	return CaravanId((caravan_number + OWN_CARAVAN_COUNT * (player_id - PlayerId.P1)) % CARAVAN_COUNT)
+
+
+def _get_hand_slots(state: GameState, player_id: PlayerId) -> dict[CardId, int]:
+	return {card_id: slot for slot, card_id in enumerate(state.players[player_id].hand)}
+
+
+def move_to_action_index(state: GameState, move: Move, hand_slots: dict[CardId, int] | None = None) -> int:
+	if isinstance(move, Concede):
+		return CONCEDE_INDEX
+
+	if isinstance(move, DiscardCaravan):
+		return DISCARD_CARAVAN_OFFSET + _relative_caravan(move.caravan_id, move.player_id)
+
+	if hand_slots is None:
+		hand_slots = _get_hand_slots(state, move.player_id)
+
+	slot = hand_slots[move.card_id]
+
+	if isinstance(move, PlayCard):
+		return slot * OWN_CARAVAN_COUNT + _relative_caravan(move.caravan_id, move.player_id)
+
+	if isinstance(move, AttachFaceCard):
+		target_position = state.card_index.get_location(move.target_base_id).position
+		caravan_number = _relative_caravan(move.caravan_id, move.player_id)
+
+		return ATTACH_OFFSET + (slot * CARAVAN_COUNT + caravan_number) * MAX_PILE + target_position
+
+	if isinstance(move, DiscardCard):
+		return DISCARD_OFFSET + slot
+
+	# TODO: Check raised errors later.
+	raise ValueError(f"Move {move} has no action index.")
+
+
+# The move behind an action index for the current player, None when it points at an empty hand slot or pile position.
+# The move itself may still be illegal.
+def action_index_to_move(state: GameState, index: int) -> Move | None:
+	player_id = state.current_player
+
+	if index == CONCEDE_INDEX:
+		return Concede(player_id=player_id)
+
+	if DISCARD_CARAVAN_OFFSET <= index < CONCEDE_INDEX:
+		return DiscardCaravan(player_id=player_id,
+							  caravan_id=_absolute_caravan(index - DISCARD_CARAVAN_OFFSET, player_id))
+
+	if not 0 <= index < DISCARD_CARAVAN_OFFSET:
+		return None
+
+	hand = list(state.players[player_id].hand)
+
+	if index >= DISCARD_OFFSET:
+		slot = index - DISCARD_OFFSET
+
+		return DiscardCard(player_id=player_id, card_id=hand[slot]) if slot < len(hand) else None
+
+	if index < ATTACH_OFFSET:
+		slot, caravan_number = divmod(index, OWN_CARAVAN_COUNT)
+
+		if slot >= len(hand):
+			return None
+
+		return PlayCard(player_id=player_id, card_id=hand[slot], caravan_id=_absolute_caravan(caravan_number, player_id))
+
+	slot, rest = divmod(index - ATTACH_OFFSET, CARAVAN_COUNT * MAX_PILE)
+	caravan_number, target_position = divmod(rest, MAX_PILE)
+	caravan_id = _absolute_caravan(caravan_number, player_id)
+	pile = state.caravans[caravan_id].pile
+
+	if slot >= len(hand) or target_position >= len(pile):
+		return None
+
+	return AttachFaceCard(player_id=player_id, card_id=hand[slot], caravan_id=caravan_id,
+						  target_base_id=pile[target_position].base_card.id)
+
+
+# (ACTION_COUNT,) mask of the legal actions of the current player, written into "out" when given. The mask of
+# "game.vector.actions.legal_action_masks" for a batch of this one state, whose hand slots follow the hand's order.
+def fill_action_mask(state: GameState, out: np.ndarray | None = None) -> np.ndarray:
+	if out is None:
+		out = np.zeros(ACTION_COUNT, dtype=bool)
+
+	legal_action_masks(batch_from_states([state]), out[np.newaxis])
+
+	return out
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.random import SeedSequence, default_rng
+
+from game.agents.registry import AGENT_FACTORIES
+from game.engine.loop import StepResult, step
+from game.env.action_space import action_index_to_move, fill_action_mask
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.encoding import ENCODING_SIZE, encode_state
+from game.state.enums import GamePhase
+from game.state.game_state import GameResult, GameState
+from game.vector.actions import ACTION_COUNT
+
+WIN_REWARD = 1.0
+LOSS_REWARD = -1.0
+# Errors in a row after which the opponent's move is drawn at random instead.
+MAX_OPPONENT_ERRORS = 3
+
+
+@dataclass(frozen=True)
+class EnvStep:
+	reward: float
+	done: bool
+	# The action was not applied, the agent is still to act in the same state.
+	illegal: bool
+
+
+# One game against a built-in opponent, played by action index of "game.vector.actions" and observed through
+# "game.state.encoding". The opponent moves right after the agent, so every observation is the agent's turn. An
+# illegal action costs "illegal_penalty" at once and changes nothing, unlike "game.engine.loop.run" which asks for
+# another move.
+# Observation and mask are written into "observation" and "action_mask" when given, e.g. rows of "VecEnv" buffers.
+class CaravanEnv:
+	def __init__(self, seed: int | SeedSequence, *,
+				 agent_id: PlayerId = PlayerId.P1,
+				 opponent: str = "random",
+				 illegal_penalty: float = 1.0,
+				 observation: np.ndarray | None = None,
+				 action_mask: np.ndarray | None = None) -> None:
+		seed_sequence = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+		deck_seed, opponent_seed = seed_sequence.spawn(2)
+
+		self.agent_id = agent_id
+		self.illegal_penalty = illegal_penalty
+		self.observation = np.zeros(ENCODING_SIZE, dtype=np.float32) if observation is None else observation
+		self.action_mask = np.zeros(ACTION_COUNT, dtype=bool) if action_mask is None else action_mask
+		self.state: GameState | None = None
+
+		self._rng = default_rng(deck_seed)
+		self._get_opponent_move = AGENT_FACTORIES[opponent](default_rng(opponent_seed))
+
+	def reset(self) -> np.ndarray:
+		self.state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=self._rng))
+
+		self._play_opponent()
+		self._update_views()
+
+		return self.observation
+
+	def step(self, action: int) -> EnvStep:
+		if self.state is None or self.state.game_phase == GamePhase.FINISHED:
+			# TODO: Check raised errors later.
+			raise RuntimeError("Environment stepped before a reset, or after its game ended.")
+
+		move = action_index_to_move(self.state, action)
+		step_result = step(self.state, move) if move is not None else StepResult(error="Empty action.")
+
+		if step_result.error is not None:
+			return EnvStep(reward=-self.illegal_penalty, done=False, illegal=True)
+
+		game_result = step_result.game_result or self._play_opponent()
+		self._update_views()
+
+		if game_result is None:
+			return EnvStep(reward=0.0, done=False, illegal=False)
+
+		reward = WIN_REWARD if game_result.winner_id == self.agent_id else LOSS_REWARD
+
+		return EnvStep(reward=reward, done=True, illegal=False)
+
+	def _play_opponent(self) -> GameResult | None:
+		error_count = 0
+
+		while self.state.game_phase != GamePhase.FINISHED and self.state.current_player != self.agent_id:
+			# Built-in opponents only pick legal moves, so a move is asked again after an error, but only so many times
+			# before a random legal move is played in its place.
+			if error_count < MAX_OPPONENT_ERRORS:
+				move = self._get_opponent_move(self.state)
+			else:
+				move = sample_legal_move(self.state, self._rng)
+
+			step_result = step(self.state, move)
+			error_count = error_count + 1 if step_result.error is not None else 0
+
+			if step_result.game_result is not None:
+				return step_result.game_result
+
+		return None
+
+	def _update_views(self) -> None:
+		encode_state(self.state, self.agent_id, self.observation)
+		fill_action_mask(self.state, self.action_mask)
@@ -0,0 +1,200 @@
+from dataclasses import dataclass, fields
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.random import SeedSequence
+
+from game.env.caravan_env import CaravanEnv
+from game.player.enums import PlayerId
+from game.state.encoding import ENCODING_SIZE
+from game.vector.actions import ACTION_COUNT
+
+_RESET = "reset"
+_STEP = "step"
+_CLOSE = "close"
+
+
+# Rows of every environment, in one block of memory that worker processes write into directly, so that nothing but the
+# commands goes through the pipes. Widest types first, to keep every array aligned.
+@dataclass
+class VecBuffers:
+	rewards: np.ndarray
+	observations: np.ndarray
+	actions: np.ndarray
+	action_masks: np.ndarray
+	dones: np.ndarray
+	illegal: np.ndarray
+
+
+def _get_buffer_layouts(env_count: int) -> dict[str, tuple[tuple[int, ...], type]]:
+	return {
+		"rewards": ((env_count,), np.float32),
+		"observations": ((env_count, ENCODING_SIZE), np.float32),
+		"actions": ((env_count,), np.int32),
+		"action_masks": ((env_count, ACTION_COUNT), np.bool_),
+		"dones": ((env_count,), np.bool_),
+		"illegal": ((env_count,), np.bool_),
+	}
+
+
+def _get_buffers_size(env_count: int) -> int:
+	return sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for shape, dtype in _get_buffer_layouts(env_count).values())
+
+
+def _map_buffers(buffer: memoryview | bytearray, env_count: int) -> VecBuffers:
+	layouts = _get_buffer_layouts(env_count)
+	arrays = dict()
+	offset = 0
+
+	for buffer_field in fields(VecBuffers):
+		shape, dtype = layouts[buffer_field.name]
+		arrays[buffer_field.name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+		offset += arrays[buffer_field.name].nbytes
+
+	return VecBuffers(**arrays)
+
+
+@dataclass(frozen=True)
+class _EnvOptions:
+	agent_id: PlayerId
+	opponent: str
+	illegal_penalty: float
+
+
+def _create_envs(buffers: VecBuffers, rows: range, seed_sequences: list[SeedSequence],
+				 options: _EnvOptions) -> list[CaravanEnv]:
+	return [CaravanEnv(seed_sequences[row], agent_id=options.agent_id, opponent=options.opponent,
+					   illegal_penalty=options.illegal_penalty,
+					   observation=buffers.observations[row], action_mask=buffers.action_masks[row])
+			for row in rows]
+
+
+def _reset_envs(envs: list[CaravanEnv], buffers: VecBuffers, rows: range) -> None:
+	for env in envs:
+		env.reset()
+
+	buffers.rewards[rows.start:rows.stop] = 0.0
+	buffers.dones[rows.start:rows.stop] = False
+	buffers.illegal[rows.start:rows.stop] = False
+
+
+def _step_envs(envs: list[CaravanEnv], buffers: VecBuffers, rows: range) -> None:
+	for env, row in zip(envs, rows):
+		env_step = env.step(int(buffers.actions[row]))
+
+		buffers.rewards[row] = env_step.reward
+		buffers.dones[row] = env_step.done
+		buffers.illegal[row] = env_step.illegal
+
+		if env_step.done:
+			env.reset()
+
+
+def _run_worker(connection: Connection, memory_name: str, env_count: int, rows: range,
+				seed_sequences: list[SeedSequence], options: _EnvOptions) -> None:
+	memory = SharedMemory(name=memory_name)
+	buffers = _map_buffers(memory.buf, env_count)
+	envs = _create_envs(buffers, rows, seed_sequences, options)
+
+	try:
+		while (command := connection.recv()) != _CLOSE:
+			if command == _RESET:
+				_reset_envs(envs, buffers, rows)
+			else:
+				_step_envs(envs, buffers, rows)
+
+			connection.send(None)
+	finally:
+		# Arrays over the shared memory must be gone before it can be closed.
+		del envs, buffers
+		memory.close()
+
+
+# "env_count" CaravanEnv stepped together, split across "workers" processes, or all in this one with 0 workers.
+# Games that end are reset at once, so the observation of a done environment is the first of its next game.
+# Each environment gets its own seed spawned from "seed", so a game plays out the same whatever the number of workers.
+class VecEnv:
+	def __init__(self, env_count: int, seed: int, *,
+				 workers: int = 0,
+				 agent_id: PlayerId = PlayerId.P1,
+				 opponent: str = "random",
+				 illegal_penalty: float = 1.0) -> None:
+		self.env_count = env_count
+
+		seed_sequences = SeedSequence(seed).spawn(env_count)
+		options = _EnvOptions(agent_id=agent_id, opponent=opponent, illegal_penalty=illegal_penalty)
+
+		self._memory: SharedMemory | None = None
+		self._connections: list[Connection] = list()
+		self._processes: list[Process] = list()
+		self._envs: list[CaravanEnv] = list()
+
+		if workers == 0:
+			self.buffers = _map_buffers(bytearray(_get_buffers_size(env_count)), env_count)
+			self._envs = _create_envs(self.buffers, range(env_count), seed_sequences, options)
+
+			return
+
+		self._memory = SharedMemory(create=True, size=_get_buffers_size(env_count))
+		self.buffers = _map_buffers(self._memory.buf, env_count)
+
+		for rows in np.array_split(np.arange(env_count), min(workers, env_count)):
+			connection, worker_connection = Pipe()
+			process = Process(target=_run_worker, daemon=True,
+							  args=(worker_connection, self._memory.name, env_count,
+									range(int(rows[0]), int(rows[-1]) + 1), seed_sequences, options))
+			process.start()
+
+			self._connections.append(connection)
+			self._processes.append(process)
+
+	def reset(self) -> np.ndarray:
+		self._run(_RESET)
+
+		return self.buffers.observations
+
+	# Rewards, dones, illegal flags and the next observations and masks are read from "buffers" afterwards.
+	def step(self, actions: np.ndarray) -> VecBuffers:
+		self.buffers.actions[:] = actions
+		self._run(_STEP)
+
+		return self.buffers
+
+	def close(self) -> None:
+		for connection in self._connections:
+			connection.send(_CLOSE)
+
+		for process in self._processes:
+			process.join()
+
+		self._connections.clear()
+		self._processes.clear()
+
+		if self._memory is not None:
+			del self.buffers
+			self._memory.close()
+			self._memory.unlink()
+			self._memory = None
+
+	def __enter__(self) -> 'VecEnv':
+		return self
+
+	def __exit__(self, *_: object) -> None:
+		self.close()
+
+	def _run(self, command: str) -> None:
+		if not self._processes:
+			if command == _RESET:
+				_reset_envs(self._envs, self.buffers, range(self.env_count))
+			else:
+				_step_envs(self._envs, self.buffers, range(self.env_count))
+
+			return
+
+		for connection in self._connections:
+			connection.send(command)
+
+		for connection in self._connections:
+			connection.recv()
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from uuid import UUID
 
 from game.caravan.enums import CaravanId
+from game.cards.card_id import CardId
 from game.player.enums import PlayerId
 
 
@@ -15,39 +15,39 @@ class MoveType(Enum):
 
 
 # TODO: Check if more moves are possible.
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Move:
 	player_id: PlayerId
 	move_type: MoveType = field(init=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlayCard(Move):
-	card_id: UUID
+	card_id: CardId
 	caravan_id: CaravanId
 	move_type: MoveType = field(init=False, default=MoveType.PLAY_BASE)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AttachFaceCard(Move):
-	card_id: UUID
+	card_id: CardId
 	caravan_id: CaravanId
-	target_base_id: UUID
+	target_base_id: CardId
 	move_type: MoveType = field(init=False, default=MoveType.ATTACH_FACE)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiscardCard(Move):
-	card_id: UUID
+	card_id: CardId
 	move_type: MoveType = field(init=False, default=MoveType.DISCARD_CARD)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiscardCaravan(Move):
 	caravan_id: CaravanId
 	move_type: MoveType = field(init=False, default=MoveType.DISCARD_CARAVAN)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Concede(Move):
 	move_type: MoveType = field(init=False, default=MoveType.CONCEDE)
@@ -1,2 +1,3 @@
 CARAVAN_MIN_SCORE = 21
 CARAVAN_MAX_SCORE = 26
+STARTING_HAND_SIZE = 8
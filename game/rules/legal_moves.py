@@ -0,0 +1,239 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+
+from numpy.random import Generator
+
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId, Direction
+from game.cards.card import Card
+from game.cards.enums import Suit
+from game.moves.types import Move, MoveType, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+
+
+# What "game.rules.ruleset.can_play_base" needs to know about a caravan, worked out once per caravan instead of once per card.
+@dataclass(frozen=True, slots=True)
+class CaravanFacts:
+	caravan_id: CaravanId
+	top_value: int | None
+	direction: Direction
+	current_suit: Suit | None
+	# During setup, base cards may only be played on empty caravans.
+	open_for_setup: bool
+
+
+def get_caravan_facts(caravan_id: CaravanId, caravan: Caravan) -> CaravanFacts:
+	top_card = caravan.top_card
+
+	return CaravanFacts(
+		caravan_id=caravan_id,
+		top_value=top_card.base_card.base_value if top_card is not None else None,
+		direction=caravan.direction,
+		current_suit=caravan.current_suit,
+		open_for_setup=top_card is None,
+	)
+
+
+def get_own_caravan_facts(state: GameState, player_id: PlayerId) -> list[CaravanFacts]:
+	facts = list()
+
+	for caravan_id in CaravanId:
+		caravan = state.get_caravan(caravan_id)
+
+		if caravan_id.owner == player_id and caravan is not None:
+			facts.append(get_caravan_facts(caravan_id, caravan))
+
+	return facts
+
+
+# Same checks as "can_play_base" past the turn, hand and ownership checks, see "_caravan_direction_or_suit_is_valid".
+def can_play_on(facts: CaravanFacts, card: Card, game_phase: GamePhase) -> bool:
+	if game_phase == GamePhase.SETUP and not facts.open_for_setup:
+		return False
+
+	if facts.top_value is None:
+		return True
+
+	played_value = card.base_value
+
+	if facts.top_value == played_value:
+		return False
+
+	if facts.direction == Direction.UNSET:
+		return True
+
+	if facts.current_suit is not None and facts.current_suit == card.suit:
+		return True
+
+	return ((facts.top_value > played_value and facts.direction == Direction.DESCENDING)
+			or
+			(facts.top_value < played_value and facts.direction == Direction.ASCENDING))
+
+
+# Every move the current player can make, in agreement with the "can_*" predicates of "game.rules.ruleset".
+def generate_legal_moves(state: GameState) -> list[Move]:
+	if state.game_phase == GamePhase.FINISHED:
+		return []
+
+	player_id = state.current_player
+	player = state.players.get(player_id)
+
+	if player is None:
+		return []
+
+	is_main_phase = state.game_phase == GamePhase.MAIN
+	own_caravan_facts = get_own_caravan_facts(state, player_id)
+
+	targets = list()
+
+	if is_main_phase:
+		for caravan_id in CaravanId:
+			caravan = state.get_caravan(caravan_id)
+
+			if caravan is not None:
+				targets.extend((caravan_id, played_card.base_card.id) for played_card in caravan.pile
+							   if played_card.base_card.rank.is_numeric)
+
+	moves = list()
+
+	for card_id, card in player.hand.items():
+		if card.rank.is_numeric:
+			for facts in own_caravan_facts:
+				if can_play_on(facts, card, state.game_phase):
+					moves.append(PlayCard(player_id=player_id, card_id=card_id, caravan_id=facts.caravan_id))
+
+		elif card.rank.is_face:
+			for caravan_id, target_base_id in targets:
+				moves.append(AttachFaceCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id,
+											target_base_id=target_base_id))
+
+		if is_main_phase and player.deck:
+			moves.append(DiscardCard(player_id=player_id, card_id=card_id))
+
+	if is_main_phase:
+		for caravan_id in CaravanId:
+			if caravan_id.owner == player_id:
+				moves.append(DiscardCaravan(player_id=player_id, caravan_id=caravan_id))
+
+	moves.append(Concede(player_id=player_id))
+
+	return moves
+
+
+# Drawing a move this many times without hitting a legal one falls back to "generate_legal_moves".
+_MAX_REJECTIONS = 64
+
+
+def _get_move_weight(weights: dict[MoveType, float] | None, move_type: MoveType) -> float:
+	if weights is None:
+		return 1.0
+
+	return weights.get(move_type, 1.0)
+
+
+def _sample_from_legal_moves(state: GameState, rng: Generator, weights: dict[MoveType, float] | None) -> Move | None:
+	moves = generate_legal_moves(state)
+	cumulative_weights = list(accumulate(_get_move_weight(weights, move.move_type) for move in moves))
+
+	if not moves or cumulative_weights[-1] <= 0:
+		return None
+
+	return moves[bisect_right(cumulative_weights, rng.random() * cumulative_weights[-1])]
+
+
+# One legal move of the current player, every legal move being as likely as any other of its type, and the move types
+# being as likely as their "weights" (1 by default) tell. Candidates are counted per move type, without building them,
+# and drawn until one passes the rules, so the result follows the same distribution as picking from
+# "generate_legal_moves" with those weights.
+def sample_legal_move(state: GameState, rng: Generator, weights: dict[MoveType, float] | None = None) -> Move | None:
+	if state.game_phase == GamePhase.FINISHED:
+		return None
+
+	player_id = state.current_player
+	player = state.players.get(player_id)
+
+	if player is None:
+		return None
+
+	is_main_phase = state.game_phase == GamePhase.MAIN
+
+	numeric_card_ids = list()
+	face_card_ids = list()
+
+	for card_id, card in player.hand.items():
+		if card.rank.is_numeric:
+			numeric_card_ids.append(card_id)
+		elif card.rank.is_face:
+			face_card_ids.append(card_id)
+
+	own_caravan_ids = [caravan_id for caravan_id in CaravanId if caravan_id.owner == player_id]
+	# Facts are only worked out for the caravans a drawn PlayCard lands on.
+	own_caravans = [(caravan_id, state.get_caravan(caravan_id)) for caravan_id in own_caravan_ids
+					if state.get_caravan(caravan_id) is not None]
+
+	piles = list()
+	target_count = 0
+
+	if is_main_phase:
+		for caravan_id in CaravanId:
+			caravan = state.get_caravan(caravan_id)
+
+			if caravan is not None and caravan.pile:
+				piles.append((caravan_id, caravan.pile))
+				target_count += len(caravan.pile)
+
+	candidate_counts = {
+		MoveType.PLAY_BASE: len(numeric_card_ids) * len(own_caravans),
+		MoveType.ATTACH_FACE: len(face_card_ids) * target_count if is_main_phase else 0,
+		MoveType.DISCARD_CARD: len(player.hand) if is_main_phase and player.deck else 0,
+		MoveType.DISCARD_CARAVAN: len(own_caravan_ids) if is_main_phase else 0,
+		MoveType.CONCEDE: 1,
+	}
+
+	move_types = list(candidate_counts)
+	cumulative_weights = list(accumulate(_get_move_weight(weights, move_type) * candidate_counts[move_type]
+										 for move_type in move_types))
+
+	if cumulative_weights[-1] <= 0:
+		return None
+
+	for _ in range(_MAX_REJECTIONS):
+		move_type = move_types[bisect_right(cumulative_weights, rng.random() * cumulative_weights[-1])]
+		candidate = int(rng.integers(candidate_counts[move_type]))
+
+		if move_type == MoveType.PLAY_BASE:
+			card_id = numeric_card_ids[candidate // len(own_caravans)]
+			caravan_id, caravan = own_caravans[candidate % len(own_caravans)]
+
+			if can_play_on(get_caravan_facts(caravan_id, caravan), player.hand[card_id], state.game_phase):
+				return PlayCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id)
+
+		elif move_type == MoveType.ATTACH_FACE:
+			card_id = face_card_ids[candidate // target_count]
+			target = candidate % target_count
+
+			for caravan_id, pile in piles:
+				if target < len(pile):
+					target_base_card = pile[target].base_card
+
+					if target_base_card.rank.is_numeric:
+						return AttachFaceCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id,
+											  target_base_id=target_base_card.id)
+
+					break
+
+				target -= len(pile)
+
+		elif move_type == MoveType.DISCARD_CARD:
+			return DiscardCard(player_id=player_id, card_id=list(player.hand)[candidate])
+
+		elif move_type == MoveType.DISCARD_CARAVAN:
+			return DiscardCaravan(player_id=player_id, caravan_id=own_caravan_ids[candidate])
+
+		else:
+			return Concede(player_id=player_id)
+
+	return _sample_from_legal_moves(state, rng, weights)
@@ -0,0 +1,87 @@
+import numpy as np
+from numpy.random import Generator
+
+from game.cards.card import Card
+from game.player.enums import PlayerId
+from game.setup.deck_builder import build_standard_deck
+from game.state.card_index import CardLocation, CardZone
+from game.state.game_state import GameState
+from game.state.zobrist import hand_key
+
+
+# Complete states that "observer" cannot tell from "state": the opponent's hand and deck are dealt again from the cards
+# the observer has not seen, and the observer's deck is shuffled. The unseen cards are the opponent's standard deck less
+# the cards shown in caravans, as the observer cannot know which of the others were discarded out of sight, so each
+# sample also leaves out different cards. Those are out of play, and left out of the sample's card index.
+# Everything that does not depend on the deal is prepared once, each sample being a copy-on-write clone of the same
+# template with new hands and decks.
+class DeterminizationSampler:
+	def __init__(self, state: GameState, observer: PlayerId) -> None:
+		self.observer = observer
+		self.opponent = PlayerId.P2 if observer == PlayerId.P1 else PlayerId.P1
+		self.template = state.clone(copy_on_write=True)
+
+		observer_player = self.template.players[observer]
+		opponent_player = self.template.players[self.opponent]
+
+		self._hand_size = len(opponent_player.hand)
+		self._dealt_count = self._hand_size + len(opponent_player.deck)
+		# Hash of the template without the opponent's hand, which each deal XORs back in.
+		self._handless_hash = self.template.zobrist_hash
+
+		for card_id in opponent_player.hand:
+			self._handless_hash ^= hand_key(self.opponent, card_id)
+
+		# The opponent's true cards are taken out of the template's index, each deal placing the ones it deals.
+		for card in opponent_player.deck + list(opponent_player.hand.values()):
+			self.template.card_index.discard(card.id)
+
+		shown_card_ids = {card.id for caravan in self.template.caravans.values() for played_card in caravan.pile
+						  for card in (played_card.base_card, *played_card.attachments)}
+		self._unseen_cards = np.array([card for card in build_standard_deck(self.opponent)
+									   if card.id not in shown_card_ids], dtype=object)
+		self._observer_deck = np.array(observer_player.deck, dtype=object)
+
+		# Locations only depend on the position, so they are shared by every sample.
+		self._opponent_locations = (
+			[CardLocation(zone=CardZone.HAND, owner=self.opponent)] * self._hand_size
+			+ [CardLocation(zone=CardZone.DECK, owner=self.opponent, position=position)
+			   for position in range(self._dealt_count - self._hand_size)])
+		self._observer_locations = [CardLocation(zone=CardZone.DECK, owner=observer, position=position)
+									for position in range(len(self._observer_deck))]
+
+	def sample(self, count: int, rng: Generator) -> list[GameState]:
+		unseen_count = len(self._unseen_cards)
+
+		# One draw of random keys for every sample and every hidden card, sorted into one permutation per row and pile,
+		# of which the opponent is dealt the first cards.
+		keys = rng.random((count, unseen_count + len(self._observer_deck)))
+		opponent_orders = self._unseen_cards[np.argsort(keys[:, :unseen_count], axis=1)[:, :self._dealt_count]]
+		observer_orders = self._observer_deck[np.argsort(keys[:, unseen_count:], axis=1)]
+
+		return [self._deal(opponent_order.tolist(), observer_order.tolist())
+				for opponent_order, observer_order in zip(opponent_orders, observer_orders)]
+
+	def _deal(self, opponent_cards: list[Card], observer_deck: list[Card]) -> GameState:
+		determinization = self.template.clone(copy_on_write=True)
+
+		opponent = determinization.players[self.opponent]
+		opponent.hand = {card.id: card for card in opponent_cards[:self._hand_size]}
+		opponent.deck = opponent_cards[self._hand_size:]
+		determinization.players[self.observer].deck = observer_deck
+
+		for card, location in zip(opponent_cards, self._opponent_locations):
+			determinization.card_index.place(card, location)
+
+		determinization.card_index.relocate((card.id for card in observer_deck), self._observer_locations)
+
+		determinization.zobrist_hash = self._handless_hash
+
+		for card_id in opponent.hand:
+			determinization.zobrist_hash ^= hand_key(self.opponent, card_id)
+
+		return determinization
+
+
+def sample_determinizations(state: GameState, observer: PlayerId, count: int, rng: Generator) -> list[GameState]:
+	return DeterminizationSampler(state, observer).sample(count, rng)
@@ -0,0 +1,204 @@
+import time
+from dataclasses import dataclass
+
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank
+from game.engine.apply import make_move
+from game.engine.journal import undo_move
+from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCaravan, Concede
+from game.player.enums import PlayerId
+from game.rules.constants import CARAVAN_MIN_SCORE, CARAVAN_MAX_SCORE
+from game.rules.legal_moves import generate_legal_moves
+from game.search.transposition import Bound, TableEntry, TranspositionTable
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+# Nodes searched between two looks at the clock.
+_CLOCK_INTERVAL = 1024
+# XORed into the position hash after a pass, as a second pass in a row ends the game.
+_PASSED_KEY = 0x5D588B656C078965
+
+
+@dataclass(frozen=True)
+class EndgameSolution:
+	# For the player to move, WIN, DRAW or LOSS with best play from both sides.
+	value: int
+	move: Move
+	nodes: int
+
+
+class _OutOfTime(Exception):
+	pass
+
+
+# With both decks empty, nothing is hidden any more: the opponent's hand is what is left of their cards.
+def is_endgame(state: GameState) -> bool:
+	return state.game_phase == GamePhase.MAIN and all(not player.deck for player in state.players.values())
+
+
+def _is_sold(score: int) -> bool:
+	return CARAVAN_MIN_SCORE <= score <= CARAVAN_MAX_SCORE
+
+
+# How the move changes the caravan it touches, from the mover's side: selling one of their caravans or unselling one of
+# their opponent's comes first, then moves that add the most to their own caravans.
+def _get_route_score_delta(state: GameState, move: Move) -> tuple[int, int]:
+	if isinstance(move, PlayCard):
+		caravan = state.caravans[move.caravan_id]
+		card = state.players[move.player_id].hand[move.card_id]
+		return _rate_caravan_change(move.player_id, move.caravan_id, caravan.score, caravan.score + card.base_value)
+
+	if isinstance(move, AttachFaceCard):
+		caravan = state.caravans[move.caravan_id]
+		played_card = caravan.get_played_card(move.target_base_id)
+		rank = state.players[move.player_id].hand[move.card_id].rank
+
+		if rank == Rank.KING:
+			return _rate_caravan_change(move.player_id, move.caravan_id, caravan.score,
+										caravan.score + played_card.score)
+		if rank == Rank.JACK:
+			return _rate_caravan_change(move.player_id, move.caravan_id, caravan.score,
+										caravan.score - played_card.score)
+
+		return 0, 0
+
+	if isinstance(move, DiscardCaravan):
+		return _rate_caravan_change(move.player_id, move.caravan_id, state.caravans[move.caravan_id].score, 0)
+
+	return 0, 0
+
+
+def _rate_caravan_change(player_id: PlayerId, caravan_id: CaravanId, score: int, new_score: int) -> tuple[int, int]:
+	sold_change = int(_is_sold(new_score)) - int(_is_sold(score))
+
+	if caravan_id.owner != player_id:
+		return -sold_change, 0
+
+	return sold_change, new_score - score if new_score <= CARAVAN_MAX_SCORE else -new_score
+
+
+# Legal moves of the endgame, best first. Discarding an empty caravan changes nothing but the turn, so one such pass
+# stands for all of them, and comes last: waiting for the opponent is seldom the best move, yet sometimes the only one
+# that does not lose. Lines of play still come to an end, as every other move takes a card out of a hand or off a
+# caravan, and two passes in a row end the game.
+def _get_ordered_moves(state: GameState) -> list[Move]:
+	moves = list()
+	passes = list()
+
+	for move in generate_legal_moves(state):
+		if isinstance(move, Concede):
+			continue
+
+		if isinstance(move, DiscardCaravan) and not state.caravans[move.caravan_id].pile:
+			passes.append(move)
+		else:
+			moves.append(move)
+
+	if not moves and not passes:
+		return [Concede(player_id=state.current_player)]
+
+	moves.sort(key=lambda move: _get_route_score_delta(state, move), reverse=True)
+
+	return moves + passes[:1]
+
+
+class _Solver:
+	def __init__(self, state: GameState, deadline: float | None, table: TranspositionTable) -> None:
+		self.state = state
+		self.deadline = deadline
+		self.table = table
+		self.nodes = 0
+
+	def negamax(self, alpha: int, beta: int, passed: bool) -> tuple[int, Move | None]:
+		self.nodes += 1
+
+		# From the first node on, so that a deadline already past is seen at once.
+		if self.deadline is not None and self.nodes % _CLOCK_INTERVAL == 1 and time.monotonic() >= self.deadline:
+			raise _OutOfTime()
+
+		position_hash = self.state.zobrist_hash ^ _PASSED_KEY if passed else self.state.zobrist_hash
+		entry = self.table.get(position_hash)
+
+		if entry is not None:
+			if entry.bound == Bound.EXACT:
+				return entry.value, entry.move
+			if entry.bound == Bound.LOWER:
+				alpha = max(alpha, entry.value)
+			elif entry.bound == Bound.UPPER:
+				beta = min(beta, entry.value)
+
+			if alpha >= beta:
+				return entry.value, entry.move
+
+		original_alpha = alpha
+		start_nodes = self.nodes
+		player_id = self.state.current_player
+		moves = _get_ordered_moves(self.state)
+
+		# The move that was best here before is tried first.
+		if entry is not None and entry.move in moves:
+			moves.remove(entry.move)
+			moves.insert(0, entry.move)
+
+		best_value = LOSS - 1
+		best_move = None
+
+		for move in moves:
+			is_pass = isinstance(move, DiscardCaravan) and not self.state.caravans[move.caravan_id].pile
+			game_result, record = make_move(self.state, move)
+
+			# Undone even when the clock runs out below, so that the state is handed back as it was.
+			try:
+				if game_result is not None:
+					value = WIN if game_result.winner_id == player_id else LOSS
+				elif is_pass and passed:
+					# Neither player can do anything any more.
+					value = DRAW
+				else:
+					value = -self.negamax(-beta, -alpha, is_pass)[0]
+			finally:
+				undo_move(self.state, record)
+
+			if value > best_value:
+				best_value, best_move = value, move
+
+			alpha = max(alpha, value)
+
+			if alpha >= beta:
+				break
+
+		if best_value <= original_alpha:
+			bound = Bound.UPPER
+		elif best_value >= beta:
+			bound = Bound.LOWER
+		else:
+			bound = Bound.EXACT
+
+		self.table.store(position_hash, TableEntry(value=best_value, bound=bound, move=best_move,
+												   depth=self.nodes - start_nodes))
+
+		return best_value, best_move
+
+
+# Exact value and best move of an endgame, see "is_endgame", for the player to move. The state is searched in place
+# with "make_move" and "undo_move", and left as it was. None if the search has not ended by "deadline", a
+# "time.monotonic" time. Endgame values do not change from one move to the next, so a "table" kept between calls saves
+# searching the same positions again.
+def solve_endgame(state: GameState, deadline: float | None = None,
+				  table: TranspositionTable | None = None) -> EndgameSolution | None:
+	if not is_endgame(state):
+		# TODO: Check raised errors later.
+		raise ValueError("Endgames start once both decks are empty.")
+
+	solver = _Solver(state, deadline, table if table is not None else TranspositionTable())
+
+	try:
+		value, move = solver.negamax(LOSS, WIN, passed=False)
+	except _OutOfTime:
+		return None
+
+	return EndgameSolution(value=value, move=move, nodes=solver.nodes)
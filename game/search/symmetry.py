@@ -0,0 +1,252 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import permutations
+
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId, RouteId
+from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId, STANDARD_DECK_SIZE, is_standard_card_id
+from game.cards.enums import Suit
+from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan
+from game.player.enums import PlayerId
+from game.setup.deck_builder import get_standard_card
+from game.state.game_state import GameState, PlayerState
+from game.state.zobrist import player_key, phase_key, deck_size_key, hand_key, caravan_card_key, attachment_key
+
+# Positions that only differ by a renaming of the suits, or by an order of the routes, play out the same: suits only
+# matter in being the same or not, and victory counts the routes won whichever they are. A position is brought to the
+# representative of its class by the renaming and order below, found without trying all 4! x 3! of them.
+_SUITS = tuple(Suit)
+_SUIT_INDICES = {suit: index for index, suit in enumerate(_SUITS)}
+_ROUTES = tuple(RouteId)
+# Standard decks hold the 13 cards of each suit in "Suit" order, then the two Jokers.
+_SUIT_CARD_COUNT = 13
+_SUITED_CARD_COUNT = _SUIT_CARD_COUNT * len(_SUITS)
+
+_ROUTE_CARAVAN_IDS = {(caravan_id.owner, caravan_id.route): caravan_id for caravan_id in CaravanId}
+
+_CARAVAN_ENTRY = 0
+_HAND_ENTRY = 1
+
+
+def _get_suit_index(card_id: CardId) -> int | None:
+	index = card_id % STANDARD_DECK_SIZE
+
+	return index // _SUIT_CARD_COUNT if index < _SUITED_CARD_COUNT else None
+
+
+# Id of the card of the same owner and rank in the first suit, standing for the card whatever its suit.
+def _strip_suit(card_id: CardId) -> CardId:
+	suit_index = _get_suit_index(card_id) if is_standard_card_id(card_id) else None
+
+	return card_id - suit_index * _SUIT_CARD_COUNT if suit_index is not None else card_id
+
+
+def _move_route(caravan_id: CaravanId, route_id: RouteId) -> CaravanId:
+	return _ROUTE_CARAVAN_IDS[(caravan_id.owner, route_id)]
+
+
+@dataclass(frozen=True, slots=True)
+class Symmetry:
+	# Actual route of each canonical route, in "RouteId" order.
+	routes: tuple[RouteId, ...]
+	# Actual suit of each canonical suit, in "Suit" order.
+	suits: tuple[Suit, ...]
+
+	def to_canonical_caravan(self, caravan_id: CaravanId) -> CaravanId:
+		return _move_route(caravan_id, _ROUTES[self.routes.index(caravan_id.route)])
+
+	def from_canonical_caravan(self, caravan_id: CaravanId) -> CaravanId:
+		return _move_route(caravan_id, self.routes[caravan_id.route])
+
+	# Custom cards and Jokers have no suit to rename, and keep their id.
+	def to_canonical_card(self, card_id: CardId) -> CardId:
+		suit_index = _get_suit_index(card_id) if is_standard_card_id(card_id) else None
+
+		if suit_index is None:
+			return card_id
+
+		return card_id + (self.suits.index(_SUITS[suit_index]) - suit_index) * _SUIT_CARD_COUNT
+
+	def from_canonical_card(self, card_id: CardId) -> CardId:
+		suit_index = _get_suit_index(card_id) if is_standard_card_id(card_id) else None
+
+		if suit_index is None:
+			return card_id
+
+		return card_id + (_SUIT_INDICES[self.suits[suit_index]] - suit_index) * _SUIT_CARD_COUNT
+
+	def to_canonical_move(self, move: Move) -> Move:
+		return _map_move(move, self.to_canonical_caravan, self.to_canonical_card)
+
+	# Turns a move chosen in the canonical position, e.g. one read from a cache keyed by "CanonicalForm.key", into the
+	# same move in the actual position.
+	def from_canonical_move(self, move: Move) -> Move:
+		return _map_move(move, self.from_canonical_caravan, self.from_canonical_card)
+
+
+IDENTITY = Symmetry(routes=_ROUTES, suits=_SUITS)
+
+
+def _map_move(move: Move, map_caravan: Callable[[CaravanId], CaravanId], map_card: Callable[[CardId], CardId]) -> Move:
+	if isinstance(move, PlayCard):
+		return PlayCard(player_id=move.player_id, card_id=map_card(move.card_id),
+						caravan_id=map_caravan(move.caravan_id))
+	if isinstance(move, AttachFaceCard):
+		return AttachFaceCard(player_id=move.player_id, card_id=map_card(move.card_id),
+							  caravan_id=map_caravan(move.caravan_id), target_base_id=map_card(move.target_base_id))
+	if isinstance(move, DiscardCard):
+		return DiscardCard(player_id=move.player_id, card_id=map_card(move.card_id))
+	if isinstance(move, DiscardCaravan):
+		return DiscardCaravan(player_id=move.player_id, caravan_id=map_caravan(move.caravan_id))
+
+	return move
+
+
+@dataclass(frozen=True, slots=True)
+class CanonicalForm:
+	# "GameState.zobrist_hash" of the representative, the same for every position of the class. Like that hash, it
+	# leaves out the order and contents of the decks.
+	key: int
+	# Takes the position to its representative, and moves of the representative back.
+	symmetry: Symmetry
+
+
+# Cards in caravans and hands, as (caravan id or player id, position, attachment position or -1, card id).
+def _collect_cards(state: GameState) -> tuple[list[tuple[CaravanId, int, int, CardId]], list[tuple[PlayerId, CardId]]]:
+	caravan_cards = list()
+	hand_cards = list()
+
+	for caravan_id, caravan in state.caravans.items():
+		for position, played_card in enumerate(caravan.pile):
+			caravan_cards.append((caravan_id, position, -1, played_card.base_card.id))
+
+			for attachment_position, face_card in enumerate(played_card.attachments):
+				caravan_cards.append((caravan_id, position, attachment_position, face_card.id))
+
+	for player_id, player in state.players.items():
+		hand_cards.extend((player_id, card_id) for card_id in player.hand)
+
+	return caravan_cards, hand_cards
+
+
+# Orders of the routes that sort them by what they hold regardless of suits. Routes holding the same are tried in every
+# order, bar empty ones, which are the same in any order.
+def _get_route_orders(state: GameState) -> list[tuple[RouteId, ...]]:
+	signatures = dict()
+
+	for route_id in _ROUTES:
+		signatures[route_id] = tuple(
+			tuple((_strip_suit(played_card.base_card.id), tuple(_strip_suit(face_card.id)
+																	for face_card in played_card.attachments))
+				  for played_card in state.caravans[_ROUTE_CARAVAN_IDS[(player_id, route_id)]].pile)
+			for player_id in PlayerId)
+
+	empty = tuple(() for _ in PlayerId)
+	ordered = sorted(signatures.values())
+
+	return [order for order in permutations(_ROUTES)
+			if [signatures[route_id] for route_id in order] == ordered and
+			all(order[index] < order[index + 1] for index in range(len(order) - 1)
+				if signatures[order[index]] == signatures[order[index + 1]] == empty)]
+
+
+# Suits sorted by where their cards are once the routes are in "order", canonical caravans and all. Suits found in the
+# same places are interchangeable, so their order does not matter.
+def _get_suit_order(caravan_cards: list[tuple[CaravanId, int, int, CardId]], hand_cards: list[tuple[PlayerId, CardId]],
+					to_canonical_caravan: dict[CaravanId, CaravanId]) -> tuple[Suit, ...]:
+	entries = {suit_index: list() for suit_index in range(len(_SUITS))}
+
+	for caravan_id, position, attachment_position, card_id in caravan_cards:
+		suit_index = _get_suit_index(card_id)
+
+		if suit_index is not None:
+			entries[suit_index].append((_CARAVAN_ENTRY, to_canonical_caravan[caravan_id], position,
+										attachment_position, _strip_suit(card_id)))
+
+	for player_id, card_id in hand_cards:
+		suit_index = _get_suit_index(card_id)
+
+		if suit_index is not None:
+			entries[suit_index].append((_HAND_ENTRY, player_id, 0, 0, _strip_suit(card_id)))
+
+	signatures = {suit_index: sorted(suit_entries) for suit_index, suit_entries in entries.items()}
+
+	return tuple(_SUITS[suit_index] for suit_index in sorted(signatures, key=signatures.__getitem__))
+
+
+def _compute_canonical_key(state: GameState, caravan_cards: list[tuple[CaravanId, int, int, CardId]],
+						   hand_cards: list[tuple[PlayerId, CardId]], symmetry: Symmetry) -> int:
+	key = player_key(state.current_player) ^ phase_key(state.game_phase)
+
+	for player_id, player in state.players.items():
+		key ^= deck_size_key(player_id, len(player.deck))
+
+	for player_id, card_id in hand_cards:
+		key ^= hand_key(player_id, symmetry.to_canonical_card(card_id))
+
+	base_ids = dict()
+
+	for caravan_id, position, attachment_position, card_id in caravan_cards:
+		if attachment_position < 0:
+			base_id = symmetry.to_canonical_card(card_id)
+			base_ids[(caravan_id, position)] = base_id
+			key ^= caravan_card_key(symmetry.to_canonical_caravan(caravan_id), position, base_id)
+		else:
+			key ^= attachment_key(base_ids[(caravan_id, position)], attachment_position,
+								  symmetry.to_canonical_card(card_id))
+
+	return key
+
+
+# The representative of the position's class and the symmetry taking the position to it. Suits are only renamed when
+# every card is a standard one, the suit of a custom card not being told by its id.
+def canonicalize(state: GameState) -> CanonicalForm:
+	caravan_cards, hand_cards = _collect_cards(state)
+	is_standard = all(is_standard_card_id(card[-1]) for card in caravan_cards + hand_cards)
+	best = None
+
+	for routes in _get_route_orders(state):
+		if is_standard:
+			to_canonical_caravan = {caravan_id: _move_route(caravan_id, _ROUTES[routes.index(caravan_id.route)])
+									for caravan_id in CaravanId}
+			suits = _get_suit_order(caravan_cards, hand_cards, to_canonical_caravan)
+		else:
+			suits = _SUITS
+
+		symmetry = Symmetry(routes=routes, suits=suits)
+		key = _compute_canonical_key(state, caravan_cards, hand_cards, symmetry)
+
+		if best is None or key < best.key:
+			best = CanonicalForm(key=key, symmetry=symmetry)
+
+	return best
+
+
+def _map_card(card: Card, symmetry: Symmetry) -> Card:
+	card_id = symmetry.to_canonical_card(card.id)
+
+	return card if card_id == card.id else get_standard_card(card_id)
+
+
+# The position "symmetry" takes the state to, decks included, e.g. its representative with the symmetry of
+# "canonicalize(state)".
+def apply_symmetry(state: GameState, symmetry: Symmetry) -> GameState:
+	players = {
+		player_id: PlayerState(deck=[_map_card(card, symmetry) for card in player.deck],
+							   hand={mapped.id: mapped for mapped in (_map_card(card, symmetry)
+																	  for card in player.hand.values())})
+		for player_id, player in state.players.items()
+	}
+
+	caravans = dict()
+
+	for caravan_id in sorted(state.caravans, key=symmetry.to_canonical_caravan):
+		canonical_id = symmetry.to_canonical_caravan(caravan_id)
+		caravans[canonical_id] = Caravan(id=canonical_id, pile=[
+			PlayedCard(base_card=_map_card(played_card.base_card, symmetry),
+					   attachments=[_map_card(face_card, symmetry) for face_card in played_card.attachments])
+			for played_card in state.caravans[caravan_id].pile])
+
+	return GameState(players=players, caravans=caravans, current_player=state.current_player,
+					 turn_number=state.turn_number, game_phase=state.game_phase, game_result=state.game_result)
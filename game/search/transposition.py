@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from enum import Enum
+
+from game.moves.types import Move
+
+
+class Bound(Enum):
+	EXACT = 'exact'
+	# The value is at least, or at most, the one stored, the search below having been cut off.
+	LOWER = 'lower'
+	UPPER = 'upper'
+
+
+@dataclass(frozen=True, slots=True)
+class TableEntry:
+	value: int
+	bound: Bound
+	move: Move | None
+	# Size of the search the entry sums up, the larger being kept when two positions want the same slot.
+	depth: int
+
+
+@dataclass
+class TableStats:
+	hits: int = field(default=0)
+	misses: int = field(default=0)
+	stores: int = field(default=0)
+	# Entries of another position overwritten by a store.
+	replacements: int = field(default=0)
+	# Stores given up to keep a larger entry of another position.
+	rejections: int = field(default=0)
+
+	@property
+	def hit_rate(self) -> float:
+		lookups = self.hits + self.misses
+
+		return self.hits / lookups if lookups > 0 else 0.0
+
+
+# Fixed number of slots indexed by the low bits of the position hash, e.g. "GameState.zobrist_hash", which is kept in
+# full to tell positions sharing a slot apart. A slot goes to the deeper entry, unless the one in it was stored before
+# the last "new_search", so that a table shared between searches and agents does not fill up with stale entries.
+class TranspositionTable:
+	def __init__(self, capacity: int = 1 << 16) -> None:
+		# Rounded up to a power of two, so that the slot is a mask away from the hash.
+		self.capacity = 1 << max(capacity - 1, 0).bit_length()
+		self.generation = 0
+		self.stats = TableStats()
+
+		self._mask = self.capacity - 1
+		self._hashes: list[int | None] = [None] * self.capacity
+		self._entries: list[TableEntry | None] = [None] * self.capacity
+		self._generations = [0] * self.capacity
+
+	def __len__(self) -> int:
+		return self.capacity - self._hashes.count(None)
+
+	def get(self, position_hash: int) -> TableEntry | None:
+		slot = position_hash & self._mask
+
+		if self._hashes[slot] != position_hash:
+			self.stats.misses += 1
+			return None
+
+		self.stats.hits += 1
+
+		return self._entries[slot]
+
+	def store(self, position_hash: int, entry: TableEntry) -> None:
+		slot = position_hash & self._mask
+		stored_hash = self._hashes[slot]
+
+		if stored_hash is not None and stored_hash != position_hash:
+			if self._generations[slot] == self.generation and self._entries[slot].depth > entry.depth:
+				self.stats.rejections += 1
+				return
+
+			self.stats.replacements += 1
+
+		self._hashes[slot] = position_hash
+		self._entries[slot] = entry
+		self._generations[slot] = self.generation
+		self.stats.stores += 1
+
+	def new_search(self) -> None:
+		self.generation += 1
+
+	def clear(self) -> None:
+		self._hashes = [None] * self.capacity
+		self._entries = [None] * self.capacity
+		self._generations = [0] * self.capacity
+		self.stats = TableStats()
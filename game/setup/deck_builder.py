@@ -1,19 +1,21 @@
-from uuid import uuid4
-
 from game.cards.card import Card
-from game.cards.enums import Suit, Rank
+from game.cards.card_id import CardId, STANDARD_DECK_SIZE, CARD_RANKS, CARD_SUITS, make_card_id
 from game.player.enums import PlayerId
 
+# Cards are immutable, so every game shares the same instances instead of building 108 new ones.
+_STANDARD_DECKS: dict[PlayerId, tuple[Card, ...]] = {
+	player_id: tuple(Card(card_id, CARD_RANKS[card_id], CARD_SUITS[card_id])
+					 for card_id in (make_card_id(player_id, index) for index in range(STANDARD_DECK_SIZE)))
+	for player_id in PlayerId
+}
+
+# Indexed by card id.
+_STANDARD_CARDS: tuple[Card, ...] = tuple(card for player_id in PlayerId for card in _STANDARD_DECKS[player_id])
 
-def build_standard_deck(_: PlayerId) -> list[Card]:
-	deck = list()
 
-	for suit in Suit:
-		for rank in Rank:
-			if rank != Rank.JOKER:
-				deck.append(Card(uuid4(), rank, suit))
+def build_standard_deck(player_id: PlayerId) -> list[Card]:
+	return list(_STANDARD_DECKS[player_id])
 
-	deck.append(Card(uuid4(), Rank.JOKER, None))
-	deck.append(Card(uuid4(), Rank.JOKER, None))
 
-	return deck
+def get_standard_card(card_id: CardId) -> Card:
+	return _STANDARD_CARDS[card_id]
@@ -5,12 +5,13 @@ from numpy.random import Generator, default_rng
 
 from game.cards.card import Card
 from game.player.enums import PlayerId
+from game.rules.constants import STARTING_HAND_SIZE
 
 
 @dataclass(frozen=True)
 class GameConfig:
 	deck_builder: Callable[[PlayerId], list[Card]]
-	starting_hand_size: int = field(default=8)
+	starting_hand_size: int = field(default=STARTING_HAND_SIZE)
 	starting_player: PlayerId = field(default=PlayerId.P1)
 	shuffle_decks: bool = field(default=True)
 	random_generator: Generator = field(default_factory=default_rng)
@@ -50,9 +50,7 @@ def deal_for_setup(state: GameState, starting_hand_size: int) -> None:
 				f"Deck ({len(player.deck)}) too small to deal {starting_hand_size} for player P{player_id}.")
 
 		for _ in range(starting_hand_size):
-			card = player.deck.pop()
-
-			player.hand[card.id] = card
+			state.draw_card(player_id)
 
 
 def initialize_caravans() -> dict[CaravanId, Caravan]:
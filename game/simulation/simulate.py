@@ -0,0 +1,214 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import TextIO
+
+from numpy.random import SeedSequence, default_rng
+
+from game.agents.registry import AGENT_FACTORIES
+from game.engine.dynamic_hooks import make_get_move_by_player
+from game.engine.loop import CAPPED_REASONS, run
+from game.moves.types import Move
+from game.player.enums import PlayerId
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import WinReason
+from game.state.game_state import GameState
+
+_FORMATS = ("jsonl", "csv")
+
+# Random games last about 120 turns, far fewer than the cap, which is only there so that a game going round in circles
+# cannot hold up a worker.
+DEFAULT_MAX_TURNS = 1000
+DEFAULT_MAX_REPETITIONS = 3
+
+
+@dataclass(frozen=True)
+class GameRecord:
+	game_index: int
+	winner_id: PlayerId
+	reason: str
+	end_turn_number: int
+	move_count: int
+	p1_move_count: int
+	p2_move_count: int
+	illegal_move_count: int
+
+
+@dataclass(frozen=True)
+class SimulationSummary:
+	game_count: int
+	seconds: float
+	wins: dict[PlayerId, int]
+	# Games stopped by the turn cap or a repeated position, and adjudicated.
+	capped_count: int
+
+	@property
+	def games_per_second(self) -> float:
+		return self.game_count / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class _GameLimits:
+	max_turns: int | None
+	max_repetitions: int | None
+
+
+def _play_game(game_index: int, seed_sequence: SeedSequence, agents: dict[PlayerId, str],
+			   limits: _GameLimits) -> GameRecord:
+	# One stream for the decks and one per player, so that swapping an agent does not change the deals.
+	deck_seed, *player_seeds = seed_sequence.spawn(1 + len(PlayerId))
+
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(deck_seed)))
+
+	players = {
+		player_id: AGENT_FACTORIES[agents[player_id]](default_rng(player_seed))
+		for player_id, player_seed in zip(PlayerId, player_seeds)
+	}
+	get_move = make_get_move_by_player(players)
+
+	move_counts = {player_id: 0 for player_id in PlayerId}
+	illegal_move_count = 0
+
+	def on_applied(_: GameState, move: Move) -> None:
+		move_counts[move.player_id] += 1
+
+	def on_error(_: GameState, __: str) -> None:
+		nonlocal illegal_move_count
+		illegal_move_count += 1
+
+	try:
+		result = run(state, get_move, on_applied=on_applied, on_error=on_error, max_turns=limits.max_turns,
+					 max_repetitions=limits.max_repetitions)
+	finally:
+		# Agents holding resources, e.g. the process pool of "IsmctsAgent", release them with "close".
+		for player in players.values():
+			close = getattr(player, "close", None)
+
+			if close is not None:
+				close()
+
+	return GameRecord(
+		game_index=game_index,
+		winner_id=result.winner_id,
+		reason=result.reason.value,
+		end_turn_number=result.end_turn_number,
+		move_count=sum(move_counts.values()),
+		p1_move_count=move_counts[PlayerId.P1],
+		p2_move_count=move_counts[PlayerId.P2],
+		illegal_move_count=illegal_move_count,
+	)
+
+
+def _play_games(game_indices: range, seed_sequences: list[SeedSequence], agents: dict[PlayerId, str],
+				limits: _GameLimits) -> list[GameRecord]:
+	return [_play_game(game_index, seed_sequence, agents, limits)
+			for game_index, seed_sequence in zip(game_indices, seed_sequences)]
+
+
+# Yields the record of every game as soon as its batch is done, so not in game order.
+# Each game gets its own seed spawned from "master_seed", so a game plays out the same whatever the number of workers.
+# See "game.engine.loop.run" for "max_turns" and "max_repetitions", None turning either check off.
+def simulate(game_count: int, agents: dict[PlayerId, str], master_seed: int, *,
+			 workers: int | None = None,
+			 batch_size: int = 50,
+			 max_turns: int | None = DEFAULT_MAX_TURNS,
+			 max_repetitions: int | None = DEFAULT_MAX_REPETITIONS) -> Iterator[GameRecord]:
+	seed_sequences = SeedSequence(master_seed).spawn(game_count)
+	limits = _GameLimits(max_turns=max_turns, max_repetitions=max_repetitions)
+	batches = [range(start, min(start + batch_size, game_count)) for start in range(0, game_count, batch_size)]
+
+	if workers == 1:
+		for batch in batches:
+			yield from _play_games(batch, seed_sequences[batch.start:batch.stop], agents, limits)
+
+		return
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(_play_games, batch, seed_sequences[batch.start:batch.stop], agents, limits)
+				   for batch in batches]
+
+		for future in as_completed(futures):
+			yield from future.result()
+
+
+def write_records(records: Iterable[GameRecord], stream: TextIO, file_format: str) -> SimulationSummary:
+	start = time.perf_counter()
+	wins = {player_id: 0 for player_id in PlayerId}
+	game_count = 0
+	capped_count = 0
+
+	csv_writer = None
+
+	if file_format == "csv":
+		csv_writer = csv.DictWriter(stream, fieldnames=list(GameRecord.__dataclass_fields__))
+		csv_writer.writeheader()
+
+	for record in records:
+		row = asdict(record)
+
+		if csv_writer is not None:
+			csv_writer.writerow(row)
+		else:
+			stream.write(json.dumps(row) + "\n")
+
+		wins[record.winner_id] += 1
+		game_count += 1
+		capped_count += WinReason(record.reason) in CAPPED_REASONS
+
+	return SimulationSummary(game_count=game_count, seconds=time.perf_counter() - start, wins=wins,
+							 capped_count=capped_count)
+
+
+def _parse_args() -> argparse.Namespace:
+	parser = argparse.ArgumentParser(description="Play games between agents without any interface.")
+	parser.add_argument("--games", type=int, default=1000)
+	parser.add_argument("--seed", type=int, default=42)
+	parser.add_argument("--workers", type=int, default=os.cpu_count())
+	parser.add_argument("--batch-size", type=int, default=50)
+	parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS,
+						help="Turn at which a game is stopped and adjudicated, 0 for no limit.")
+	parser.add_argument("--max-repetitions", type=int, default=DEFAULT_MAX_REPETITIONS,
+						help="Times a position may be reached before the game is adjudicated, 0 for no limit.")
+	parser.add_argument("--p1", choices=list(AGENT_FACTORIES), default="random")
+	parser.add_argument("--p2", choices=list(AGENT_FACTORIES), default="random")
+	parser.add_argument("--output", default="-", help="Path of the results, '-' for the standard output.")
+	parser.add_argument("--format", choices=_FORMATS, default=None,
+						help="Defaults to the extension of the output, or jsonl.")
+
+	return parser.parse_args()
+
+
+def main() -> None:
+	args = _parse_args()
+
+	file_format = args.format
+
+	if file_format is None:
+		extension = os.path.splitext(args.output)[1].lstrip(".")
+		file_format = extension if extension in _FORMATS else "jsonl"
+
+	records = simulate(args.games, {PlayerId.P1: args.p1, PlayerId.P2: args.p2}, args.seed,
+					   workers=args.workers, batch_size=args.batch_size, max_turns=args.max_turns or None,
+					   max_repetitions=args.max_repetitions or None)
+
+	if args.output == "-":
+		summary = write_records(records, sys.stdout, file_format)
+	else:
+		with open(args.output, "w", newline="") as stream:
+			summary = write_records(records, stream, file_format)
+
+	print(f"{summary.game_count} games in {summary.seconds:.2f}s ({summary.games_per_second:.1f} games/s), "
+		  f"wins P1: {summary.wins[PlayerId.P1]}, P2: {summary.wins[PlayerId.P2]}, "
+		  f"adjudicated: {summary.capped_count}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+	main()
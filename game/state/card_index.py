@@ -0,0 +1,119 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from enum import Enum
+
+from game.caravan.enums import CaravanId
+from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId, STANDARD_DECK_SIZE
+from game.cards.enums import Rank, Suit
+from game.player.enums import PlayerId
+
+
+class CardZone(Enum):
+	DECK = 'deck'
+	HAND = 'hand'
+	CARAVAN = 'caravan'
+	ATTACHMENT = 'attachment'
+
+
+@dataclass(frozen=True)
+class CardLocation:
+	zone: CardZone
+	# Holder of the deck or hand, or owner of the caravan the card lies in.
+	owner: PlayerId
+	# Index in the deck (cards are drawn from the end), in the caravan pile, or in the attachments of the target card.
+	# 'None' for cards in hand, as hands are not ordered.
+	position: int | None = field(default=None)
+	caravan_id: CaravanId | None = field(default=None)
+	# Base card that a face card is attached to.
+	target_base_id: CardId | None = field(default=None)
+
+
+# Locations cannot change, so those of hands and decks are built once and shared by every card placed there.
+_HAND_LOCATIONS = {owner: CardLocation(zone=CardZone.HAND, owner=owner) for owner in PlayerId}
+_DECK_LOCATIONS = {owner: [CardLocation(zone=CardZone.DECK, owner=owner, position=position)
+						   for position in range(STANDARD_DECK_SIZE)] for owner in PlayerId}
+
+
+@dataclass
+class CardIndex:
+	locations: dict[CardId, CardLocation] = field(default_factory=dict)
+	cards: dict[CardId, Card] = field(default_factory=dict)
+	by_rank: dict[Rank, set[CardId]] = field(default_factory=lambda: {rank: set() for rank in Rank})
+	by_suit: dict[Suit, set[CardId]] = field(default_factory=lambda: {suit: set() for suit in Suit})
+
+	def clone(self) -> 'CardIndex':
+		return CardIndex(
+			locations=dict(self.locations),
+			cards=dict(self.cards),
+			by_rank={rank: set(card_ids) for rank, card_ids in self.by_rank.items()},
+			by_suit={suit: set(card_ids) for suit, card_ids in self.by_suit.items()},
+		)
+
+	def get_location(self, card_id: CardId) -> CardLocation | None:
+		return self.locations.get(card_id)
+
+	def get_card(self, card_id: CardId) -> Card | None:
+		return self.cards.get(card_id)
+
+	def card_ids_by_rank(self, rank: Rank) -> set[CardId]:
+		return self.by_rank[rank]
+
+	def card_ids_by_suit(self, suit: Suit) -> set[CardId]:
+		return self.by_suit[suit]
+
+	def place(self, card: Card, location: CardLocation) -> None:
+		if card.id not in self.cards:
+			self.cards[card.id] = card
+			self.by_rank[card.rank].add(card.id)
+
+			if card.suit is not None:
+				self.by_suit[card.suit].add(card.id)
+
+		self.locations[card.id] = location
+
+	def discard(self, card_id: CardId) -> None:
+		card = self.cards.pop(card_id, None)
+
+		if card is None:
+			return
+
+		del self.locations[card_id]
+		self.by_rank[card.rank].discard(card_id)
+
+		if card.suit is not None:
+			self.by_suit[card.suit].discard(card_id)
+
+	# Moves cards already in the index, e.g. hidden cards dealt again by a determinization, without re-indexing them.
+	def relocate(self, card_ids: Iterable[CardId], locations: Iterable[CardLocation]) -> None:
+		self.locations.update(zip(card_ids, locations))
+
+	def place_in_deck(self, card: Card, owner: PlayerId, position: int) -> None:
+		locations = _DECK_LOCATIONS[owner]
+
+		if position < len(locations):
+			self.place(card, locations[position])
+		else:
+			self.place(card, CardLocation(zone=CardZone.DECK, owner=owner, position=position))
+
+	def place_in_hand(self, card: Card, owner: PlayerId) -> None:
+		self.place(card, _HAND_LOCATIONS[owner])
+
+	def place_in_caravan(self, caravan_id: CaravanId, position: int, played_card: PlayedCard) -> None:
+		base_card = played_card.base_card
+
+		self.place(base_card, CardLocation(zone=CardZone.CARAVAN, owner=caravan_id.owner, position=position,
+										   caravan_id=caravan_id))
+
+		for attachment_position, face_card in enumerate(played_card.attachments):
+			self.place_attachment(caravan_id, base_card.id, attachment_position, face_card)
+
+	def place_attachment(self, caravan_id: CaravanId, target_base_id: CardId, position: int, face_card: Card) -> None:
+		self.place(face_card, CardLocation(zone=CardZone.ATTACHMENT, owner=caravan_id.owner, position=position,
+										   caravan_id=caravan_id, target_base_id=target_base_id))
+
+	def discard_played_card(self, played_card: PlayedCard) -> None:
+		self.discard(played_card.base_card.id)
+
+		for face_card in played_card.attachments:
+			self.discard(face_card.id)
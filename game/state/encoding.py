@@ -0,0 +1,103 @@
+import numpy as np
+
+from game.caravan.constants import CARAVAN_COUNT, MAX_PILE
+from game.caravan.enums import Direction, RouteId
+from game.cards.card import Card
+from game.cards.enums import Rank, Suit
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+
+# Fixed layout of a GameState seen from one player, for training pipelines. Caravans go from the player's own A, B and
+# C to their opponent's, so that both players read the same layout. The opponent's hand is reduced to its size and
+# decks to their sizes, nothing hidden from the player is written.
+# Cards are told apart by face: 13 ranks x 4 suits, then the Joker.
+_SUITS = list(Suit)
+_FACE_INDICES = {(rank, suit): rank_index * len(_SUITS) + suit_index
+				 for rank_index, rank in enumerate(rank for rank in Rank if rank != Rank.JOKER)
+				 for suit_index, suit in enumerate(_SUITS)}
+_FACE_INDICES[(Rank.JOKER, None)] = len(_FACE_INDICES)
+
+CARD_FACE_COUNT = len(_FACE_INDICES)
+# Per pile position: base value, suit one-hot, King count, Queen count.
+PILE_FEATURES = 2 + len(_SUITS) + 1
+# Per caravan: score, pile size, direction one-hot, current suit one-hot.
+CARAVAN_FEATURES = 2 + len(Direction) + len(_SUITS)
+
+_SUIT_INDICES = {suit: suit_index for suit_index, suit in enumerate(_SUITS)}
+# Value and suit one-hot of every numeric card, the start of its pile features.
+_BASE_CARD_FEATURES = {(rank, suit): (rank.value,) + tuple(int(suit == other_suit) for other_suit in _SUITS)
+					   for rank in Rank if rank.is_numeric for suit in _SUITS}
+_DIRECTION_INDICES = {direction: direction_index for direction_index, direction in enumerate(Direction)}
+
+# Face counts of the hand.
+HAND = slice(0, CARD_FACE_COUNT)
+PILES = slice(HAND.stop, HAND.stop + CARAVAN_COUNT * MAX_PILE * PILE_FEATURES)
+CARAVANS = slice(PILES.stop, PILES.stop + CARAVAN_COUNT * CARAVAN_FEATURES)
+# Own deck size, own hand size, opponent's deck size, opponent's hand size.
+CARD_COUNTS = slice(CARAVANS.stop, CARAVANS.stop + 4)
+# Phase one-hot.
+PHASE = slice(CARD_COUNTS.stop, CARD_COUNTS.stop + len(GamePhase))
+TURN = CARD_COUNTS.stop + len(GamePhase)
+
+ENCODING_SIZE = TURN + 1
+
+
+def _get_face_index(card: Card) -> int:
+	return _FACE_INDICES[(card.rank, card.suit)]
+
+
+# Writes the state seen by "perspective" into "out", a (ENCODING_SIZE,) array of float32, or int8 for a smaller one.
+# Integer arrays get the caravan scores and the turn number capped at their largest value, as both can outgrow int8.
+def encode_state(state: GameState, perspective: PlayerId, out: np.ndarray | None = None) -> np.ndarray:
+	if out is None:
+		out = np.zeros(ENCODING_SIZE, dtype=np.float32)
+	else:
+		out[:] = 0
+
+	limit = np.iinfo(out.dtype).max if np.issubdtype(out.dtype, np.integer) else None
+
+	player = state.players[perspective]
+	opponent = state.players[PlayerId.P2 if perspective == PlayerId.P1 else PlayerId.P1]
+
+	hand = out[HAND]
+
+	for card in player.hand.values():
+		hand[_get_face_index(card)] += 1
+
+	piles = out[PILES].reshape(CARAVAN_COUNT, MAX_PILE, PILE_FEATURES)
+	caravans = out[CARAVANS].reshape(CARAVAN_COUNT, CARAVAN_FEATURES)
+	first_caravan = len(RouteId) * (perspective - PlayerId.P1)
+
+	for caravan_id, caravan in state.caravans.items():
+		caravan_number = (caravan_id - first_caravan) % CARAVAN_COUNT
+
+		if caravan.pile:
+			piles[caravan_number, :len(caravan.pile)] = [
+				_BASE_CARD_FEATURES[(played_card.base_card.rank, played_card.base_card.suit)]
+				+ (played_card.king_count, played_card.queen_count)
+				for played_card in caravan.pile]
+
+		features = caravans[caravan_number]
+		features[0] = caravan.score if limit is None else min(caravan.score, limit)
+		features[1] = len(caravan.pile)
+		features[2 + _DIRECTION_INDICES[caravan.direction]] = 1
+
+		current_suit = caravan.current_suit
+
+		if current_suit is not None:
+			features[2 + len(Direction) + _SUIT_INDICES[current_suit]] = 1
+
+	out[CARD_COUNTS] = len(player.deck), len(player.hand), len(opponent.deck), len(opponent.hand)
+	out[PHASE.start + state.game_phase] = 1
+	out[TURN] = state.turn_number if limit is None else min(state.turn_number, limit)
+
+	return out
+
+
+# Fills row "i" of "out", a (len(states), ENCODING_SIZE) array, with "states[i]" seen by "perspectives[i]".
+def encode_states(states: list[GameState], perspectives: list[PlayerId], out: np.ndarray) -> np.ndarray:
+	for row, (state, perspective) in enumerate(zip(states, perspectives)):
+		encode_state(state, perspective, out[row])
+
+	return out
@@ -21,3 +21,6 @@ class WinReason(Enum):
 	THREE_CARAVANS = "three_caravans"
 	CONCEDE = "concede"
 	OUT_OF_CARDS = "out_of_cards"
+	# Games cut short by "game.engine.loop.run", and adjudicated by "game.engine.victory.adjudicate".
+	TURN_LIMIT = "turn_limit"
+	REPETITION = "repetition"
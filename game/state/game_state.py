@@ -1,21 +1,30 @@
 from dataclasses import dataclass, field
-from uuid import UUID
 
 from game.caravan.caravan import Caravan
 from game.caravan.enums import CaravanId, RouteId
-from game.cards.card import Card
+from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId
 from game.player.enums import PlayerId
+from game.state.card_index import CardIndex
 from game.state.enums import GamePhase, WinReason
+from game.state.victory_cache import VictoryCache
+from game.state.zobrist import player_key, phase_key, deck_size_key, hand_key, played_card_key, attachment_key, \
+	pile_shift_key
+
+_ROUTE_CARAVAN_IDS = {(caravan_id.owner, caravan_id.route): caravan_id for caravan_id in CaravanId}
 
 
 @dataclass
 class PlayerState:
 	deck: list[Card]
-	hand: dict[UUID, Card]
+	hand: dict[CardId, Card]
 
-	def get_card(self, card_id: UUID) -> Card | None:
+	def get_card(self, card_id: CardId) -> Card | None:
 		return self.hand.get(card_id)
 
+	def clone(self) -> 'PlayerState':
+		return PlayerState(deck=list(self.deck), hand=dict(self.hand))
+
 	def add_card_to_hand_card(self, card: Card) -> None:
 		self.hand[card.id] = card
 
@@ -35,13 +44,192 @@ class GameState:
 	turn_number: int
 	game_phase: GamePhase
 	game_result: GameResult | None = field(default=None)
+	# Location of every card in play, follows the caravans through "CaravanListener" and hands/decks through the methods below.
+	card_index: CardIndex = field(default_factory=CardIndex, init=False, repr=False, compare=False)
+	# Caravans that may still be shared with a copy-on-write clone, copied by "get_mutable_caravan" before any change.
+	shared_caravans: set[CaravanId] = field(default_factory=set, init=False, repr=False, compare=False)
+	# Route winners and card counts of "game.engine.victory", dropped for the routes and players changed since.
+	victory_cache: VictoryCache = field(default_factory=VictoryCache, init=False, repr=False, compare=False)
+	# See "game.state.zobrist", kept up to date by the methods below, so the current player and phase are changed
+	# through "set_current_player" and "set_game_phase".
+	zobrist_hash: int = field(default=0, init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		for player_id, player in self.players.items():
+			for position, card in enumerate(player.deck):
+				self.card_index.place_in_deck(card, player_id, position)
+
+			for card in player.hand.values():
+				self.card_index.place_in_hand(card, player_id)
+
+		for caravan_id, caravan in self.caravans.items():
+			for position, played_card in enumerate(caravan.pile):
+				self.card_index.place_in_caravan(caravan_id, position, played_card)
+
+			caravan.listener = self
+
+		self.zobrist_hash = self.compute_zobrist_hash()
+
+	def compute_zobrist_hash(self) -> int:
+		zobrist_hash = player_key(self.current_player) ^ phase_key(self.game_phase)
+
+		for player_id, player in self.players.items():
+			zobrist_hash ^= deck_size_key(player_id, len(player.deck))
+
+			for card_id in player.hand:
+				zobrist_hash ^= hand_key(player_id, card_id)
+
+		for caravan_id, caravan in self.caravans.items():
+			for position, played_card in enumerate(caravan.pile):
+				zobrist_hash ^= played_card_key(caravan_id, position, played_card)
+
+		return zobrist_hash
+
+	def set_current_player(self, player_id: PlayerId) -> None:
+		self.zobrist_hash ^= player_key(self.current_player) ^ player_key(player_id)
+		self.current_player = player_id
+
+	def set_game_phase(self, game_phase: GamePhase) -> None:
+		self.zobrist_hash ^= phase_key(self.game_phase) ^ phase_key(game_phase)
+		self.game_phase = game_phase
 
 	def get_caravan(self, caravan_id: CaravanId) -> Caravan | None:
 		return self.caravans.get(caravan_id)
 
+	# Caravans must be fetched through here to be changed, so that a caravan shared with a clone is copied first.
+	def get_mutable_caravan(self, caravan_id: CaravanId) -> Caravan | None:
+		if caravan_id in self.shared_caravans:
+			self.shared_caravans.discard(caravan_id)
+
+			caravan = self.caravans[caravan_id].clone()
+			caravan.listener = self
+			self.caravans[caravan_id] = caravan
+
+		return self.caravans.get(caravan_id)
+
+	# Cards are immutable and shared, only the containers holding them are copied.
+	# With "copy_on_write", the caravans themselves are shared too until either state changes them.
+	def clone(self, copy_on_write: bool = False) -> 'GameState':
+		state = GameState.__new__(GameState)
+		state.players = {player_id: player.clone() for player_id, player in self.players.items()}
+		state.current_player = self.current_player
+		state.turn_number = self.turn_number
+		state.game_phase = self.game_phase
+		state.game_result = self.game_result
+		state.card_index = self.card_index.clone()
+		state.victory_cache = self.victory_cache.clone()
+		state.zobrist_hash = self.zobrist_hash
+
+		if copy_on_write:
+			state.caravans = dict(self.caravans)
+			state.shared_caravans = set(self.caravans)
+			# Neither state knows when the other lets go of a caravan, so both copy it on their next change.
+			self.shared_caravans.update(self.caravans)
+		else:
+			state.caravans = {caravan_id: caravan.clone() for caravan_id, caravan in self.caravans.items()}
+			state.shared_caravans = set()
+
+			for caravan in state.caravans.values():
+				caravan.listener = state
+
+		return state
+
 	def get_caravan_by_route_player(self, player_id: PlayerId, route_id: RouteId) -> tuple[CaravanId, Caravan] | None:
-		for caravan_id, caravan in self.caravans.items():
-			if caravan_id.route == route_id and caravan_id.owner == player_id:
-				return caravan_id, caravan
+		caravan_id = _ROUTE_CARAVAN_IDS.get((player_id, route_id))
+		caravan = self.caravans.get(caravan_id) if caravan_id is not None else None
+
+		if caravan is None:
+			return None
+
+		return caravan_id, caravan
+
+	def count_cards_left(self, player_id: PlayerId) -> int:
+		card_count = self.victory_cache.card_counts.get(player_id)
+
+		if card_count is None:
+			player = self.players[player_id]
+			card_count = len(player.hand) + len(player.deck)
+			self.victory_cache.card_counts[player_id] = card_count
+
+		return card_count
+
+	def draw_card(self, player_id: PlayerId) -> Card | None:
+		player = self.players[player_id]
+
+		if not player.deck:
+			return None
+
+		card = player.deck.pop()
+		player.add_card_to_hand_card(card)
+		self.card_index.place_in_hand(card, player_id)
+		self.victory_cache.mark_player_dirty(player_id)
+		self.zobrist_hash ^= (deck_size_key(player_id, len(player.deck) + 1) ^ deck_size_key(player_id, len(player.deck))
+							  ^ hand_key(player_id, card.id))
+
+		return card
+
+	def take_card_from_hand(self, player_id: PlayerId, card_id: CardId) -> Card:
+		card = self.players[player_id].hand.pop(card_id)
+		# The card is out of play until it is placed on a caravan, which the caravan reports back.
+		self.card_index.discard(card_id)
+		self.victory_cache.mark_player_dirty(player_id)
+		self.zobrist_hash ^= hand_key(player_id, card_id)
+
+		return card
+
+	def return_card_to_hand(self, player_id: PlayerId, card: Card, position: int | None = None) -> None:
+		hand = self.players[player_id].hand
+
+		if position is None or position >= len(hand):
+			hand[card.id] = card
+		else:
+			# Hands keep their insertion order, which the CLI and the serializers rely on, so it is restored as well.
+			cards = list(hand.values())
+			cards.insert(position, card)
+
+			hand.clear()
+			hand.update((hand_card.id, hand_card) for hand_card in cards)
+
+		self.card_index.place_in_hand(card, player_id)
+		self.victory_cache.mark_player_dirty(player_id)
+		self.zobrist_hash ^= hand_key(player_id, card.id)
+
+	def return_card_to_deck(self, player_id: PlayerId, card_id: CardId) -> Card:
+		player = self.players[player_id]
+		card = player.hand.pop(card_id)
+
+		player.deck.append(card)
+		self.card_index.place_in_deck(card, player_id, len(player.deck) - 1)
+		self.victory_cache.mark_player_dirty(player_id)
+		self.zobrist_hash ^= (hand_key(player_id, card_id) ^ deck_size_key(player_id, len(player.deck) - 1)
+							  ^ deck_size_key(player_id, len(player.deck)))
+
+		return card
+
+	def on_base_card_added(self, caravan: Caravan, position: int) -> None:
+		self.victory_cache.mark_route_dirty(caravan.id.route)
+		self.zobrist_hash ^= (played_card_key(caravan.id, position, caravan.pile[position])
+							  ^ pile_shift_key(caravan.id, caravan.pile, position + 1, 1))
+
+		for shifted_position in range(position, len(caravan.pile)):
+			self.card_index.place_in_caravan(caravan.id, shifted_position, caravan.pile[shifted_position])
+
+	def on_face_card_attached(self, caravan: Caravan, played_card: PlayedCard, face_card: Card) -> None:
+		self.victory_cache.mark_route_dirty(caravan.id.route)
+		self.zobrist_hash ^= attachment_key(played_card.base_card.id, len(played_card.attachments) - 1, face_card.id)
+		self.card_index.place_attachment(caravan.id, played_card.base_card.id, len(played_card.attachments) - 1,
+										 face_card)
+
+	def on_face_card_detached(self, caravan: Caravan, played_card: PlayedCard, face_card: Card) -> None:
+		self.victory_cache.mark_route_dirty(caravan.id.route)
+		self.zobrist_hash ^= attachment_key(played_card.base_card.id, len(played_card.attachments), face_card.id)
+		self.card_index.discard(face_card.id)
+
+	def on_base_card_removed(self, caravan: Caravan, position: int, played_card: PlayedCard) -> None:
+		self.victory_cache.mark_route_dirty(caravan.id.route)
+		self.zobrist_hash ^= (played_card_key(caravan.id, position, played_card)
+							  ^ pile_shift_key(caravan.id, caravan.pile, position, -1))
+		self.card_index.discard_played_card(played_card)
 
-		return None
+		for shifted_position in range(position, len(caravan.pile)):
+			self.card_index.place_in_caravan(caravan.id, shifted_position, caravan.pile[shifted_position])
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+
+from game.caravan.enums import CaravanId, RouteId
+from game.player.enums import PlayerId
+
+
+# What "game.engine.victory.check_victory" worked out since the last change to a route or to a player's cards.
+# A route or player missing from here is dirty, and is worked out again on the next check.
+@dataclass
+class VictoryCache:
+	# Winning caravan of each route, 'None' for a route that is not sold.
+	route_winners: dict[RouteId, CaravanId | None] = field(default_factory=dict)
+	# Cards left in hand and deck of each player.
+	card_counts: dict[PlayerId, int] = field(default_factory=dict)
+
+	def clone(self) -> 'VictoryCache':
+		return VictoryCache(route_winners=dict(self.route_winners), card_counts=dict(self.card_counts))
+
+	def mark_route_dirty(self, route_id: RouteId) -> None:
+		self.route_winners.pop(route_id, None)
+
+	def mark_player_dirty(self, player_id: PlayerId) -> None:
+		self.card_counts.pop(player_id, None)
@@ -0,0 +1,107 @@
+from game.caravan.enums import CaravanId
+from game.cards.card import PlayedCard
+from game.cards.card_id import CardId
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase
+
+# 64-bit Zobrist keys of everything a position is made of. "GameState.zobrist_hash" is the XOR of the keys of its
+# current parts, and every change to the state XORs the keys of what changed in and out.
+# Keys are derived from their parts with SplitMix64 on first use, so they are the same in every process and for any
+# card id, custom cards included.
+_MASK = (1 << 64) - 1
+_SEED = 0x2545F4914F6CDD1D
+
+_CARAVAN_CARD = 1
+_ATTACHMENT = 2
+_HAND = 3
+_DECK_SIZE = 4
+_PLAYER = 5
+_PHASE = 6
+_HAND_SIZE = 7
+_TURN = 8
+
+_keys: dict[tuple[int, ...], int] = dict()
+
+
+def _split_mix(value: int) -> int:
+	value = (value + 0x9E3779B97F4A7C15) & _MASK
+	value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+	value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+
+	return value ^ (value >> 31)
+
+
+# Key of any parts, not kept, for keys that are seldom used again.
+def compute_key(parts: tuple[int, ...]) -> int:
+	key = _SEED
+
+	for part in parts:
+		key = _split_mix(key ^ part)
+
+	return key
+
+
+def _get_key(parts: tuple[int, ...]) -> int:
+	key = _keys.get(parts)
+
+	if key is None:
+		key = compute_key(parts)
+		_keys[parts] = key
+
+	return key
+
+
+def caravan_card_key(caravan_id: CaravanId, position: int, card_id: CardId) -> int:
+	return _get_key((_CARAVAN_CARD, int(caravan_id), position, card_id))
+
+
+# Attachments are keyed by the base card they are on, so they keep their key when that card moves in the pile.
+def attachment_key(target_base_id: CardId, position: int, card_id: CardId) -> int:
+	return _get_key((_ATTACHMENT, target_base_id, position, card_id))
+
+
+def hand_key(player_id: PlayerId, card_id: CardId) -> int:
+	return _get_key((_HAND, int(player_id), card_id))
+
+
+# Only the size of a deck is part of the position, not the order of its cards.
+def deck_size_key(player_id: PlayerId, size: int) -> int:
+	return _get_key((_DECK_SIZE, int(player_id), size))
+
+
+def player_key(player_id: PlayerId) -> int:
+	return _get_key((_PLAYER, int(player_id)))
+
+
+def phase_key(game_phase: GamePhase) -> int:
+	return _get_key((_PHASE, int(game_phase)))
+
+
+# Not part of "GameState.zobrist_hash", for digests of what a player sees, see "network.shared.views".
+def hand_size_key(player_id: PlayerId, size: int) -> int:
+	return _get_key((_HAND_SIZE, int(player_id), size))
+
+
+def turn_key(turn_number: int) -> int:
+	return _get_key((_TURN, turn_number))
+
+
+def played_card_key(caravan_id: CaravanId, position: int, played_card: PlayedCard) -> int:
+	base_id = played_card.base_card.id
+	key = caravan_card_key(caravan_id, position, base_id)
+
+	for attachment_position, face_card in enumerate(played_card.attachments):
+		key ^= attachment_key(base_id, attachment_position, face_card.id)
+
+	return key
+
+
+# Change of the keys of the base cards from "start" up, which have moved by "shift" positions to where they are now.
+def pile_shift_key(caravan_id: CaravanId, pile: list[PlayedCard], start: int, shift: int) -> int:
+	key = 0
+
+	for position in range(start, len(pile)):
+		base_id = pile[position].base_card.id
+		key ^= caravan_card_key(caravan_id, position - shift, base_id) ^ caravan_card_key(caravan_id, position, base_id)
+
+	return key
@@ -0,0 +1,137 @@
+import numpy as np
+
+from game.caravan.enums import Direction
+from game.state.enums import GamePhase
+from game.vector.batch import GameBatch, CARAVAN_COUNT, HAND_SLOTS, MAX_PILE, compute_top_values, compute_directions, \
+	compute_current_suits
+from game.vector.engine import ACTION_DTYPE, ACTION_PLAY, ACTION_ATTACH, ACTION_DISCARD, ACTION_DISCARD_CARAVAN, \
+	ACTION_CONCEDE
+from game.vector.tables import NO_CARD, KIND_NUMERIC, DIRECTION_CODES, card_kinds, card_values, card_suits
+
+# A fixed action space, seen from the player to act: caravans are numbered from their own A, B and C (0-2) to their
+# opponent's (3-5), so that the same index means the same thing for both players.
+OWN_CARAVAN_COUNT = CARAVAN_COUNT // 2
+
+# Hand slot x own caravan.
+PLAY_OFFSET = 0
+PLAY_COUNT = HAND_SLOTS * OWN_CARAVAN_COUNT
+# Hand slot x caravan x pile position of the target.
+ATTACH_OFFSET = PLAY_OFFSET + PLAY_COUNT
+ATTACH_COUNT = HAND_SLOTS * CARAVAN_COUNT * MAX_PILE
+# Hand slot.
+DISCARD_OFFSET = ATTACH_OFFSET + ATTACH_COUNT
+DISCARD_COUNT = HAND_SLOTS
+# Own caravan.
+DISCARD_CARAVAN_OFFSET = DISCARD_OFFSET + DISCARD_COUNT
+DISCARD_CARAVAN_COUNT = OWN_CARAVAN_COUNT
+CONCEDE_INDEX = DISCARD_CARAVAN_OFFSET + DISCARD_CARAVAN_COUNT
+
+ACTION_COUNT = CONCEDE_INDEX + 1
+
+_RELATIVE_CARAVANS = np.array([np.roll(np.arange(CARAVAN_COUNT), -OWN_CARAVAN_COUNT * player) for player in range(2)])
+
+
+# (B, caravans), the caravan id behind each relative caravan number, for the player to act in every game.
+def relative_caravans(batch: GameBatch) -> np.ndarray:
+	return _RELATIVE_CARAVANS[batch.current_players]
+
+
+# (B, ACTION_COUNT), True for every action that "game.rules.ruleset" allows the player to act. Written into "out" when
+# given, so that a training loop can reuse one buffer.
+def legal_action_masks(batch: GameBatch, out: np.ndarray | None = None) -> np.ndarray:
+	if out is None:
+		out = np.zeros((batch.size, ACTION_COUNT), dtype=bool)
+
+	rows = np.arange(batch.size)[:, np.newaxis]
+	caravans = relative_caravans(batch)
+	own_caravans = caravans[:, :OWN_CARAVAN_COUNT]
+
+	playing = batch.phases != GamePhase.FINISHED
+	is_main = (batch.phases == GamePhase.MAIN)[:, np.newaxis]
+	is_setup = (batch.phases == GamePhase.SETUP)[:, np.newaxis]
+
+	cards = batch.hands[rows[:, 0], batch.current_players]
+	card_kind = card_kinds(cards)
+	card_value = card_values(cards)[:, :, np.newaxis]
+	card_suit = card_suits(cards)[:, :, np.newaxis]
+
+	top_values, _ = compute_top_values(batch)
+	top_value = top_values[rows, own_caravans][:, np.newaxis, :]
+	direction = compute_directions(batch)[rows, own_caravans][:, np.newaxis, :]
+	current_suit = compute_current_suits(batch)[rows, own_caravans][:, np.newaxis, :]
+	own_pile_sizes = batch.pile_sizes[rows, own_caravans]
+
+	follows_caravan = ((top_value == 0) |
+					   ((top_value != card_value) &
+						((direction == DIRECTION_CODES[Direction.UNSET]) |
+						 (current_suit == card_suit) |
+						 ((top_value > card_value) & (direction == DIRECTION_CODES[Direction.DESCENDING])) |
+						 ((top_value < card_value) & (direction == DIRECTION_CODES[Direction.ASCENDING])))))
+
+	can_play = ((card_kind == KIND_NUMERIC)[:, :, np.newaxis] &
+				(~is_setup | (own_pile_sizes == 0))[:, np.newaxis, :] &
+				follows_caravan)
+
+	pile_sizes = batch.pile_sizes[rows, caravans]
+	has_target = np.arange(MAX_PILE) < pile_sizes[:, :, np.newaxis]
+	can_attach = ((card_kind > KIND_NUMERIC) & is_main)[:, :, np.newaxis, np.newaxis] & has_target[:, np.newaxis]
+
+	has_deck = (batch.deck_sizes[rows[:, 0], batch.current_players] > 0)[:, np.newaxis]
+
+	out[:, PLAY_OFFSET:ATTACH_OFFSET] = can_play.reshape(batch.size, PLAY_COUNT)
+	out[:, ATTACH_OFFSET:DISCARD_OFFSET] = can_attach.reshape(batch.size, ATTACH_COUNT)
+	out[:, DISCARD_OFFSET:DISCARD_CARAVAN_OFFSET] = (cards != NO_CARD) & is_main & has_deck
+	out[:, DISCARD_CARAVAN_OFFSET:CONCEDE_INDEX] = is_main
+	out[:, CONCEDE_INDEX] = True
+	out &= playing[:, np.newaxis]
+
+	return out
+
+
+# Turns an index of the action space into the structured action "game.vector.engine.step_batch" takes, for every game.
+def decode_actions(batch: GameBatch, indices: np.ndarray) -> np.ndarray:
+	caravans = relative_caravans(batch)
+	rows = np.arange(batch.size)
+	actions = np.zeros(batch.size, dtype=ACTION_DTYPE)
+
+	plays = (indices >= PLAY_OFFSET) & (indices < ATTACH_OFFSET)
+	slots, own_caravans = np.divmod(indices - PLAY_OFFSET, OWN_CARAVAN_COUNT)
+	actions['kind'][plays] = ACTION_PLAY
+	actions['slot'][plays] = slots[plays]
+	actions['caravan'][plays] = caravans[rows, np.where(plays, own_caravans, 0)][plays]
+
+	attaches = (indices >= ATTACH_OFFSET) & (indices < DISCARD_OFFSET)
+	slots, rest = np.divmod(indices - ATTACH_OFFSET, CARAVAN_COUNT * MAX_PILE)
+	caravan_numbers, targets = np.divmod(rest, MAX_PILE)
+	actions['kind'][attaches] = ACTION_ATTACH
+	actions['slot'][attaches] = slots[attaches]
+	actions['caravan'][attaches] = caravans[rows, np.where(attaches, caravan_numbers, 0)][attaches]
+	actions['target'][attaches] = targets[attaches]
+
+	discards = (indices >= DISCARD_OFFSET) & (indices < DISCARD_CARAVAN_OFFSET)
+	actions['kind'][discards] = ACTION_DISCARD
+	actions['slot'][discards] = (indices - DISCARD_OFFSET)[discards]
+
+	discarded_caravans = (indices >= DISCARD_CARAVAN_OFFSET) & (indices < CONCEDE_INDEX)
+	actions['kind'][discarded_caravans] = ACTION_DISCARD_CARAVAN
+	actions['caravan'][discarded_caravans] = caravans[
+		rows, np.where(discarded_caravans, indices - DISCARD_CARAVAN_OFFSET, 0)][discarded_caravans]
+
+	actions['kind'][indices == CONCEDE_INDEX] = ACTION_CONCEDE
+
+	return actions
+
+
+# One legal action index per game, drawn uniformly from the masks. Games without legal actions get CONCEDE_INDEX.
+# Picks the n-th legal action of every row among the flattened legal ones, rather than scoring the whole action space.
+def sample_action_indices(masks: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+	legal = np.flatnonzero(masks)
+	counts = masks.sum(axis=-1)
+
+	if len(legal) == 0:
+		return np.full(len(masks), CONCEDE_INDEX)
+
+	starts = np.cumsum(counts) - counts
+	picks = np.minimum(starts + (rng.random(len(masks)) * counts).astype(np.intp), len(legal) - 1)
+
+	return np.where(counts > 0, legal[picks] % masks.shape[-1], CONCEDE_INDEX)
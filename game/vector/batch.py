@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from game.caravan.constants import CARAVAN_COUNT, MAX_PILE
+from game.caravan.enums import Direction
+from game.cards.card_id import STANDARD_DECK_SIZE, is_standard_card_id
+from game.player.enums import PlayerId
+from game.rules.constants import STARTING_HAND_SIZE
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from game.vector.tables import NO_CARD, NO_SUIT, NO_REASON, SUIT_CODES, DIRECTION_CODES, card_values, card_suits
+
+PLAYER_COUNT = len(PlayerId)
+# A hand never holds more than the starting hand, as every card played is replaced by at most one drawn card.
+HAND_SLOTS = STARTING_HAND_SIZE
+
+NO_WINNER = -1
+
+
+# B games in lockstep, game "b" being row "b" of every array. Players are stored as "PlayerId - 1", caravans by
+# "CaravanId" and phases by "GamePhase" value.
+@dataclass
+class GameBatch:
+	# (B, players, 54), cards are drawn from position "deck_sizes - 1" downwards, as "GameState.draw_card" pops the last.
+	decks: np.ndarray
+	# (B, players)
+	deck_sizes: np.ndarray
+	# (B, players, HAND_SLOTS), NO_CARD in empty slots.
+	hands: np.ndarray
+	# (B, caravans, MAX_PILE), base cards from the bottom of the pile up, NO_CARD past "pile_sizes".
+	piles: np.ndarray
+	# (B, caravans)
+	pile_sizes: np.ndarray
+	# (B, caravans, MAX_PILE), face cards attached to each base card.
+	kings: np.ndarray
+	queens: np.ndarray
+	last_queen_suits: np.ndarray
+	# (B, caravans), "Caravan.score" kept up to date by "game.vector.engine" as cards come and go.
+	scores: np.ndarray
+	# (B,)
+	current_players: np.ndarray
+	turn_numbers: np.ndarray
+	phases: np.ndarray
+	winners: np.ndarray
+	reasons: np.ndarray
+	end_turn_numbers: np.ndarray
+
+	@property
+	def size(self) -> int:
+		return len(self.current_players)
+
+	def copy(self) -> 'GameBatch':
+		return GameBatch(**{name: array.copy() for name, array in vars(self).items()})
+
+
+def create_batch(size: int) -> GameBatch:
+	return GameBatch(
+		decks=np.full((size, PLAYER_COUNT, STANDARD_DECK_SIZE), NO_CARD, dtype=np.int16),
+		deck_sizes=np.zeros((size, PLAYER_COUNT), dtype=np.int16),
+		hands=np.full((size, PLAYER_COUNT, HAND_SLOTS), NO_CARD, dtype=np.int16),
+		piles=np.full((size, CARAVAN_COUNT, MAX_PILE), NO_CARD, dtype=np.int16),
+		pile_sizes=np.zeros((size, CARAVAN_COUNT), dtype=np.int16),
+		kings=np.zeros((size, CARAVAN_COUNT, MAX_PILE), dtype=np.int8),
+		queens=np.zeros((size, CARAVAN_COUNT, MAX_PILE), dtype=np.int8),
+		last_queen_suits=np.full((size, CARAVAN_COUNT, MAX_PILE), NO_SUIT, dtype=np.int8),
+		scores=np.zeros((size, CARAVAN_COUNT), dtype=np.int32),
+		current_players=np.zeros(size, dtype=np.int8),
+		turn_numbers=np.zeros(size, dtype=np.int32),
+		phases=np.full(size, GamePhase.SETUP, dtype=np.int8),
+		winners=np.full(size, NO_WINNER, dtype=np.int8),
+		reasons=np.full(size, NO_REASON, dtype=np.int8),
+		end_turn_numbers=np.zeros(size, dtype=np.int32),
+	)
+
+
+def _check_card(card_id: int) -> int:
+	if not is_standard_card_id(card_id):
+		# TODO: Check raised errors later.
+		raise ValueError(f"Card id {card_id} is not part of a standard deck.")
+
+	return card_id
+
+
+# Hand slots are filled in hand order, which "game.vector.engine" keeps up.
+# Game results are not part of a GameState, finished games are left without one.
+def batch_from_states(states: list[GameState]) -> GameBatch:
+	batch = create_batch(len(states))
+
+	for row, state in enumerate(states):
+		for player_id, player in state.players.items():
+			player_index = player_id - PlayerId.P1
+
+			if len(player.hand) > HAND_SLOTS:
+				# TODO: Check raised errors later.
+				raise ValueError(f"Hand of {len(player.hand)} cards does not fit in {HAND_SLOTS} slots.")
+
+			batch.deck_sizes[row, player_index] = len(player.deck)
+			batch.decks[row, player_index, :len(player.deck)] = [_check_card(card.id) for card in player.deck]
+			batch.hands[row, player_index, :len(player.hand)] = [_check_card(card_id) for card_id in player.hand]
+
+		for caravan_id, caravan in state.caravans.items():
+			batch.pile_sizes[row, caravan_id] = len(caravan.pile)
+
+			for position, played_card in enumerate(caravan.pile):
+				batch.piles[row, caravan_id, position] = _check_card(played_card.base_card.id)
+				batch.kings[row, caravan_id, position] = played_card.king_count
+				batch.queens[row, caravan_id, position] = played_card.queen_count
+
+				if played_card.last_queen_suit is not None:
+					batch.last_queen_suits[row, caravan_id, position] = SUIT_CODES[played_card.last_queen_suit]
+
+		batch.current_players[row] = state.current_player - PlayerId.P1
+		batch.turn_numbers[row] = state.turn_number
+		batch.phases[row] = state.game_phase
+
+	batch.scores[:] = pile_scores(batch.piles, batch.kings)
+
+	return batch
+
+
+# Scores of the piles, counted from scratch.
+def pile_scores(piles: np.ndarray, kings: np.ndarray) -> np.ndarray:
+	return (card_values(piles) << kings).sum(axis=-1)
+
+
+def _top_positions(batch: GameBatch, offset: int = 1) -> tuple[np.ndarray, np.ndarray]:
+	positions = batch.pile_sizes.astype(np.intp) - offset
+	exists = positions >= 0
+
+	return np.maximum(positions, 0)[..., np.newaxis], exists
+
+
+def _at_positions(array: np.ndarray, positions: np.ndarray) -> np.ndarray:
+	return np.take_along_axis(array, positions, axis=-1)[..., 0]
+
+
+# (B, caravans) values of the top and next to top base cards, 0 where there is no such card.
+def compute_top_values(batch: GameBatch) -> tuple[np.ndarray, np.ndarray]:
+	top_positions, has_top = _top_positions(batch)
+	below_positions, has_below = _top_positions(batch, offset=2)
+
+	top_values = np.where(has_top, card_values(_at_positions(batch.piles, top_positions)), 0)
+	below_values = np.where(has_below, card_values(_at_positions(batch.piles, below_positions)), 0)
+
+	return top_values, below_values
+
+
+# (B, caravans) "Caravan.direction", as codes of "DIRECTION_CODES".
+def compute_directions(batch: GameBatch) -> np.ndarray:
+	top_values, below_values = compute_top_values(batch)
+	top_positions, _ = _top_positions(batch)
+
+	ascending = top_values > below_values
+	# An odd number of Queens on the top card turns the direction around.
+	flipped = (_at_positions(batch.queens, top_positions) % 2) == 1
+
+	directions = np.where(ascending != flipped, DIRECTION_CODES[Direction.ASCENDING],
+						  DIRECTION_CODES[Direction.DESCENDING])
+	unset = (batch.pile_sizes < 2) | (top_values == below_values)
+
+	return np.where(unset, DIRECTION_CODES[Direction.UNSET], directions).astype(np.int8)
+
+
+# (B, caravans) "Caravan.current_suit", as codes of "SUIT_CODES", NO_SUIT for empty caravans.
+def compute_current_suits(batch: GameBatch) -> np.ndarray:
+	top_positions, has_top = _top_positions(batch)
+
+	last_queen_suits = _at_positions(batch.last_queen_suits, top_positions)
+	top_suits = card_suits(_at_positions(batch.piles, top_positions))
+	current_suits = np.where(last_queen_suits != NO_SUIT, last_queen_suits, top_suits)
+
+	return np.where(has_top, current_suits, NO_SUIT).astype(np.int8)
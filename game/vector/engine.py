@@ -0,0 +1,303 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.random import Generator
+
+from game.caravan.enums import CaravanId, Direction, RouteId
+from game.cards.card_id import STANDARD_DECK_SIZE
+from game.player.enums import PlayerId
+from game.rules.constants import CARAVAN_MIN_SCORE, CARAVAN_MAX_SCORE
+from game.state.enums import GamePhase, WinReason
+from game.vector.batch import GameBatch, PLAYER_COUNT, CARAVAN_COUNT, HAND_SLOTS, MAX_PILE, NO_WINNER, \
+	pile_scores, compute_top_values, compute_directions, compute_current_suits
+from game.vector.tables import NO_CARD, NO_SUIT, NO_REASON, KIND_NUMERIC, KIND_KING, KIND_QUEEN, KIND_JACK, KIND_JOKER, \
+	REASON_CODES, DIRECTION_CODES, card_kinds, card_values, card_suits
+
+ACTION_PLAY = 0
+ACTION_ATTACH = 1
+ACTION_DISCARD = 2
+ACTION_DISCARD_CARAVAN = 3
+ACTION_CONCEDE = 4
+
+# One action per game: the kind above, the hand slot of the card played or discarded, the caravan played on, attached
+# to or discarded, and the pile position of the base card a face card is attached to. Unused fields are ignored.
+ACTION_DTYPE = np.dtype([('kind', np.int8), ('slot', np.int8), ('caravan', np.int8), ('target', np.int8)])
+
+_CARAVAN_OWNERS = np.array([caravan_id.owner - PlayerId.P1 for caravan_id in CaravanId], dtype=np.int8)
+_ROUTE_CARAVANS = np.array([[caravan_id for caravan_id in CaravanId if caravan_id.route == route_id]
+							for route_id in RouteId])
+_PILE_POSITIONS = np.arange(MAX_PILE)
+
+
+@dataclass(frozen=True)
+class BatchStepResult:
+	# Games whose action broke the rules, left untouched, as "game.engine.loop.step" does with an IllegalMove.
+	illegal: np.ndarray
+	# Games that finished with this step, their result being in "GameBatch.winners" and "GameBatch.reasons".
+	finished: np.ndarray
+
+
+def create_actions(size: int) -> np.ndarray:
+	return np.zeros(size, dtype=ACTION_DTYPE)
+
+
+# Starts new games in the given rows, the same way "game.setup.game_initializer.init_game" does with standard decks.
+def reset_games(batch: GameBatch, rows: np.ndarray, rng: Generator, starting_hand_size: int = HAND_SLOTS,
+				starting_player: PlayerId = PlayerId.P1) -> None:
+	row_count = len(rows)
+	owner_offsets = (np.arange(PLAYER_COUNT) * STANDARD_DECK_SIZE)[np.newaxis, :, np.newaxis]
+	decks = rng.permuted(np.broadcast_to(np.arange(STANDARD_DECK_SIZE), (row_count, PLAYER_COUNT, STANDARD_DECK_SIZE)),
+						 axis=-1) + owner_offsets
+	deck_size = STANDARD_DECK_SIZE - starting_hand_size
+
+	hands = np.full((row_count, PLAYER_COUNT, HAND_SLOTS), NO_CARD, dtype=np.int16)
+	# Cards are drawn from the end of the deck.
+	hands[..., :starting_hand_size] = decks[..., deck_size:][..., ::-1]
+	decks[..., deck_size:] = NO_CARD
+
+	batch.decks[rows] = decks
+	batch.deck_sizes[rows] = deck_size
+	batch.hands[rows] = hands
+	batch.piles[rows] = NO_CARD
+	batch.pile_sizes[rows] = 0
+	batch.kings[rows] = 0
+	batch.queens[rows] = 0
+	batch.last_queen_suits[rows] = NO_SUIT
+	batch.scores[rows] = 0
+	batch.current_players[rows] = starting_player - PlayerId.P1
+	batch.turn_numbers[rows] = 0
+	batch.phases[rows] = GamePhase.SETUP
+	batch.winners[rows] = NO_WINNER
+	batch.reasons[rows] = NO_REASON
+	batch.end_turn_numbers[rows] = 0
+
+
+def _acting_cards(batch: GameBatch, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+	rows = np.arange(batch.size)
+	slots = actions['slot'].astype(np.intp)
+	slot_exists = (slots >= 0) & (slots < HAND_SLOTS)
+
+	cards = batch.hands[rows, batch.current_players, np.where(slot_exists, slots, 0)]
+
+	return np.where(slot_exists, cards, NO_CARD), slot_exists
+
+
+# Same checks as the "can_*" predicates of "game.rules.ruleset", for the current player of every game at once.
+def legal_actions(batch: GameBatch, actions: np.ndarray) -> np.ndarray:
+	rows = np.arange(batch.size)
+	kinds = actions['kind']
+	caravans = actions['caravan'].astype(np.intp)
+	targets = actions['target'].astype(np.intp)
+
+	cards, _ = _acting_cards(batch, actions)
+	card_kind = card_kinds(cards)
+	card_value = card_values(cards)
+
+	caravan_exists = (caravans >= 0) & (caravans < CARAVAN_COUNT)
+	caravan_index = np.where(caravan_exists, caravans, 0)
+	owns_caravan = caravan_exists & (_CARAVAN_OWNERS[caravan_index] == batch.current_players)
+	pile_size = batch.pile_sizes[rows, caravan_index]
+
+	is_setup = batch.phases == GamePhase.SETUP
+	is_main = batch.phases == GamePhase.MAIN
+
+	top_values, _ = compute_top_values(batch)
+	top_value = top_values[rows, caravan_index]
+	direction = compute_directions(batch)[rows, caravan_index]
+	current_suit = compute_current_suits(batch)[rows, caravan_index]
+
+	follows_caravan = ((top_value == 0) |
+					   ((top_value != card_value) &
+						((direction == DIRECTION_CODES[Direction.UNSET]) |
+						 (current_suit == card_suits(cards)) |
+						 ((top_value > card_value) & (direction == DIRECTION_CODES[Direction.DESCENDING])) |
+						 ((top_value < card_value) & (direction == DIRECTION_CODES[Direction.ASCENDING])))))
+
+	can_play = ((card_kind == KIND_NUMERIC) & owns_caravan & (~is_setup | (pile_size == 0)) & follows_caravan)
+	can_attach = ((card_kind > KIND_NUMERIC) & is_main & caravan_exists & (targets >= 0) & (targets < pile_size))
+	can_discard = (cards != NO_CARD) & is_main & (batch.deck_sizes[rows, batch.current_players] > 0)
+	can_discard_caravan = owns_caravan & is_main
+
+	legal = np.select(
+		[kinds == ACTION_PLAY, kinds == ACTION_ATTACH, kinds == ACTION_DISCARD, kinds == ACTION_DISCARD_CARAVAN,
+		 kinds == ACTION_CONCEDE],
+		[can_play, can_attach, can_discard, can_discard_caravan, True],
+		default=False)
+
+	return legal & (batch.phases != GamePhase.FINISHED)
+
+
+# Takes the marked base cards, with their face cards, out of the piles of the given games, keeping the others in order.
+def _remove_base_cards(batch: GameBatch, rows: np.ndarray, removed: np.ndarray) -> None:
+	kept = (_PILE_POSITIONS < batch.pile_sizes[rows][..., np.newaxis]) & ~removed
+	order = np.argsort(~kept, axis=-1, kind='stable')
+	new_sizes = kept.sum(axis=-1)
+	emptied = _PILE_POSITIONS >= new_sizes[..., np.newaxis]
+
+	for array, empty_value in ((batch.piles, NO_CARD), (batch.kings, 0), (batch.queens, 0),
+							   (batch.last_queen_suits, NO_SUIT)):
+		compacted = np.take_along_axis(array[rows], order, axis=-1)
+		compacted[emptied] = empty_value
+		array[rows] = compacted
+
+	batch.pile_sizes[rows] = new_sizes
+	batch.scores[rows] = pile_scores(batch.piles[rows], batch.kings[rows])
+
+
+def _attach_face_cards(batch: GameBatch, rows: np.ndarray, cards: np.ndarray, caravans: np.ndarray,
+					   targets: np.ndarray) -> None:
+	kinds = card_kinds(cards)
+
+	kings = kinds == KIND_KING
+	king_rows, king_caravans, king_targets = rows[kings], caravans[kings], targets[kings]
+	# Each King doubles the value of its target, so the score grows by what the target was worth until now.
+	batch.scores[king_rows, king_caravans] += (card_values(batch.piles[king_rows, king_caravans, king_targets])
+											   << batch.kings[king_rows, king_caravans, king_targets])
+	batch.kings[king_rows, king_caravans, king_targets] += 1
+
+	queens = kinds == KIND_QUEEN
+	batch.queens[rows[queens], caravans[queens], targets[queens]] += 1
+	batch.last_queen_suits[rows[queens], caravans[queens], targets[queens]] = card_suits(cards[queens])
+
+	# A Jack takes its target out, a Joker every other base card sharing the target's rank, or its suit for an Ace.
+	effects = (kinds == KIND_JACK) | (kinds == KIND_JOKER)
+
+	if not effects.any():
+		return
+
+	rows, caravans, targets, kinds = rows[effects], caravans[effects], targets[effects], kinds[effects]
+
+	piles = batch.piles[rows]
+	target_cards = piles[np.arange(len(rows)), caravans, targets]
+	target_values = card_values(target_cards)[:, np.newaxis, np.newaxis]
+	target_suits = card_suits(target_cards)[:, np.newaxis, np.newaxis]
+
+	in_pile = _PILE_POSITIONS < batch.pile_sizes[rows][..., np.newaxis]
+	shares_rank_or_suit = np.where(target_values == 1, card_suits(piles) == target_suits,
+								   card_values(piles) == target_values)
+
+	is_target = np.zeros(piles.shape, dtype=bool)
+	is_target[np.arange(len(rows)), caravans, targets] = True
+
+	is_joker = (kinds == KIND_JOKER)[:, np.newaxis, np.newaxis]
+	removed = np.where(is_joker, in_pile & shares_rank_or_suit & ~is_target, is_target)
+
+	_remove_base_cards(batch, rows, removed)
+
+
+# Mirrors "game.engine.victory.check_victory" past the concede case, returns the winner of each game or NO_WINNER.
+def _check_victory(batch: GameBatch, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+	scores = batch.scores[rows]
+	p1_scores = scores[:, _ROUTE_CARAVANS[:, 0]]
+	p2_scores = scores[:, _ROUTE_CARAVANS[:, 1]]
+
+	p1_valid = (p1_scores >= CARAVAN_MIN_SCORE) & (p1_scores <= CARAVAN_MAX_SCORE)
+	p2_valid = (p2_scores >= CARAVAN_MIN_SCORE) & (p2_scores <= CARAVAN_MAX_SCORE)
+
+	p1_routes = p1_valid & (~p2_valid | (p1_scores > p2_scores))
+	p2_routes = p2_valid & (~p1_valid | (p2_scores > p1_scores))
+
+	all_routes_sold = (p1_routes | p2_routes).all(axis=-1)
+	p1_wins = p1_routes.sum(axis=-1)
+	p2_wins = p2_routes.sum(axis=-1)
+
+	cards_left = (batch.hands[rows] != NO_CARD).sum(axis=-1) + batch.deck_sizes[rows]
+
+	sold_to_p1 = all_routes_sold & (p1_wins >= 2)
+	sold_to_p2 = all_routes_sold & (p2_wins >= 2)
+	sales_wins = np.where(sold_to_p1, p1_wins, p2_wins)
+
+	winners = np.select(
+		[sold_to_p1, sold_to_p2, cards_left[:, 0] == 0, cards_left[:, 1] == 0],
+		[0, 1, 1, 0],
+		default=NO_WINNER)
+	reasons = np.select(
+		[(sold_to_p1 | sold_to_p2) & (sales_wins == 2), sold_to_p1 | sold_to_p2, winners != NO_WINNER],
+		[REASON_CODES[WinReason.TWO_CARAVANS], REASON_CODES[WinReason.THREE_CARAVANS],
+		 REASON_CODES[WinReason.OUT_OF_CARDS]],
+		default=NO_REASON)
+
+	return winners, reasons
+
+
+def _finish_games(batch: GameBatch, rows: np.ndarray, winners: np.ndarray, reasons: np.ndarray) -> None:
+	batch.winners[rows] = winners
+	batch.reasons[rows] = reasons
+	batch.end_turn_numbers[rows] = batch.turn_numbers[rows]
+	batch.phases[rows] = GamePhase.FINISHED
+
+
+# Hands are kept in the order of "Player.hand": the card is taken out of its slot, the cards after it move down one
+# slot, and a drawn card goes to the first empty slot, so that a slot of the batch is the position in the hand.
+def _take_from_hands(batch: GameBatch, rows: np.ndarray, players: np.ndarray, slots: np.ndarray) -> None:
+	positions = np.arange(HAND_SLOTS)
+	sources = positions + (positions >= slots[:, np.newaxis])
+	hands = batch.hands[rows, players]
+	batch.hands[rows, players] = np.where(
+		sources < HAND_SLOTS, np.take_along_axis(hands, np.minimum(sources, HAND_SLOTS - 1), axis=-1), NO_CARD)
+
+
+# Applies one action in every game, as "game.engine.apply.apply_move" would. Finished games are left as they are.
+def step_batch(batch: GameBatch, actions: np.ndarray) -> BatchStepResult:
+	legal = legal_actions(batch, actions)
+	illegal = ~legal & (batch.phases != GamePhase.FINISHED)
+	finished = np.zeros(batch.size, dtype=bool)
+
+	rows = np.flatnonzero(legal)
+	actions = actions[rows]
+	kinds = actions['kind']
+	slots = actions['slot'].astype(np.intp)
+	caravans = actions['caravan'].astype(np.intp)
+	targets = actions['target'].astype(np.intp)
+	players = batch.current_players[rows].astype(np.intp)
+
+	uses_card = (kinds == ACTION_PLAY) | (kinds == ACTION_ATTACH) | (kinds == ACTION_DISCARD)
+	cards = np.where(uses_card, batch.hands[rows, players, np.where(uses_card, slots, 0)], NO_CARD)
+	_take_from_hands(batch, rows[uses_card], players[uses_card], slots[uses_card])
+
+	plays = kinds == ACTION_PLAY
+	play_rows, play_caravans = rows[plays], caravans[plays]
+	batch.piles[play_rows, play_caravans, batch.pile_sizes[play_rows, play_caravans]] = cards[plays]
+	batch.pile_sizes[play_rows, play_caravans] += 1
+	batch.scores[play_rows, play_caravans] += card_values(cards[plays])
+
+	attaches = kinds == ACTION_ATTACH
+	_attach_face_cards(batch, rows[attaches], cards[attaches], caravans[attaches], targets[attaches])
+
+	discarded_caravans = kinds == ACTION_DISCARD_CARAVAN
+	discarded_rows, discarded_caravan_ids = rows[discarded_caravans], caravans[discarded_caravans]
+	batch.piles[discarded_rows, discarded_caravan_ids] = NO_CARD
+	batch.kings[discarded_rows, discarded_caravan_ids] = 0
+	batch.queens[discarded_rows, discarded_caravan_ids] = 0
+	batch.last_queen_suits[discarded_rows, discarded_caravan_ids] = NO_SUIT
+	batch.pile_sizes[discarded_rows, discarded_caravan_ids] = 0
+	batch.scores[discarded_rows, discarded_caravan_ids] = 0
+
+	concedes = kinds == ACTION_CONCEDE
+	_finish_games(batch, rows[concedes], 1 - players[concedes], REASON_CODES[WinReason.CONCEDE])
+	finished[rows[concedes]] = True
+
+	winners, reasons = _check_victory(batch, rows)
+	won = (winners != NO_WINNER) & ~concedes
+	_finish_games(batch, rows[won], winners[won], reasons[won])
+	finished[rows[won]] = True
+
+	going_on = ~concedes & ~won
+	rows, players, slots, uses_card = rows[going_on], players[going_on], slots[going_on], uses_card[going_on]
+
+	# Discarding a caravan does not draw, nor does any move during setup.
+	draws = uses_card & (batch.phases[rows] != GamePhase.SETUP) & (batch.deck_sizes[rows, players] > 0)
+	draw_rows, draw_players = rows[draws], players[draws]
+	top_positions = batch.deck_sizes[draw_rows, draw_players].astype(np.intp) - 1
+
+	hand_sizes = (batch.hands[draw_rows, draw_players] != NO_CARD).sum(axis=-1)
+	batch.hands[draw_rows, draw_players, hand_sizes] = batch.decks[draw_rows, draw_players, top_positions]
+	batch.decks[draw_rows, draw_players, top_positions] = NO_CARD
+	batch.deck_sizes[draw_rows, draw_players] -= 1
+
+	setup_done = (batch.phases[rows] == GamePhase.SETUP) & (batch.pile_sizes[rows] > 0).all(axis=-1)
+	batch.phases[rows[setup_done]] = GamePhase.MAIN
+	batch.turn_numbers[rows] += 1
+	batch.current_players[rows] = 1 - batch.current_players[rows]
+
+	return BatchStepResult(illegal=illegal, finished=finished)
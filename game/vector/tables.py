@@ -0,0 +1,44 @@
+import numpy as np
+
+from game.caravan.enums import Direction
+from game.cards.card_id import CARD_RANKS, CARD_SUITS, CARD_VALUES
+from game.cards.enums import Rank, Suit
+from game.state.enums import WinReason
+
+# Cards are stored by their id, which for standard cards is also an index into these tables. -1 marks an empty slot.
+NO_CARD = -1
+
+KIND_NUMERIC = 0
+KIND_KING = 1
+KIND_QUEEN = 2
+KIND_JACK = 3
+KIND_JOKER = 4
+
+_FACE_KINDS = {Rank.KING: KIND_KING, Rank.QUEEN: KIND_QUEEN, Rank.JACK: KIND_JACK, Rank.JOKER: KIND_JOKER}
+
+SUIT_CODES = {suit: code for code, suit in enumerate(Suit)}
+NO_SUIT = -1
+
+DIRECTION_CODES = {Direction.UNSET: 0, Direction.DESCENDING: 1, Direction.ASCENDING: 2}
+
+REASON_CODES = {reason: code for code, reason in enumerate(WinReason)}
+NO_REASON = -1
+
+# Each table ends with the entry for NO_CARD, which reads as kind -1, value 0 and no suit, so that indexing with -1 needs
+# no masking.
+CARD_KIND_TABLE = np.array([_FACE_KINDS.get(rank, KIND_NUMERIC) for rank in CARD_RANKS] + [-1], dtype=np.int8)
+CARD_VALUE_TABLE = np.array(list(CARD_VALUES) + [0], dtype=np.int32)
+CARD_SUIT_TABLE = np.array([SUIT_CODES[suit] if suit is not None else NO_SUIT for suit in CARD_SUITS] + [NO_SUIT],
+						   dtype=np.int8)
+
+
+def card_kinds(cards: np.ndarray) -> np.ndarray:
+	return CARD_KIND_TABLE[cards]
+
+
+def card_values(cards: np.ndarray) -> np.ndarray:
+	return CARD_VALUE_TABLE[cards]
+
+
+def card_suits(cards: np.ndarray) -> np.ndarray:
+	return CARD_SUIT_TABLE[cards]
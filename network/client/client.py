@@ -7,7 +7,7 @@ from dotenv import load_dotenv
 from websockets.legacy.client import WebSocketClientProtocol
 
 from game.player.enums import PlayerId
-from network.shared.deserializers import payload_to_game_state
+from network.client.mirror import StateMirror
 from network.shared.enums import MessageType
 
 load_dotenv()
@@ -17,6 +17,7 @@ class GameClient:
 	def __init__(self, uri: str) -> None:
 		self.uri = uri
 		self.player_id: PlayerId | None = None
+		self.mirror = StateMirror()
 
 	async def run(self) -> None:
 		async with websockets.connect(self.uri) as ws:
@@ -40,9 +41,16 @@ class GameClient:
 			print("Received game state")
 			print(message["state"])
 
-			deserialized_game_state = payload_to_game_state(message["state"])
+			# The host only sends what this player may see, see "network.shared.serializers.game_state_to_view".
+			if self.mirror.load_snapshot(message):
+				print(f"Deserialized game view: \n{self.mirror.view}")
+			else:
+				print("State does not match its digest, waiting for the next state")
 
-			print(f"Deserialized game state: \n{deserialized_game_state}")
+		elif msg_type == MessageType.DELTA.value:
+			# The host does not send a state on request yet, so the mirror waits for the next one it sends.
+			if not self.mirror.apply_delta(message):
+				print("Missed a move or out of step with the host, waiting for the next state")
 
 		elif msg_type == MessageType.ERROR.value:
 			print("Error:", message["reason"])
@@ -0,0 +1,44 @@
+from network.shared.card_ids import CardIdMap
+from network.shared.deserializers import payload_to_game_view, payload_to_state_delta, payload_to_digest
+from network.shared.views import GameView, apply_state_delta
+
+
+# Local copy of what the host's state looks like to this client, kept up to date by the messages of
+# "network.server.sync.StateSync".
+class StateMirror:
+	def __init__(self) -> None:
+		self.view: GameView | None = None
+		self.sequence = 0
+		# Cards are known by the ids the host sends them under, which stay the same over the game.
+		self.card_ids = CardIdMap(accepts_new=True)
+
+	# False when the snapshot does not match its digest, and another one is needed.
+	def load_snapshot(self, message: dict) -> bool:
+		self.view = payload_to_game_view(message["state"], self.card_ids)
+		self.sequence = message["sequence"]
+
+		return self._check_digest(payload_to_digest(message["digest"]))
+
+	# A view that no longer matches the host's is dropped, so that every delta is refused until the next snapshot.
+	def _check_digest(self, digest: int) -> bool:
+		if self.view.digest != digest:
+			self.view = None
+
+		return self.view is not None
+
+	# False when a delta was missed, or no snapshot came yet, or the view no longer matches the host's digest once the
+	# delta is applied, and a new snapshot is needed. Deltas already applied, e.g. sent again, are skipped.
+	def apply_delta(self, message: dict) -> bool:
+		sequence = message["delta"]["sequence"]
+
+		if self.view is not None and sequence <= self.sequence:
+			return True
+
+		if self.view is None or sequence != self.sequence + 1:
+			return False
+
+		delta = payload_to_state_delta(message["delta"], self.card_ids)
+		apply_state_delta(self.view, delta)
+		self.sequence = sequence
+
+		return self._check_digest(delta.digest)
@@ -1,6 +1,12 @@
 import json
+from collections.abc import Iterable
 
+from game.player.enums import PlayerId
+from game.state.game_state import GameState
+from network.shared.card_ids import CardIdMap
 from network.shared.enums import MessageType
+from network.shared.serializers import game_state_to_view, digest_to_payload
+from network.shared.views import compute_state_digest
 
 
 def create_dumped_message(msg_type: MessageType, payload: dict) -> str:
@@ -10,3 +16,16 @@ def create_dumped_message(msg_type: MessageType, payload: dict) -> str:
 	}
 
 	return json.dumps(msg)
+
+
+# STATE messages for a broadcast, by viewer, None for spectators. Recipients seeing the same view share one message, so
+# that a state is dumped at most three times however many spectators are watching. "sequence" is the number of the
+# last move the state includes, see "network.server.sync", and "digest" lets the client check what it reads. Cards
+# are sent under the ids "card_ids" gives them for the game.
+def create_dumped_state_messages(state: GameState, viewers: Iterable[PlayerId | None], card_ids: CardIdMap,
+								 sequence: int = 0) -> dict[PlayerId | None, str]:
+	return {viewer: create_dumped_message(MessageType.STATE, {
+		"sequence": sequence,
+		"digest": digest_to_payload(compute_state_digest(state, viewer, card_ids)),
+		"state": game_state_to_view(state, viewer, card_ids),
+	}) for viewer in set(viewers)}
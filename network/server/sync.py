@@ -0,0 +1,45 @@
+from collections.abc import Iterable
+
+from game.engine.apply import make_move
+from game.moves.types import Move
+from game.player.enums import PlayerId
+from game.state.game_state import GameState, GameResult
+from network.server.functions import create_dumped_message, create_dumped_state_messages
+from network.shared.card_ids import CardIdMap
+from network.shared.enums import MessageType
+from network.shared.serializers import move_record_to_delta
+
+
+# Keeps clients in step with the host's state without sending it whole on every move. A client gets a STATE message
+# when it joins, and a DELTA message for every move after that, numbered on from the "sequence" of the STATE, see
+# "network.client.mirror.StateMirror". A client out of step waits for the next STATE, as the host does not take
+# requests for one yet.
+class StateSync:
+	def __init__(self, state: GameState) -> None:
+		self.state = state
+		# Number of the last move sent.
+		self.sequence = 0
+		# Ids the cards of this game are sent under, and moves read back with.
+		self.card_ids = CardIdMap()
+
+	def create_snapshot_messages(self, viewers: Iterable[PlayerId | None]) -> dict[PlayerId | None, str]:
+		return create_dumped_state_messages(self.state, viewers, self.card_ids, self.sequence)
+
+	# Plays "move" on the state, see "game.engine.apply.make_move", and returns its result with the DELTA message of
+	# each viewer, None for spectators. Recipients seeing the same view share one message.
+	def apply_move(self, move: Move,
+				   viewers: Iterable[PlayerId | None]) -> tuple[GameResult | None, dict[PlayerId | None, str]]:
+		game_result, record = make_move(self.state, move)
+		self.sequence += 1
+
+		# Kept on the state, unlike in the engine, so that snapshots of a finished game tell how it ended.
+		if game_result is not None:
+			self.state.game_result = game_result
+
+		messages = {
+			viewer: create_dumped_message(MessageType.DELTA, {
+				"delta": move_record_to_delta(self.state, record, game_result, self.sequence, viewer, self.card_ids)})
+			for viewer in set(viewers)
+		}
+
+		return game_result, messages
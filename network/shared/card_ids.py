@@ -0,0 +1,55 @@
+from uuid import UUID, uuid4
+
+from game.cards.card_id import CardId
+
+
+# Inside the engine cards are identified by small integers, which tell the owner, rank and suit of a card. On the wire
+# they are random UUIDs instead, drawn once per game and per card, so that a card can be told apart from the others
+# without telling what it is, e.g. one discarded out of sight.
+# The host's map holds the engine's ids, and refuses UUIDs it never sent. A client's map, which accepts new UUIDs,
+# gives each one the next free local id, from 0 up, so that ids stay small on both sides. The UUID itself, the same on
+# both sides, is what digests key cards by, see "network.shared.views.compute_state_digest".
+class CardIdMap:
+	def __init__(self, *, accepts_new: bool = False) -> None:
+		self.accepts_new = accepts_new
+		self._strs: dict[CardId, str] = dict()
+		self._wire_ids: dict[CardId, int] = dict()
+		self._card_ids: dict[str, CardId] = dict()
+
+	def _add(self, card_id: CardId, card_uuid: UUID) -> None:
+		card_str = str(card_uuid)
+		self._strs[card_id] = card_str
+		self._wire_ids[card_id] = card_uuid.int
+		self._card_ids[card_str] = card_id
+
+	def to_str(self, card_id: CardId) -> str:
+		card_str = self._strs.get(card_id)
+
+		if card_str is None:
+			self._add(card_id, uuid4())
+			card_str = self._strs[card_id]
+
+		return card_str
+
+	def to_card_id(self, card_str: str) -> CardId:
+		card_id = self._card_ids.get(card_str)
+
+		if card_id is None:
+			if not self.accepts_new:
+				# TODO: Check raised errors later.
+				raise ValueError(f"Card {card_str} is not part of this game.")
+
+			card_id = len(self._card_ids)
+			self._add(card_id, UUID(card_str))
+
+		return card_id
+
+	# Integer of the card's UUID, the same for the host and every client of the game.
+	def to_wire_id(self, card_id: CardId) -> int:
+		wire_id = self._wire_ids.get(card_id)
+
+		if wire_id is None:
+			self.to_str(card_id)
+			wire_id = self._wire_ids[card_id]
+
+		return wire_id
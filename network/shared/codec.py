@@ -0,0 +1,148 @@
+import struct
+
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId
+from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId, STANDARD_CARD_COUNT, is_standard_card_id
+from game.player.enums import PlayerId
+from game.setup.deck_builder import get_standard_card
+from game.state.enums import GamePhase, WinReason
+from game.state.game_state import GameState, GameResult, PlayerState
+
+# Binary form of a GameState, a few hundred bytes where "game_state_to_payload" takes about ten kilobytes of JSON.
+# It holds the whole game as the engine sees it, raw card ids and the order of both decks included, so it is only for
+# trusted ends: checkpoints, processes of the same host, e.g. the workers of "game.agents.ismcts_agent", and host to
+# host. It must never be sent to a player's client, which gets a "GameView" under the ids of a "CardIdMap" instead.
+# Every card is the one byte of its id, so only standard decks can be encoded:
+#   header      version, flags, current player, game phase, turn number (u32)
+#   result      winner, reason, end turn number (u32), when flagged
+#   per player  deck size, deck cards from the bottom up, hand as a bitset of card ids
+#   per caravan pile size, then per base card: card, attachment count, attachments
+# The version is bumped with any change to the layout, and older layouts are refused rather than misread.
+CODEC_VERSION = 1
+
+_HEADER = struct.Struct("<BBBBI")
+_RESULT = struct.Struct("<BBI")
+_HAS_RESULT = 1
+
+_HAND_BYTES = (STANDARD_CARD_COUNT + 7) // 8
+
+# Reasons by code, in a fixed order instead of "WinReason" order, so that adding a reason does not move the others.
+_REASONS = (WinReason.TWO_CARAVANS, WinReason.THREE_CARAVANS, WinReason.CONCEDE, WinReason.OUT_OF_CARDS,
+			WinReason.TURN_LIMIT, WinReason.REPETITION)
+_REASON_CODES = {reason: code for code, reason in enumerate(_REASONS)}
+
+_PLAYERS = tuple(PlayerId)
+_CARAVANS = tuple(CaravanId)
+
+
+def _check_card(card: Card) -> int:
+	if not is_standard_card_id(card.id):
+		# TODO: Check raised errors later.
+		raise ValueError(f"Card id {card.id} is not part of a standard deck.")
+
+	return card.id
+
+
+def _encode_hand(hand: dict[CardId, Card]) -> bytes:
+	bits = 0
+
+	for card in hand.values():
+		bits |= 1 << _check_card(card)
+
+	return bits.to_bytes(_HAND_BYTES, "little")
+
+
+# Written into "out" when given, cleared first, so that a sender can reuse one buffer for every message.
+def encode_game_state(state: GameState, out: bytearray | None = None) -> bytearray:
+	if out is None:
+		out = bytearray()
+	else:
+		del out[:]
+
+	game_result = state.game_result
+	out += _HEADER.pack(CODEC_VERSION, _HAS_RESULT if game_result is not None else 0, state.current_player,
+						state.game_phase, state.turn_number)
+
+	if game_result is not None:
+		out += _RESULT.pack(game_result.winner_id, _REASON_CODES[game_result.reason], game_result.end_turn_number)
+
+	for player_id in _PLAYERS:
+		player = state.players[player_id]
+		out.append(len(player.deck))
+		out += bytes(_check_card(card) for card in player.deck)
+		out += _encode_hand(player.hand)
+
+	for caravan_id in _CARAVANS:
+		pile = state.caravans[caravan_id].pile
+		out.append(len(pile))
+
+		for played_card in pile:
+			out.append(_check_card(played_card.base_card))
+			out.append(len(played_card.attachments))
+			out += bytes(_check_card(face_card) for face_card in played_card.attachments)
+
+	return out
+
+
+# Hands come back in card id order, the order they were dealt in being lost to the bitset.
+def _decode_hand(view: memoryview) -> dict[CardId, Card]:
+	bits = int.from_bytes(view, "little")
+	hand = dict()
+
+	while bits:
+		card_id = (bits & -bits).bit_length() - 1
+		hand[card_id] = get_standard_card(card_id)
+		bits &= bits - 1
+
+	return hand
+
+
+# Reads "data" in place, cards being the shared instances of "game.setup.deck_builder".
+def decode_game_state(data: bytes | bytearray | memoryview) -> GameState:
+	view = memoryview(data)
+	version, flags, current_player, game_phase, turn_number = _HEADER.unpack_from(view)
+
+	if version != CODEC_VERSION:
+		# TODO: Check raised errors later.
+		raise ValueError(f"Unsupported codec version {version}, expected {CODEC_VERSION}.")
+
+	offset = _HEADER.size
+	game_result = None
+
+	if flags & _HAS_RESULT:
+		winner_id, reason_code, end_turn_number = _RESULT.unpack_from(view, offset)
+		game_result = GameResult(winner_id=PlayerId(winner_id), reason=_REASONS[reason_code],
+								 end_turn_number=end_turn_number)
+		offset += _RESULT.size
+
+	players = dict()
+
+	for player_id in _PLAYERS:
+		deck_size = view[offset]
+		offset += 1
+		deck = [get_standard_card(card_id) for card_id in view[offset:offset + deck_size]]
+		offset += deck_size
+		hand = _decode_hand(view[offset:offset + _HAND_BYTES])
+		offset += _HAND_BYTES
+		players[player_id] = PlayerState(deck=deck, hand=hand)
+
+	caravans = dict()
+
+	for caravan_id in _CARAVANS:
+		pile_size = view[offset]
+		offset += 1
+		pile = list()
+
+		for _ in range(pile_size):
+			base_card = get_standard_card(view[offset])
+			attachment_count = view[offset + 1]
+			offset += 2
+			pile.append(PlayedCard(base_card=base_card, attachments=[
+				get_standard_card(card_id) for card_id in view[offset:offset + attachment_count]]))
+			offset += attachment_count
+
+		caravans[caravan_id] = Caravan(id=caravan_id, pile=pile)
+
+	return GameState(players=players, caravans=caravans, current_player=PlayerId(current_player),
+					 turn_number=turn_number, game_phase=GamePhase(game_phase), game_result=game_result)
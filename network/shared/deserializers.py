@@ -1,14 +1,15 @@
-from uuid import UUID
-
 from game.caravan.caravan import Caravan
 from game.caravan.enums import CaravanId
 from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId
 from game.cards.enums import Suit, Rank
 from game.engine.exceptions import IllegalMove
 from game.moves.types import Move, MoveType, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.player.enums import PlayerId
 from game.state.enums import WinReason, GamePhase
 from game.state.game_state import GameState, GameResult, PlayerState
+from network.shared.card_ids import CardIdMap
+from network.shared.views import GameView, PlayerView, StateDelta
 
 
 def _payload_to_game_result(game_result: dict | None) -> GameResult | None:
@@ -30,94 +31,140 @@ def _payload_to_game_phase(game_phase: int) -> GamePhase:
 	return GamePhase(game_phase)
 
 
-def _payload_to_players(players: dict) -> dict[PlayerId, PlayerState]:
+def _payload_to_players(players: dict, card_ids: CardIdMap) -> dict[PlayerId, PlayerState]:
 	# We wrap with `int()` here because in this dictionary the PlayerId is stored as a key so it is loaded as a string by `json.loads()`.
-	return {PlayerId(int(player_id)): _payload_to_player(player) for player_id, player in players.items()}
+	return {PlayerId(int(player_id)): _payload_to_player(player, card_ids) for player_id, player in players.items()}
 
 
-def _payload_to_player(player: dict) -> PlayerState:
+def _payload_to_player(player: dict, card_ids: CardIdMap) -> PlayerState:
 	return PlayerState(
-		deck=_payload_to_deck(player['deck']),
-		hand=_payload_to_hand(player['hand']),
+		deck=_payload_to_deck(player['deck'], card_ids),
+		hand=_payload_to_hand(player['hand'], card_ids),
 	)
 
 
-def _payload_to_deck(deck: list) -> list[Card]:
-	return list(_payload_to_card(card) for card in deck)
+def _payload_to_deck(deck: list, card_ids: CardIdMap) -> list[Card]:
+	return list(_payload_to_card(card, card_ids) for card in deck)
 
 
-def _payload_to_hand(hand: dict) -> dict[UUID, Card]:
-	return {UUID(card_id): _payload_to_card(card) for card_id, card in hand.items()}
+def _payload_to_hand(hand: dict, card_ids: CardIdMap) -> dict[CardId, Card]:
+	return {card_ids.to_card_id(card_id): _payload_to_card(card, card_ids) for card_id, card in hand.items()}
 
 
-def _payload_to_card(card: dict) -> Card:
+def _payload_to_card(card: dict, card_ids: CardIdMap) -> Card:
 	return Card(
-		id=UUID(card['id']),
+		id=card_ids.to_card_id(card['id']),
 		rank=Rank(card['rank']),
 		suit=Suit(card['suit']) if card['suit'] is not None else None,
 
 	)
 
 
-def _payload_to_caravans(caravans: dict) -> dict[CaravanId, Caravan]:
+def _payload_to_caravans(caravans: dict, card_ids: CardIdMap) -> dict[CaravanId, Caravan]:
 	# We wrap with `int()` here because in this dictionary the CaravanId is stored as a key so it is loaded as a string by `json.loads()`.
-	return {CaravanId(int(caravan_id)): _payload_to_caravan(caravan) for caravan_id, caravan in caravans.items()}
+	return {CaravanId(int(caravan_id)): _payload_to_caravan(caravan, card_ids)
+			for caravan_id, caravan in caravans.items()}
 
 
-def _payload_to_caravan(caravan: dict) -> Caravan:
+def _payload_to_caravan(caravan: dict, card_ids: CardIdMap) -> Caravan:
 	return Caravan(
 		id=CaravanId(caravan['id']),
-		pile=_payload_to_pile(caravan['pile']),
+		pile=_payload_to_pile(caravan['pile'], card_ids),
 	)
 
 
-def _payload_to_pile(pile: list) -> list[PlayedCard]:
-	return list(_payload_to_played_card(played_card) for played_card in pile)
+def _payload_to_pile(pile: list, card_ids: CardIdMap) -> list[PlayedCard]:
+	return list(_payload_to_played_card(played_card, card_ids) for played_card in pile)
 
 
-def _payload_to_played_card(played_card: dict) -> PlayedCard:
+def _payload_to_played_card(played_card: dict, card_ids: CardIdMap) -> PlayedCard:
 	return PlayedCard(
-		base_card=_payload_to_card(played_card['base_card']),
-		attachments=_payload_attachments(played_card['attachments']),
+		base_card=_payload_to_card(played_card['base_card'], card_ids),
+		attachments=_payload_attachments(played_card['attachments'], card_ids),
 	)
 
 
-def _payload_attachments(attachments: list[dict]) -> list[Card]:
-	return list(_payload_to_card(attachment) for attachment in attachments)
+def _payload_attachments(attachments: list[dict], card_ids: CardIdMap) -> list[Card]:
+	return list(_payload_to_card(attachment, card_ids) for attachment in attachments)
 
 
-def payload_to_game_state(payload: dict[str, int | dict | None]) -> GameState:
+def payload_to_game_state(payload: dict[str, int | dict | None], card_ids: CardIdMap) -> GameState:
 	return GameState(
-		players=_payload_to_players(payload['players']),
-		caravans=_payload_to_caravans(payload['caravans']),
+		players=_payload_to_players(payload['players'], card_ids),
+		caravans=_payload_to_caravans(payload['caravans'], card_ids),
+		current_player=_payload_to_current_player(payload['current_player']),
+		turn_number=payload['turn_number'],
+		game_phase=_payload_to_game_phase(payload['game_phase']),
+		game_result=_payload_to_game_result(payload['game_result']),
+	)
+
+
+def _payload_to_player_view(player: dict, card_ids: CardIdMap) -> PlayerView:
+	return PlayerView(
+		deck_size=player['deck_size'],
+		hand_size=player['hand_size'],
+		hand=_payload_to_hand(player['hand'], card_ids) if player['hand'] is not None else None,
+	)
+
+
+def payload_to_game_view(payload: dict, card_ids: CardIdMap) -> GameView:
+	return GameView(
+		viewer=PlayerId(payload['viewer']) if payload['viewer'] is not None else None,
+		# We wrap with `int()` here because in this dictionary the PlayerId is stored as a key so it is loaded as a string by `json.loads()`.
+		players={PlayerId(int(player_id)): _payload_to_player_view(player, card_ids)
+				 for player_id, player in payload['players'].items()},
+		caravans=_payload_to_caravans(payload['caravans'], card_ids),
+		current_player=_payload_to_current_player(payload['current_player']),
+		turn_number=payload['turn_number'],
+		game_phase=_payload_to_game_phase(payload['game_phase']),
+		game_result=_payload_to_game_result(payload['game_result']),
+		card_ids=card_ids,
+	)
+
+
+def payload_to_digest(digest: str) -> int:
+	return int(digest, 16)
+
+
+def payload_to_state_delta(payload: dict, card_ids: CardIdMap) -> StateDelta:
+	return StateDelta(
+		sequence=payload['sequence'],
+		move=payload_to_move(payload['move'], card_ids),
+		hand_card=_payload_to_card(payload['hand_card'], card_ids) if payload['hand_card'] is not None else None,
+		drew_card=payload['drew_card'],
+		drawn_card=_payload_to_card(payload['drawn_card'], card_ids) if payload['drawn_card'] is not None else None,
+		removed_base_ids=[(CaravanId(caravan_id), card_ids.to_card_id(base_card_id))
+						  for caravan_id, base_card_id in payload['removed_base_ids']],
 		current_player=_payload_to_current_player(payload['current_player']),
 		turn_number=payload['turn_number'],
 		game_phase=_payload_to_game_phase(payload['game_phase']),
 		game_result=_payload_to_game_result(payload['game_result']),
+		digest=payload_to_digest(payload['digest']),
 	)
 
 
-def _payload_to_play_base(payload: dict) -> PlayCard:
+def _payload_to_play_base(payload: dict, card_ids: CardIdMap) -> PlayCard:
 	return PlayCard(
 		player_id=PlayerId(payload['player_id']),
-		card_id=UUID(payload['card_id']),
+		card_id=card_ids.to_card_id(payload['card_id']),
 		caravan_id=CaravanId(payload['caravan_id']),
 	)
 
 
-def _payload_to_attach_face_card(payload: dict) -> AttachFaceCard:
+def _payload_to_attach_face_card(payload: dict, card_ids: CardIdMap) -> AttachFaceCard:
 	return AttachFaceCard(
 		player_id=PlayerId(payload['player_id']),
-		card_id=UUID(payload['card_id']),
+		card_id=card_ids.to_card_id(payload['card_id']),
 		caravan_id=CaravanId(payload['caravan_id']),
-		target_base_id=UUID(payload['target_base_id']),
+		target_base_id=card_ids.to_card_id(payload['target_base_id']),
 	)
 
 
-def _payload_to_discard_card(payload: dict) -> DiscardCard:
+# The card is None in the deltas of the mover's opponent and of spectators, see "move_record_to_delta".
+def _payload_to_discard_card(payload: dict, card_ids: CardIdMap) -> DiscardCard:
 	return DiscardCard(
 		player_id=PlayerId(payload['player_id']),
-		card_id=UUID(payload['card_id']),
+		card_id=card_ids.to_card_id(payload['card_id']) if payload['card_id'] is not None else None,
 	)
 
 
@@ -134,15 +181,15 @@ def _payload_to_concede(payload: dict) -> Concede:
 	)
 
 
-def payload_to_move(payload: dict) -> Move:
+def payload_to_move(payload: dict, card_ids: CardIdMap) -> Move:
 	move_type = MoveType(payload['move_type'])
 
 	if move_type == MoveType.PLAY_BASE:
-		return _payload_to_play_base(payload)
+		return _payload_to_play_base(payload, card_ids)
 	elif move_type == MoveType.ATTACH_FACE:
-		return _payload_to_attach_face_card(payload)
+		return _payload_to_attach_face_card(payload, card_ids)
 	elif move_type == MoveType.DISCARD_CARD:
-		return _payload_to_discard_card(payload)
+		return _payload_to_discard_card(payload, card_ids)
 	elif move_type == MoveType.DISCARD_CARAVAN:
 		return _payload_to_discard_caravan(payload)
 	elif move_type == MoveType.CONCEDE:
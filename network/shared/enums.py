@@ -4,6 +4,8 @@ from enum import Enum
 class MessageType(Enum):
 	WELCOME = "welcome"
 	STATE = "state"
+	# One move and what it changed, see "network.server.sync".
+	DELTA = "delta"
 	ERROR = "error"
 
 
@@ -1,12 +1,14 @@
-from uuid import UUID
-
 from game.caravan.caravan import Caravan
 from game.caravan.enums import CaravanId
 from game.cards.card import PlayedCard, Card
+from game.cards.card_id import CardId
 from game.engine.exceptions import IllegalMove
+from game.engine.journal import MoveRecord
 from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.player.enums import PlayerId
 from game.state.game_state import GameState, GameResult, PlayerState
+from network.shared.card_ids import CardIdMap
+from network.shared.views import compute_state_digest
 
 
 def _game_result_to_payload(result: GameResult | None) -> dict | None:
@@ -20,63 +22,87 @@ def _game_result_to_payload(result: GameResult | None) -> dict | None:
 	}
 
 
-def _caravans_to_payload(caravans: dict[CaravanId, Caravan]) -> dict:
-	return {caravan_id: _caravan_to_payload(caravan) for caravan_id, caravan in caravans.items()}
+def _caravans_to_payload(caravans: dict[CaravanId, Caravan], card_ids: CardIdMap) -> dict:
+	return {caravan_id: _caravan_to_payload(caravan, card_ids) for caravan_id, caravan in caravans.items()}
 
 
-def _caravan_to_payload(caravan: Caravan) -> dict:
+def _caravan_to_payload(caravan: Caravan, card_ids: CardIdMap) -> dict:
 	return {
 		"id": caravan.id.value,
-		"pile": _pile_to_payload(caravan.pile),
+		"pile": _pile_to_payload(caravan.pile, card_ids),
 	}
 
 
-def _pile_to_payload(pile: list[PlayedCard]) -> list:
-	return list(_played_card_to_payload(played_card) for played_card in pile)
+def _pile_to_payload(pile: list[PlayedCard], card_ids: CardIdMap) -> list:
+	return list(_played_card_to_payload(played_card, card_ids) for played_card in pile)
 
 
-def _played_card_to_payload(played_card: PlayedCard) -> dict:
+def _played_card_to_payload(played_card: PlayedCard, card_ids: CardIdMap) -> dict:
 	return {
-		"base_card": _card_to_payload(played_card.base_card),
-		"attachments": _attachments_to_payload(played_card.attachments)
+		"base_card": _card_to_payload(played_card.base_card, card_ids),
+		"attachments": _attachments_to_payload(played_card.attachments, card_ids)
 	}
 
 
-def _attachments_to_payload(attachments: list[Card]) -> list[dict]:
-	return list(_card_to_payload(attachment) for attachment in attachments)
+def _attachments_to_payload(attachments: list[Card], card_ids: CardIdMap) -> list[dict]:
+	return list(_card_to_payload(attachment, card_ids) for attachment in attachments)
 
 
-def _card_to_payload(card: Card) -> dict:
+def _card_to_payload(card: Card, card_ids: CardIdMap) -> dict:
 	return {
-		"id": str(card.id),
+		"id": card_ids.to_str(card.id),
 		"rank": card.rank.value,
 		"suit": card.suit.value if card.suit is not None else None,
 	}
 
 
-def _players_to_payload(players: dict[PlayerId, PlayerState]) -> dict:
-	return {player_id: _player_to_payload(player) for player_id, player in players.items()}
+def _players_to_payload(players: dict[PlayerId, PlayerState], card_ids: CardIdMap) -> dict:
+	return {player_id: _player_to_payload(player, card_ids) for player_id, player in players.items()}
 
 
-def _player_to_payload(player: PlayerState) -> dict:
+def _player_to_payload(player: PlayerState, card_ids: CardIdMap) -> dict:
 	return {
-		"deck": _deck_to_payload(player.deck),
-		"hand": _hand_to_payload(player.hand),
+		"deck": _deck_to_payload(player.deck, card_ids),
+		"hand": _hand_to_payload(player.hand, card_ids),
 	}
 
 
-def _deck_to_payload(deck: list[Card]) -> list:
-	return list(_card_to_payload(card) for card in deck)
+def _deck_to_payload(deck: list[Card], card_ids: CardIdMap) -> list:
+	return list(_card_to_payload(card, card_ids) for card in deck)
+
+
+def _hand_to_payload(hand: dict[CardId, Card], card_ids: CardIdMap) -> dict:
+	return {card_ids.to_str(card_id): _card_to_payload(card, card_ids) for card_id, card in hand.items()}
+
+
+def game_state_to_payload(state: GameState, card_ids: CardIdMap) -> dict:
+	return {
+		"players": _players_to_payload(state.players, card_ids),
+		"caravans": _caravans_to_payload(state.caravans, card_ids),
+		"current_player": state.current_player,
+		"turn_number": state.turn_number,
+		"game_phase": state.game_phase,
+		"game_result": _game_result_to_payload(state.game_result)
+	}
 
 
-def _hand_to_payload(hand: dict[UUID, Card]) -> dict:
-	return {str(card_id): _card_to_payload(card) for card_id, card in hand.items()}
+def _player_to_view(player: PlayerState, is_viewer: bool, card_ids: CardIdMap) -> dict:
+	return {
+		"deck_size": len(player.deck),
+		"hand_size": len(player.hand),
+		"hand": _hand_to_payload(player.hand, card_ids) if is_viewer else None,
+	}
 
 
-def game_state_to_payload(state: GameState) -> dict:
+# Only what "viewer" may see, None for a spectator: the caravans, their own hand, and the sizes of the decks and of the
+# other hand. Unlike "game_state_to_payload", nothing hidden leaves the host, nor the decks that make up most of a
+# full payload.
+def game_state_to_view(state: GameState, viewer: PlayerId | None, card_ids: CardIdMap) -> dict:
 	return {
-		"players": _players_to_payload(state.players),
-		"caravans": _caravans_to_payload(state.caravans),
+		"viewer": viewer,
+		"players": {player_id: _player_to_view(player, player_id == viewer, card_ids)
+					for player_id, player in state.players.items()},
+		"caravans": _caravans_to_payload(state.caravans, card_ids),
 		"current_player": state.current_player,
 		"turn_number": state.turn_number,
 		"game_phase": state.game_phase,
@@ -84,6 +110,11 @@ def game_state_to_payload(state: GameState) -> dict:
 	}
 
 
+# As a fixed width hex string, which any client reads back whole, where JSON numbers lose the low bits of a 64-bit one.
+def digest_to_payload(digest: int) -> str:
+	return format(digest, "016x")
+
+
 def _move_to_payload_base(move: Move) -> dict:
 	return {
 		"player_id": move.player_id,
@@ -91,27 +122,35 @@ def _move_to_payload_base(move: Move) -> dict:
 	}
 
 
-def _play_base_to_payload(move: PlayCard) -> dict:
+def _play_base_to_payload(move: PlayCard, card_ids: CardIdMap) -> dict:
 	return {
 		**_move_to_payload_base(move),
-		"card_id": str(move.card_id),
+		"card_id": card_ids.to_str(move.card_id),
 		"caravan_id": move.caravan_id.value,
 	}
 
 
-def _attach_face_card_to_payload(move: AttachFaceCard) -> dict:
+def _attach_face_card_to_payload(move: AttachFaceCard, card_ids: CardIdMap) -> dict:
 	return {
 		**_move_to_payload_base(move),
-		"card_id": str(move.card_id),
+		"card_id": card_ids.to_str(move.card_id),
 		"caravan_id": move.caravan_id.value,
-		"target_base_id": str(move.target_base_id)
+		"target_base_id": card_ids.to_str(move.target_base_id)
 	}
 
 
-def _discard_card_to_payload(move: DiscardCard) -> dict:
+def _discard_card_to_payload(move: DiscardCard, card_ids: CardIdMap) -> dict:
 	return {
 		**_move_to_payload_base(move),
-		"card_id": str(move.card_id),
+		"card_id": card_ids.to_str(move.card_id),
+	}
+
+
+# A discard as the mover's opponent and spectators see it, without the card.
+def _hidden_discard_card_to_payload(move: DiscardCard) -> dict:
+	return {
+		**_move_to_payload_base(move),
+		"card_id": None,
 	}
 
 
@@ -128,13 +167,13 @@ def _concede_to_payload(move: Concede) -> dict:
 	}
 
 
-def move_to_payload(move: Move) -> dict:
+def move_to_payload(move: Move, card_ids: CardIdMap) -> dict:
 	if isinstance(move, PlayCard):
-		return _play_base_to_payload(move)
+		return _play_base_to_payload(move, card_ids)
 	elif isinstance(move, AttachFaceCard):
-		return _attach_face_card_to_payload(move)
+		return _attach_face_card_to_payload(move, card_ids)
 	elif isinstance(move, DiscardCard):
-		return _discard_card_to_payload(move)
+		return _discard_card_to_payload(move, card_ids)
 	elif isinstance(move, DiscardCaravan):
 		return _discard_caravan_to_payload(move)
 	elif isinstance(move, Concede):
@@ -142,3 +181,30 @@ def move_to_payload(move: Move) -> dict:
 	else:
 		# TODO: Check raised errors later.
 		raise IllegalMove(f"Unsupported move: {type(move).__name__}")
+
+
+# The move of "record" as "viewer" sees it, see "network.shared.views.StateDelta", with "state" as the move left it.
+# Cards played on a caravan are shown to everyone, discarded and drawn cards only to the mover, who alone gets the id of
+# a discarded card.
+def move_record_to_delta(state: GameState, record: MoveRecord, game_result: GameResult | None, sequence: int,
+						 viewer: PlayerId | None, card_ids: CardIdMap) -> dict:
+	move = record.move
+	is_mover = move.player_id == viewer
+	is_shown = record.hand_card is not None and (is_mover or not isinstance(move, DiscardCard))
+	is_drawn_shown = is_mover and record.drawn_card is not None
+	is_hidden_discard = isinstance(move, DiscardCard) and not is_mover
+
+	return {
+		"sequence": sequence,
+		"move": _hidden_discard_card_to_payload(move) if is_hidden_discard else move_to_payload(move, card_ids),
+		"hand_card": _card_to_payload(record.hand_card, card_ids) if is_shown else None,
+		"drew_card": record.drawn_card is not None,
+		"drawn_card": _card_to_payload(record.drawn_card, card_ids) if is_drawn_shown else None,
+		"removed_base_ids": [[removed.caravan_id.value, card_ids.to_str(removed.played_card.base_card.id)]
+							 for removed in record.removed_base_cards],
+		"current_player": state.current_player,
+		"turn_number": state.turn_number,
+		"game_phase": state.game_phase,
+		"game_result": _game_result_to_payload(game_result),
+		"digest": digest_to_payload(compute_state_digest(state, viewer, card_ids)),
+	}
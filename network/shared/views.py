@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId
+from game.cards.card import Card, PlayedCard
+from game.cards.card_id import CardId
+from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase
+from game.state.game_state import GameResult, GameState
+from game.state.zobrist import player_key, phase_key, deck_size_key, hand_size_key, turn_key, compute_key
+from network.shared.card_ids import CardIdMap
+
+
+# A player as someone else sees them: their hand is only known to themselves.
+@dataclass
+class PlayerView:
+	deck_size: int
+	hand_size: int
+	hand: dict[CardId, Card] | None
+
+
+# Keys of the cards in digests, by the UUID of each card, the only id the host and a client share, see
+# "network.shared.card_ids". UUIDs change from game to game, so these keys are computed on every use instead of being
+# kept like those of "game.state.zobrist", from other first parts than theirs.
+_HAND_CARD = 101
+_CARAVAN_CARD = 102
+_ATTACHMENT = 103
+
+
+def _hand_card_key(player_id: PlayerId, wire_id: int) -> int:
+	return compute_key((_HAND_CARD, int(player_id), wire_id))
+
+
+def _caravan_card_key(caravan_id: CaravanId, position: int, wire_id: int) -> int:
+	return compute_key((_CARAVAN_CARD, int(caravan_id), position, wire_id))
+
+
+def _attachment_key(base_wire_id: int, position: int, wire_id: int) -> int:
+	return compute_key((_ATTACHMENT, base_wire_id, position, wire_id))
+
+
+def _played_card_key(caravan_id: CaravanId, position: int, played_card: PlayedCard, card_ids: CardIdMap) -> int:
+	base_id = card_ids.to_wire_id(played_card.base_card.id)
+	key = _caravan_card_key(caravan_id, position, base_id)
+
+	for attachment_position, face_card in enumerate(played_card.attachments):
+		key ^= _attachment_key(base_id, attachment_position, card_ids.to_wire_id(face_card.id))
+
+	return key
+
+
+# Change of the keys of the base cards from "start" up, which have moved by "shift" positions to where they are now.
+def _pile_shift_key(caravan_id: CaravanId, pile: list[PlayedCard], start: int, shift: int,
+					card_ids: CardIdMap) -> int:
+	key = 0
+
+	for position in range(start, len(pile)):
+		base_id = card_ids.to_wire_id(pile[position].base_card.id)
+		key ^= _caravan_card_key(caravan_id, position - shift, base_id)
+		key ^= _caravan_card_key(caravan_id, position, base_id)
+
+	return key
+
+
+# Digest of what "viewer" sees of the state, the same as "GameView.digest" of their view, to tell whether a client
+# still follows the host. Zobrist keys make it independent of the order cards are read in.
+def compute_state_digest(state: GameState, viewer: PlayerId | None, card_ids: CardIdMap) -> int:
+	digest = player_key(state.current_player) ^ phase_key(state.game_phase) ^ turn_key(state.turn_number)
+
+	for player_id, player in state.players.items():
+		digest ^= deck_size_key(player_id, len(player.deck)) ^ hand_size_key(player_id, len(player.hand))
+
+		if player_id == viewer:
+			for card_id in player.hand:
+				digest ^= _hand_card_key(player_id, card_ids.to_wire_id(card_id))
+
+	for caravan_id, caravan in state.caravans.items():
+		for position, played_card in enumerate(caravan.pile):
+			digest ^= _played_card_key(caravan_id, position, played_card, card_ids)
+
+	return digest
+
+
+# What a player, or a spectator with a "viewer" of None, may see of a GameState.
+@dataclass
+class GameView:
+	viewer: PlayerId | None
+	players: dict[PlayerId, PlayerView]
+	caravans: dict[CaravanId, Caravan]
+	current_player: PlayerId
+	turn_number: int
+	game_phase: GamePhase
+	game_result: GameResult | None
+	# Ids the view's cards were read with, which their digest keys come from.
+	card_ids: CardIdMap = field(repr=False, compare=False)
+	# See "compute_state_digest", kept up to date through "CaravanListener" and by "apply_state_delta".
+	digest: int = field(default=0, init=False, repr=False, compare=False)
+
+	def __post_init__(self) -> None:
+		for caravan in self.caravans.values():
+			caravan.listener = self
+
+		self.digest = self.compute_digest()
+
+	def compute_digest(self) -> int:
+		digest = player_key(self.current_player) ^ phase_key(self.game_phase) ^ turn_key(self.turn_number)
+
+		for player_id, player in self.players.items():
+			digest ^= deck_size_key(player_id, player.deck_size) ^ hand_size_key(player_id, player.hand_size)
+
+			for card_id in player.hand or ():
+				digest ^= _hand_card_key(player_id, self.card_ids.to_wire_id(card_id))
+
+		for caravan_id, caravan in self.caravans.items():
+			for position, played_card in enumerate(caravan.pile):
+				digest ^= _played_card_key(caravan_id, position, played_card, self.card_ids)
+
+		return digest
+
+	def on_base_card_added(self, caravan: Caravan, position: int) -> None:
+		self.digest ^= (_played_card_key(caravan.id, position, caravan.pile[position], self.card_ids)
+						^ _pile_shift_key(caravan.id, caravan.pile, position + 1, 1, self.card_ids))
+
+	def on_face_card_attached(self, caravan: Caravan, played_card: PlayedCard, face_card: Card) -> None:
+		base_id = self.card_ids.to_wire_id(played_card.base_card.id)
+		face_id = self.card_ids.to_wire_id(face_card.id)
+		self.digest ^= _attachment_key(base_id, len(played_card.attachments) - 1, face_id)
+
+	def on_face_card_detached(self, caravan: Caravan, played_card: PlayedCard, face_card: Card) -> None:
+		base_id = self.card_ids.to_wire_id(played_card.base_card.id)
+		self.digest ^= _attachment_key(base_id, len(played_card.attachments), self.card_ids.to_wire_id(face_card.id))
+
+	def on_base_card_removed(self, caravan: Caravan, position: int, played_card: PlayedCard) -> None:
+		self.digest ^= (_played_card_key(caravan.id, position, played_card, self.card_ids)
+						^ _pile_shift_key(caravan.id, caravan.pile, position, -1, self.card_ids))
+
+
+# One move as "viewer" sees it, the changes it made to the state included, numbered from 1 by the host.
+@dataclass
+class StateDelta:
+	sequence: int
+	# A discard out of sight of the viewer comes without its card id.
+	move: Move
+	# Card that left the mover's hand, None for a card discarded out of sight of the viewer.
+	hand_card: Card | None
+	drew_card: bool
+	# Only sent to the mover, others just see their deck getting smaller.
+	drawn_card: Card | None
+	# Base cards taken off the caravans by a Jack, a Joker or a caravan discard, in order of removal.
+	removed_base_ids: list[tuple[CaravanId, CardId]]
+	current_player: PlayerId
+	turn_number: int
+	game_phase: GamePhase
+	game_result: GameResult | None
+	# Digest of the host's state seen by the viewer once the move is made, see "compute_state_digest".
+	digest: int
+
+
+# Brings "view" one move forward, to what the host's state looks like to the same viewer after the move.
+def apply_state_delta(view: GameView, delta: StateDelta) -> None:
+	move = delta.move
+	mover_id = move.player_id
+	mover = view.players[mover_id]
+
+	if isinstance(move, (PlayCard, AttachFaceCard, DiscardCard)):
+		_set_hand_size(view, mover_id, mover.hand_size - 1)
+
+		if mover.hand is not None and mover.hand.pop(move.card_id, None) is not None:
+			view.digest ^= _hand_card_key(mover_id, view.card_ids.to_wire_id(move.card_id))
+
+	if isinstance(move, PlayCard):
+		view.caravans[move.caravan_id].add_base_card(delta.hand_card)
+	elif isinstance(move, AttachFaceCard):
+		view.caravans[move.caravan_id].attach(move.target_base_id, delta.hand_card)
+
+	for caravan_id, base_card_id in delta.removed_base_ids:
+		view.caravans[caravan_id].remove_base_card(base_card_id)
+
+	if delta.drew_card:
+		view.digest ^= deck_size_key(mover_id, mover.deck_size) ^ deck_size_key(mover_id, mover.deck_size - 1)
+		mover.deck_size -= 1
+		_set_hand_size(view, mover_id, mover.hand_size + 1)
+
+		if mover.hand is not None and delta.drawn_card is not None:
+			mover.hand[delta.drawn_card.id] = delta.drawn_card
+			view.digest ^= _hand_card_key(mover_id, view.card_ids.to_wire_id(delta.drawn_card.id))
+
+	view.digest ^= (player_key(view.current_player) ^ player_key(delta.current_player)
+					^ phase_key(view.game_phase) ^ phase_key(delta.game_phase)
+					^ turn_key(view.turn_number) ^ turn_key(delta.turn_number))
+	view.current_player = delta.current_player
+	view.turn_number = delta.turn_number
+	view.game_phase = delta.game_phase
+	view.game_result = delta.game_result
+
+
+def _set_hand_size(view: GameView, player_id: PlayerId, hand_size: int) -> None:
+	player = view.players[player_id]
+	view.digest ^= hand_size_key(player_id, player.hand_size) ^ hand_size_key(player_id, hand_size)
+	player.hand_size = hand_size
@@ -1,18 +1,22 @@
+from itertools import count
 from typing import overload
-from uuid import uuid4
 
 from game.caravan.caravan import Caravan
 from game.caravan.enums import CaravanId
 from game.cards.card import Card
+from game.cards.card_id import FIRST_CUSTOM_CARD_ID
 from game.cards.enums import Rank, Suit
 from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.player.enums import PlayerId
+from game.rules.ruleset import can_play_base, can_attach_face, can_discard_card, can_discard_caravan, can_concede
 from game.state.enums import GamePhase
 from game.state.game_state import PlayerState, GameState
 
+_card_ids = count(FIRST_CUSTOM_CARD_ID)
+
 
 def create_numeric_card(rank: Rank, suit: Suit | None) -> Card:
-	return Card(id=uuid4(), rank=rank, suit=suit)
+	return Card(id=next(_card_ids), rank=rank, suit=suit)
 
 
 def create_player(deck: list[Card], hand: list[Card]) -> PlayerState:
@@ -50,3 +54,41 @@ def create_move(move_class: type[Concede], **kwargs) -> Concede: ...
 
 def create_move(move_class: type[Move], **kwargs) -> Move:
 	return move_class(**kwargs)
+
+
+# Tries every move the current player could make against the rule predicates, as a reference for faster move generation.
+def enumerate_legal_moves(state: GameState) -> list[Move]:
+	player_id = state.current_player
+	moves = list()
+
+	for card_id in state.players[player_id].hand:
+		for caravan_id in CaravanId:
+			play_base_move = PlayCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id)
+
+			if can_play_base(state, play_base_move):
+				moves.append(play_base_move)
+
+			for played_card in state.get_caravan(caravan_id).pile:
+				attach_face_move = AttachFaceCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id,
+												  target_base_id=played_card.base_card.id)
+
+				if can_attach_face(state, attach_face_move):
+					moves.append(attach_face_move)
+
+		discard_card_move = DiscardCard(player_id=player_id, card_id=card_id)
+
+		if can_discard_card(state, discard_card_move):
+			moves.append(discard_card_move)
+
+	for caravan_id in CaravanId:
+		discard_caravan_move = DiscardCaravan(player_id=player_id, caravan_id=caravan_id)
+
+		if can_discard_caravan(state, discard_caravan_move):
+			moves.append(discard_caravan_move)
+
+	concede_move = Concede(player_id=player_id)
+
+	if can_concede(state, concede_move):
+		moves.append(concede_move)
+
+	return moves
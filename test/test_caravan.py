@@ -0,0 +1,143 @@
+import json
+
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId, Direction
+from game.cards.card import PlayedCard
+from game.cards.enums import Rank, Suit
+from network.shared.card_ids import CardIdMap
+# noinspection PyProtectedMember
+from network.shared.serializers import _caravan_to_payload
+# noinspection PyProtectedMember
+from network.shared.deserializers import _payload_to_caravan
+from test.functions import create_numeric_card
+
+
+def _recount_score(caravan: Caravan) -> int:
+	score = 0
+
+	for played_card in caravan.pile:
+		kings = sum(1 for face_card in played_card.attachments if face_card.rank == Rank.KING)
+		score += played_card.base_card.base_value * (2 ** kings)
+
+	return score
+
+
+def test_score_stays_in_sync_with_pile() -> None:
+	caravan = Caravan(id=CaravanId.P1_A)
+
+	ten = create_numeric_card(Rank.TEN, Suit.HEARTS)
+	four = create_numeric_card(Rank.FOUR, Suit.SPADES)
+	six = create_numeric_card(Rank.SIX, Suit.CLUBS)
+
+	caravan.add_base_card(ten)
+	caravan.add_base_card(four)
+	caravan.add_base_card(six)
+
+	# Assert that the score is the sum of the base cards
+	assert caravan.score == _recount_score(caravan) == 20
+
+	caravan.attach(four.id, create_numeric_card(Rank.KING, Suit.HEARTS))
+	caravan.attach(four.id, create_numeric_card(Rank.KING, Suit.DIAMONDS))
+	caravan.attach(six.id, create_numeric_card(Rank.QUEEN, Suit.DIAMONDS))
+
+	# Assert that only Kings change the score, each doubling the value of their base card
+	assert caravan.score == _recount_score(caravan) == 10 + 4 * 2 * 2 + 6
+
+	caravan.remove_base_card(four.id)
+
+	# Assert that removing a base card also removes the value its Kings added
+	assert caravan.score == _recount_score(caravan) == 16
+
+	caravan.remove_base_cards_where(lambda card: card.suit == Suit.HEARTS)
+
+	# Assert that bulk removal keeps the score in sync
+	assert caravan.score == _recount_score(caravan) == 6
+
+	caravan.discard_caravan()
+
+	# Assert that a discarded caravan has no score
+	assert caravan.score == _recount_score(caravan) == 0
+
+
+def test_score_is_rebuilt_on_deserialization() -> None:
+	caravan = Caravan(id=CaravanId.P2_B)
+	card_ids = CardIdMap()
+
+	nine = create_numeric_card(Rank.NINE, Suit.HEARTS)
+	seven = create_numeric_card(Rank.SEVEN, Suit.HEARTS)
+
+	caravan.add_base_card(nine)
+	caravan.add_base_card(seven)
+	caravan.attach(seven.id, create_numeric_card(Rank.KING, Suit.CLUBS))
+
+	deserialized_caravan = _payload_to_caravan(json.loads(json.dumps(_caravan_to_payload(caravan, card_ids))), card_ids)
+
+	# Assert that the deserialized caravan starts with the score of its pile
+	assert deserialized_caravan.score == caravan.score == 9 + 7 * 2
+	# Assert that the King multiplier is rebuilt for the deserialized pile
+	assert deserialized_caravan.pile[-1].king_multiplier == 2
+
+	deserialized_caravan.attach(seven.id, create_numeric_card(Rank.KING, Suit.SPADES))
+
+	# Assert that further changes keep the deserialized score in sync
+	assert deserialized_caravan.score == _recount_score(deserialized_caravan) == 9 + 7 * 2 * 2
+
+
+def test_base_card_index_follows_removals() -> None:
+	caravan = Caravan(id=CaravanId.P1_C)
+
+	cards = [create_numeric_card(rank, Suit.HEARTS) for rank in (Rank.TWO, Rank.FIVE, Rank.TWO, Rank.NINE, Rank.SIX)]
+
+	for card in cards:
+		caravan.add_base_card(card)
+
+	# Assert that every base card is found at its position in the pile
+	assert all(caravan.get_position(card.id) == position for position, card in enumerate(cards))
+
+	caravan.remove_base_card(cards[1].id)
+	caravan.remove_base_cards_where(lambda card: card.rank == Rank.TWO)
+
+	remaining_cards = [cards[3], cards[4]]
+
+	# Assert that removed base cards can no longer be found
+	assert not any(caravan.has_base_card(card.id) for card in cards[:3])
+	# Assert that the remaining base cards have been moved down to their new positions
+	assert [played_card.base_card for played_card in caravan.pile] == remaining_cards
+	assert all(caravan.get_played_card(card.id) is caravan.pile[position] for position, card in enumerate(remaining_cards))
+
+	caravan.discard_caravan()
+
+	# Assert that a discarded caravan does not keep stale entries
+	assert caravan.get_played_card(cards[3].id) is None
+
+
+def test_face_card_counts_follow_attach_and_detach() -> None:
+	caravan = Caravan(id=CaravanId.P1_A)
+
+	five = create_numeric_card(Rank.FIVE, Suit.HEARTS)
+	eight = create_numeric_card(Rank.EIGHT, Suit.HEARTS)
+
+	caravan.add_base_card(five)
+	caravan.add_base_card(eight)
+
+	for face_card in (create_numeric_card(Rank.QUEEN, Suit.CLUBS), create_numeric_card(Rank.KING, Suit.SPADES),
+					  create_numeric_card(Rank.QUEEN, Suit.DIAMONDS)):
+		caravan.attach(eight.id, face_card)
+
+	played_card = caravan.get_played_card(eight.id)
+
+	# Assert that both Queens and the King are counted as they are attached
+	assert (played_card.queen_count, played_card.last_queen_suit, played_card.king_count) == (2, Suit.DIAMONDS, 1)
+	assert caravan.direction == Direction.ASCENDING and caravan.current_suit == Suit.DIAMONDS
+
+	caravan.detach_last(eight.id)
+
+	# Assert that detaching the last Queen brings back the suit and direction of the one before
+	assert (played_card.queen_count, played_card.last_queen_suit, played_card.king_count) == (1, Suit.CLUBS, 1)
+	assert caravan.direction == Direction.DESCENDING and caravan.current_suit == Suit.CLUBS
+
+	rebuilt_card = PlayedCard(base_card=eight, attachments=list(played_card.attachments))
+
+	# Assert that counts kept on attach match those rebuilt from the attachments
+	assert (rebuilt_card.queen_count, rebuilt_card.last_queen_suit, rebuilt_card.king_count) == (1, Suit.CLUBS, 1)
+	assert rebuilt_card.score == played_card.score == 16
@@ -0,0 +1,50 @@
+from uuid import UUID
+
+import pytest
+
+from game.cards.card_id import STANDARD_CARD_COUNT, CARD_RANKS, CARD_SUITS, CARD_VALUES, get_card_owner
+from game.cards.enums import Rank
+from game.player.enums import PlayerId
+from game.setup.deck_builder import build_standard_deck
+from network.shared.card_ids import CardIdMap
+
+
+def test_standard_decks_match_lookup_tables() -> None:
+	decks = {player_id: build_standard_deck(player_id) for player_id in PlayerId}
+	cards = [card for deck in decks.values() for card in deck]
+
+	# Assert that both decks together hold every standard id once, each card agreeing with the lookup tables
+	assert sorted(card.id for card in cards) == list(range(STANDARD_CARD_COUNT))
+	assert all(CARD_RANKS[card.id] == card.rank and CARD_SUITS[card.id] == card.suit for card in cards)
+	assert all(CARD_VALUES[card.id] == (card.base_value if card.rank.is_numeric else 0) for card in cards)
+	assert all(get_card_owner(card.id) == player_id for player_id, deck in decks.items() for card in deck)
+	assert sum(1 for card in decks[PlayerId.P2] if card.rank == Rank.JOKER) == 2
+
+	# Assert that decks are built from the same card instances every time
+	assert all(card is rebuilt_card for card, rebuilt_card in zip(decks[PlayerId.P1], build_standard_deck(PlayerId.P1)))
+
+
+def test_card_ids_are_sent_as_random_uuids() -> None:
+	host_card_ids = CardIdMap()
+	client_card_ids = CardIdMap(accepts_new=True)
+	card_ids = (0, 53, STANDARD_CARD_COUNT - 1, STANDARD_CARD_COUNT + 1000)
+
+	for index, card_id in enumerate(card_ids):
+		card_str = host_card_ids.to_str(card_id)
+
+		# Assert that ids are sent as UUID strings which do not tell the card, and read back unchanged by the host
+		assert card_str == str(UUID(card_str)) and card_str != str(UUID(int=card_id))
+		assert host_card_ids.to_str(card_id) == card_str
+		assert host_card_ids.to_card_id(card_str) == card_id
+
+		# Assert that a client gives the card a small local id, under the same UUID the host keys its digests with
+		assert client_card_ids.to_card_id(card_str) == index
+		assert client_card_ids.to_wire_id(index) == host_card_ids.to_wire_id(card_id)
+		assert client_card_ids.to_str(index) == card_str
+
+	# Assert that another game sends the same cards under other ids
+	assert all(CardIdMap().to_str(card_id) != host_card_ids.to_str(card_id) for card_id in card_ids)
+
+	# Assert that the host refuses ids it never sent
+	with pytest.raises(ValueError):
+		host_card_ids.to_card_id(str(UUID(int=0)))
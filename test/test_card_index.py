@@ -0,0 +1,97 @@
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import PlayCard, AttachFaceCard
+from game.player.enums import PlayerId
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.card_index import CardIndex, CardZone, CardLocation
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from test.functions import create_numeric_card, create_player, initialise_caravans, create_game_state, create_move
+
+
+def _rebuild_index(state: GameState) -> CardIndex:
+	index = CardIndex()
+
+	for player_id, player in state.players.items():
+		for position, card in enumerate(player.deck):
+			index.place_in_deck(card, player_id, position)
+
+		for card in player.hand.values():
+			index.place_in_hand(card, player_id)
+
+	for caravan_id, caravan in state.caravans.items():
+		for position, played_card in enumerate(caravan.pile):
+			index.place_in_caravan(caravan_id, position, played_card)
+
+	return index
+
+
+def test_index_follows_setup_moves() -> None:
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(7)))
+
+	# Assert that every dealt card is indexed in the hand of its player
+	assert _rebuild_index(state) == state.card_index
+	assert all(state.card_index.get_location(card_id).zone == CardZone.HAND
+			   for player in state.players.values() for card_id in player.hand)
+
+	while state.game_phase == GamePhase.SETUP:
+		player = state.players[state.current_player]
+		caravan_id = next(cid for cid in CaravanId
+						  if cid.owner == state.current_player and not state.get_caravan(cid).pile)
+		card = next(card for card in player.hand.values() if card.rank.is_numeric)
+
+		apply_move(state, PlayCard(player_id=state.current_player, card_id=card.id, caravan_id=caravan_id))
+
+		# Assert that the played card is indexed on its caravan
+		assert state.card_index.get_location(card.id) == CardLocation(zone=CardZone.CARAVAN, owner=caravan_id.owner,
+																	   position=0, caravan_id=caravan_id)
+
+	# Assert that the incrementally kept index matches one built from scratch
+	assert _rebuild_index(state) == state.card_index
+
+
+def test_index_follows_joker_removals() -> None:
+	joker = create_numeric_card(Rank.JOKER, None)
+	target = create_numeric_card(Rank.SEVEN, Suit.HEARTS)
+	other_seven = create_numeric_card(Rank.SEVEN, Suit.CLUBS)
+	king = create_numeric_card(Rank.KING, Suit.CLUBS)
+	four = create_numeric_card(Rank.FOUR, Suit.CLUBS)
+	deck_card = create_numeric_card(Rank.FIVE, Suit.HEARTS)
+
+	state = create_game_state(
+		players=[create_player([deck_card], [joker]), create_player([], [create_numeric_card(Rank.TWO, Suit.HEARTS)])],
+		caravans=initialise_caravans(),
+		current_player=PlayerId.P1,
+		game_phase=GamePhase.MAIN,
+		turn_number=3
+	)
+
+	state.get_caravan(CaravanId.P1_A).add_base_card(target)
+	state.get_caravan(CaravanId.P2_A).add_base_card(other_seven)
+	state.get_caravan(CaravanId.P2_A).add_base_card(four)
+	state.get_caravan(CaravanId.P2_A).attach(other_seven.id, king)
+
+	# Assert that cards added straight onto the caravans are indexed too
+	assert state.card_index.get_location(king.id).target_base_id == other_seven.id
+	assert state.card_index.card_ids_by_rank(Rank.SEVEN) == {target.id, other_seven.id}
+
+	apply_move(state, create_move(AttachFaceCard, player_id=PlayerId.P1, card_id=joker.id,
+								  caravan_id=CaravanId.P1_A, target_base_id=target.id))
+
+	# Assert that the removed Seven and its King are no longer indexed, and the Four has moved down
+	assert state.card_index.get_location(other_seven.id) is None
+	assert state.card_index.get_location(king.id) is None
+	assert state.card_index.get_location(four.id).position == 0
+	# Assert that the secondary indexes only hold cards still in play
+	assert state.card_index.card_ids_by_rank(Rank.SEVEN) == {target.id}
+	assert state.card_index.card_ids_by_suit(Suit.CLUBS) == {four.id}
+	# Assert that the Joker is indexed as an attachment and the drawn card as part of the hand
+	assert state.card_index.get_location(joker.id).zone == CardZone.ATTACHMENT
+	assert state.card_index.get_location(deck_card.id).zone == CardZone.HAND
+
+	assert _rebuild_index(state) == state.card_index
@@ -0,0 +1,95 @@
+import json
+
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.engine.apply import apply_move
+from game.moves.types import Concede, DiscardCaravan
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from network.shared.card_ids import CardIdMap
+from network.shared.serializers import game_state_to_payload
+from test.functions import enumerate_legal_moves
+
+_CARD_IDS = CardIdMap()
+
+
+def _snapshot(state: GameState) -> str:
+	return json.dumps(game_state_to_payload(state, _CARD_IDS))
+
+
+def _mid_game_state() -> GameState:
+	rng = default_rng(5)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(5)))
+
+	for _ in range(40):
+		moves = [move for move in enumerate_legal_moves(state) if not isinstance(move, Concede)]
+
+		if apply_move(state, moves[rng.integers(len(moves))]) is not None:
+			break
+
+	return state
+
+
+def _play_out(state: GameState, seed: int, plies: int) -> None:
+	rng = default_rng(seed)
+
+	for _ in range(plies):
+		if state.game_phase == GamePhase.FINISHED:
+			return
+
+		moves = [move for move in enumerate_legal_moves(state) if not isinstance(move, Concede)]
+		apply_move(state, moves[rng.integers(len(moves))])
+
+
+def test_clone_is_equal_and_independent() -> None:
+	state = _mid_game_state()
+	snapshot = _snapshot(state)
+
+	clone = state.clone()
+
+	# Assert that the clone is equal to the state but shares no mutable container with it
+	assert clone == state
+	assert clone.card_index == state.card_index
+	assert all(clone.caravans[caravan_id] is not state.caravans[caravan_id] for caravan_id in CaravanId)
+
+	_play_out(clone, seed=1, plies=20)
+
+	# Assert that playing on the clone leaves the state untouched
+	assert _snapshot(state) == snapshot
+	assert clone != state
+
+
+def test_copy_on_write_clone_only_copies_changed_caravans() -> None:
+	state = _mid_game_state()
+	snapshot = _snapshot(state)
+
+	clone = state.clone(copy_on_write=True)
+
+	# Assert that all caravans are shared right after cloning
+	assert all(clone.caravans[caravan_id] is state.caravans[caravan_id] for caravan_id in CaravanId)
+
+	discarded_caravan_id = next(caravan_id for caravan_id in CaravanId if caravan_id.owner == clone.current_player)
+	apply_move(clone, DiscardCaravan(player_id=clone.current_player, caravan_id=discarded_caravan_id))
+
+	# Assert that only the discarded caravan has been copied and the state still has its own pile
+	assert all((clone.caravans[caravan_id] is state.caravans[caravan_id]) == (caravan_id != discarded_caravan_id)
+			   for caravan_id in CaravanId)
+	assert _snapshot(state) == snapshot
+
+	expected_clone = clone.clone()
+	expected_state = state.clone()
+
+	_play_out(clone, seed=2, plies=20)
+	_play_out(state, seed=3, plies=20)
+	_play_out(expected_clone, seed=2, plies=20)
+	_play_out(expected_state, seed=3, plies=20)
+
+	# Assert that both states play on as if they had been fully copied
+	assert _snapshot(clone) == _snapshot(expected_clone)
+	assert _snapshot(state) == _snapshot(expected_state)
+	assert clone.card_index == expected_clone.card_index
+	assert state.card_index == expected_state.card_index
@@ -0,0 +1,61 @@
+import pytest
+from numpy.random import default_rng
+
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import MoveType
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase, WinReason
+from game.state.game_state import GameResult
+from network.shared.card_ids import CardIdMap
+from network.shared.codec import CODEC_VERSION, encode_game_state, decode_game_state
+from network.shared.serializers import game_state_to_payload
+from test.functions import create_numeric_card, create_player, initialise_caravans, create_game_state
+
+_CARD_IDS = CardIdMap()
+
+
+def test_states_survive_the_codec() -> None:
+	rng = default_rng(3)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(3)))
+	buffer = bytearray()
+	game_result = None
+
+	while game_result is None:
+		data = encode_game_state(state, buffer)
+		decoded_state = decode_game_state(memoryview(data))
+
+		# Assert that the state comes back whole, in the reused buffer, and in a few hundred bytes
+		assert data is buffer
+		assert game_state_to_payload(decoded_state, _CARD_IDS) == game_state_to_payload(state, _CARD_IDS)
+		assert decoded_state.zobrist_hash == state.zobrist_hash
+		assert len(data) < 400
+
+		game_result = apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0}))
+
+	state.game_result = game_result
+
+	# Assert that the result of a finished game is kept
+	assert decode_game_state(encode_game_state(state)).game_result == game_result
+
+
+def test_codec_refuses_what_it_cannot_read() -> None:
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(1)))
+	state.game_result = GameResult(winner_id=PlayerId.P1, reason=WinReason.REPETITION, end_turn_number=3)
+	data = encode_game_state(state)
+	data[0] = CODEC_VERSION + 1
+
+	# Assert that another version of the layout is not misread
+	with pytest.raises(ValueError):
+		decode_game_state(data)
+
+	custom_state = create_game_state([create_player([], [create_numeric_card(Rank.TWO, Suit.CLUBS)]),
+									  create_player([], [])], initialise_caravans(), PlayerId.P1, GamePhase.MAIN, 0)
+
+	# Assert that cards outside the standard decks, which do not fit a byte, are refused
+	with pytest.raises(ValueError):
+		encode_game_state(custom_state)
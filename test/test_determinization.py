@@ -0,0 +1,103 @@
+from collections import Counter
+
+import numpy as np
+from numpy.random import default_rng
+
+from game.cards.card_id import CardId
+from game.engine.apply import apply_move
+from game.moves.types import MoveType
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.search.determinization import DeterminizationSampler, sample_determinizations
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.card_index import CardZone
+from game.state.encoding import encode_state
+from game.state.game_state import GameState
+from network.shared.card_ids import CardIdMap
+from network.shared.serializers import game_state_to_payload
+
+_CARD_IDS = CardIdMap()
+
+
+def _mid_game_state(seed: int) -> GameState:
+	rng = default_rng(seed)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+
+	for _ in range(30):
+		apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0}))
+
+	return state
+
+
+def _held_cards(state: GameState, player_id: PlayerId) -> Counter:
+	player = state.players[player_id]
+
+	return Counter(card.id for card in player.deck + list(player.hand.values()))
+
+
+# The opponent's cards that the observer has not seen in a caravan, which may be held or discarded.
+def _unseen_card_ids(state: GameState, opponent: PlayerId) -> set[CardId]:
+	shown_card_ids = {card.id for caravan in state.caravans.values() for played_card in caravan.pile
+					  for card in (played_card.base_card, *played_card.attachments)}
+
+	return {card.id for card in build_standard_deck(opponent)} - shown_card_ids
+
+
+def test_determinizations_only_change_hidden_information() -> None:
+	state = _mid_game_state(2)
+	observer = state.current_player
+	opponent = PlayerId.P2 if observer == PlayerId.P1 else PlayerId.P1
+	payload = game_state_to_payload(state, _CARD_IDS)
+	held_count = sum(_held_cards(state, opponent).values())
+	unseen_card_ids = _unseen_card_ids(state, opponent)
+
+	# Assert that the opponent has discarded cards out of sight, which samples cannot tell from the ones held
+	assert len(unseen_card_ids) > held_count
+
+	determinizations = sample_determinizations(state, observer, 8, default_rng(0))
+
+	for determinization in determinizations:
+		# Assert that the observer sees the same game, the opponent holding cards they have not played
+		assert np.array_equal(encode_state(state, observer), encode_state(determinization, observer))
+		held_cards = _held_cards(determinization, opponent)
+		assert sum(held_cards.values()) == held_count and set(held_cards) <= unseen_card_ids
+		assert max(held_cards.values()) == 1
+		assert list(determinization.players[observer].hand) == list(state.players[observer].hand)
+
+		# Assert that the card index follows the new deal
+		for player_id, player in determinization.players.items():
+			for position, card in enumerate(player.deck):
+				location = determinization.card_index.get_location(card.id)
+				assert (location.zone, location.owner, location.position) == (CardZone.DECK, player_id, position)
+
+			for card_id in player.hand:
+				location = determinization.card_index.get_location(card_id)
+				assert (location.zone, location.owner) == (CardZone.HAND, player_id)
+
+		# Assert that the cards left out of the deal are out of play
+		for card_id in unseen_card_ids - set(_held_cards(determinization, opponent)):
+			assert determinization.card_index.get_location(card_id) is None
+
+	# Assert that the hidden cards are dealt differently from one sample to the next, not only in another order but
+	# leaving out other cards, the real state left untouched
+	assert len({frozenset(determinization.players[opponent].hand) for determinization in determinizations}) > 1
+	assert len({frozenset(_held_cards(determinization, opponent)) for determinization in determinizations}) > 1
+	assert game_state_to_payload(state, _CARD_IDS) == payload
+
+
+def test_determinizations_play_independently() -> None:
+	state = _mid_game_state(4)
+	rng = default_rng(1)
+	sampler = DeterminizationSampler(state, state.current_player)
+	first, second = sampler.sample(2, rng)
+	payload = game_state_to_payload(second, _CARD_IDS)
+
+	for _ in range(10):
+		apply_move(first, sample_legal_move(first, rng, {MoveType.CONCEDE: 0.0}))
+
+	# Assert that playing on one sample changes neither the others nor the template of the next ones
+	assert game_state_to_payload(second, _CARD_IDS) == payload
+	assert np.array_equal(encode_state(sampler.sample(1, rng)[0], state.current_player),
+						  encode_state(state, state.current_player))
@@ -0,0 +1,105 @@
+import numpy as np
+from numpy.random import default_rng
+
+from game.caravan.constants import CARAVAN_COUNT, MAX_PILE
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import MoveType
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.encoding import ENCODING_SIZE, PILES, CARAVANS, CARD_COUNTS, HAND, TURN, PILE_FEATURES, \
+	CARAVAN_FEATURES, encode_state, encode_states
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from test.functions import create_numeric_card, create_player, initialise_caravans, create_game_state
+
+
+def _mid_game_state(seed: int) -> GameState:
+	rng = default_rng(seed)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+
+	for _ in range(40):
+		if apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0})) is not None:
+			break
+
+	return state
+
+
+def test_encoding_follows_the_perspective() -> None:
+	caravans = initialise_caravans()
+	caravans[CaravanId.P2_A].add_base_card(create_numeric_card(Rank.SEVEN, Suit.CLUBS))
+	caravans[CaravanId.P2_A].attach(caravans[CaravanId.P2_A].pile[0].base_card.id, create_numeric_card(Rank.KING,
+																										 Suit.HEARTS))
+	deck = [create_numeric_card(Rank.TWO, Suit.SPADES) for _ in range(3)]
+	hand = [create_numeric_card(Rank.FIVE, Suit.HEARTS), create_numeric_card(Rank.FIVE, Suit.HEARTS)]
+	state = create_game_state([create_player(deck, hand), create_player([], [])], caravans, PlayerId.P2,
+							  GamePhase.MAIN, 4)
+
+	encoding = encode_state(state, PlayerId.P2)
+	piles = encoding[PILES].reshape(CARAVAN_COUNT, MAX_PILE, PILE_FEATURES)
+	caravan_features = encoding[CARAVANS].reshape(CARAVAN_COUNT, CARAVAN_FEATURES)
+
+	# Assert that the player's own caravans come first, with the base value, suit and Kings of each card
+	assert list(piles[0, 0]) == [7, 0, 0, 1, 0, 1, 0]
+	assert caravan_features[0, 0] == 14 and caravan_features[0, 1] == 1
+	assert not piles[3:].any()
+
+	# Assert that the hand is left out, only its size and the deck size of the opponent are written
+	assert not encoding[HAND].any()
+	assert list(encoding[CARD_COUNTS]) == [0, 0, 3, 2]
+
+	# Assert that the owner of the hand sees both copies of the same face
+	assert encode_state(state, PlayerId.P1)[HAND].sum() == 2
+	assert encode_state(state, PlayerId.P1)[HAND].max() == 2
+
+
+def test_hidden_information_does_not_change_the_encoding() -> None:
+	state = _mid_game_state(3)
+	hidden = state.clone()
+
+	# Another order for both decks, and another hand for the opponent of P1, of the same size.
+	opponent = hidden.players[PlayerId.P2]
+	opponent.deck.reverse()
+	hidden.players[PlayerId.P1].deck.reverse()
+	swapped = list(opponent.hand.values())[0]
+	opponent.hand.pop(swapped.id)
+	opponent.hand[opponent.deck[0].id] = opponent.deck[0]
+	opponent.deck[0] = swapped
+
+	# Assert that P1 cannot tell the states apart, while P2 can
+	assert np.array_equal(encode_state(state, PlayerId.P1), encode_state(hidden, PlayerId.P1))
+	assert not np.array_equal(encode_state(state, PlayerId.P2), encode_state(hidden, PlayerId.P2))
+
+
+def _late_game_state() -> GameState:
+	caravans = initialise_caravans()
+	ten = create_numeric_card(Rank.TEN, Suit.SPADES)
+	caravans[CaravanId.P1_C].add_base_card(ten)
+
+	for _ in range(4):
+		caravans[CaravanId.P1_C].attach(ten.id, create_numeric_card(Rank.KING, Suit.CLUBS))
+
+	return create_game_state([create_player([], []), create_player([], [])], caravans, PlayerId.P1, GamePhase.MAIN,
+							 300)
+
+
+def test_batch_encoding_fills_rows() -> None:
+	states = [_mid_game_state(seed) for seed in range(4)] + [_late_game_state()]
+	perspectives = [PlayerId.P1, PlayerId.P2, PlayerId.P2, PlayerId.P1, PlayerId.P2]
+	out = np.full((len(states), ENCODING_SIZE), 9, dtype=np.int8)
+
+	encode_states(states, perspectives, out)
+
+	for row, (state, perspective) in enumerate(zip(states, perspectives)):
+		# Assert that each row is the encoding of its state, whatever was in the buffer before, capped to int8
+		assert np.array_equal(out[row], np.minimum(encode_state(state, perspective), 127).astype(np.int8))
+
+	caravan_features = out[-1, CARAVANS].reshape(CARAVAN_COUNT, CARAVAN_FEATURES)
+
+	# Assert that a turn number and a score past the range of int8 are capped rather than wrapped around
+	assert out[-1, TURN] == 127
+	assert caravan_features[5, 0] == 127 and _late_game_state().caravans[CaravanId.P1_C].score == 160
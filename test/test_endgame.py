@@ -0,0 +1,103 @@
+import time
+
+from numpy.random import default_rng
+
+from game.engine.apply import apply_move, make_move
+from game.engine.journal import undo_move
+from game.moves.types import MoveType, DiscardCaravan
+from game.rules.legal_moves import generate_legal_moves, sample_legal_move
+from game.search.endgame import WIN, LOSS, DRAW, is_endgame, solve_endgame
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.game_state import GameState
+from network.shared.card_ids import CardIdMap
+from network.shared.serializers import game_state_to_payload
+
+_CARD_IDS = CardIdMap()
+
+
+def _count_hand_cards(state: GameState) -> int:
+	return sum(len(player.hand) for player in state.players.values())
+
+
+# Endgames of random games, played on until the hands hold at most "max_cards" cards in all.
+def _endgame_states(count: int, max_cards: int = 16) -> list[GameState]:
+	states = list()
+	seed = 0
+
+	while len(states) < count:
+		rng = default_rng(seed)
+		state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+		game_result = None
+		seed += 1
+
+		while game_result is None and (not is_endgame(state) or _count_hand_cards(state) > max_cards):
+			game_result = apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0}))
+
+		if game_result is None:
+			states.append(state)
+
+	return states
+
+
+# Plain minimax over every legal move, without ordering nor pruning. Values are exact, so they are remembered by position
+# in "values".
+def _minimax(state: GameState, passed: bool, values: dict[tuple[int, bool], int]) -> int:
+	key = (state.zobrist_hash, passed)
+
+	if key in values:
+		return values[key]
+
+	player_id = state.current_player
+	best_value = LOSS
+
+	for move in generate_legal_moves(state):
+		is_pass = isinstance(move, DiscardCaravan) and not state.caravans[move.caravan_id].pile
+		game_result, record = make_move(state, move)
+
+		if game_result is not None:
+			value = WIN if game_result.winner_id == player_id else LOSS
+		elif is_pass and passed:
+			value = DRAW
+		else:
+			value = -_minimax(state, is_pass, values)
+
+		undo_move(state, record)
+		best_value = max(best_value, value)
+
+	values[key] = best_value
+
+	return best_value
+
+
+def test_solver_matches_plain_minimax() -> None:
+	for state in _endgame_states(6, max_cards=3):
+		payload = game_state_to_payload(state, _CARD_IDS)
+		solution = solve_endgame(state)
+
+		# Assert that pruning and the transposition table keep the exact value, and leave the state as it was
+		assert solution.value == _minimax(state, False, dict())
+		assert game_state_to_payload(state, _CARD_IDS) == payload
+
+		player_id = state.current_player
+		game_result, record = make_move(state, solution.move)
+
+		# Assert that the move played reaches the value found
+		if game_result is not None:
+			assert solution.value == (WIN if game_result.winner_id == player_id else LOSS)
+		else:
+			assert -solve_endgame(state).value == solution.value
+
+		undo_move(state, record)
+
+
+def test_solver_gives_up_past_its_deadline() -> None:
+	# Searching 1024 nodes, the interval between two looks at the clock, takes far less than a second.
+	state = next(state for state in _endgame_states(8) if solve_endgame(state, time.monotonic() + 1.0) is None)
+	payload = game_state_to_payload(state, _CARD_IDS)
+
+	# Assert that a search out of time returns nothing, whether it had started or not, and hands the state back untouched
+	assert solve_endgame(state, deadline=0.0) is None
+	assert solve_endgame(state, deadline=time.monotonic() + 0.01) is None
+	assert game_state_to_payload(state, _CARD_IDS) == payload
@@ -0,0 +1,123 @@
+import numpy as np
+from numpy.random import default_rng
+
+from game.env.action_space import action_index_to_move, fill_action_mask, move_to_action_index
+from game.env.caravan_env import CaravanEnv, WIN_REWARD, LOSS_REWARD, MAX_OPPONENT_ERRORS
+from game.env.vec_env import VecEnv
+from game.moves.types import DiscardCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import generate_legal_moves
+from game.vector.actions import CONCEDE_INDEX, DISCARD_CARAVAN_OFFSET, sample_action_indices
+from test.functions import enumerate_legal_moves
+
+
+def _pick_action(action_mask: np.ndarray, rng: np.random.Generator) -> int:
+	# Caravan discards and concessions would end games before anything is tested.
+	choices = np.flatnonzero(action_mask[:DISCARD_CARAVAN_OFFSET])
+
+	return int(rng.choice(choices)) if len(choices) > 0 else CONCEDE_INDEX
+
+
+def test_env_plays_games_to_the_end() -> None:
+	rng = default_rng(3)
+
+	for agent_id in PlayerId:
+		env = CaravanEnv(11, agent_id=agent_id)
+		env.reset()
+		done = False
+		reward = 0.0
+
+		while not done:
+			state = env.state
+
+			# Assert that the agent is always to act, and that the mask matches the legal moves
+			assert state.current_player == agent_id
+			assert sorted(map(repr, enumerate_legal_moves(state))) == sorted(
+				repr(action_index_to_move(state, int(index))) for index in np.flatnonzero(env.action_mask))
+
+			env_step = env.step(_pick_action(env.action_mask, rng))
+			done, reward = env_step.done, env_step.reward
+
+			# Assert that legal actions are never punished
+			assert not env_step.illegal
+
+		# Assert that the game ends with a win or a loss for the agent
+		assert reward in (WIN_REWARD, LOSS_REWARD)
+
+
+def test_illegal_action_is_penalised_without_changing_the_state() -> None:
+	env = CaravanEnv(5, illegal_penalty=2.0)
+	observation = env.reset().copy()
+	illegal_index = int(np.flatnonzero(~env.action_mask)[0])
+
+	env_step = env.step(illegal_index)
+
+	# Assert that the penalty is given at once, with the game going on from the same state
+	assert env_step.illegal and not env_step.done
+	assert env_step.reward == -2.0
+	assert np.array_equal(env.observation, observation)
+
+
+def test_env_plays_for_an_opponent_stuck_on_illegal_moves() -> None:
+	env = CaravanEnv(4)
+	calls = list()
+
+	def get_illegal_move(state):
+		calls.append(state.turn_number)
+
+		return DiscardCard(player_id=state.current_player, card_id=-1)
+
+	# noinspection PyProtectedMember
+	env._get_opponent_move = get_illegal_move
+	env.reset()
+	rng = default_rng(2)
+
+	for _ in range(5):
+		turn_number = env.state.turn_number
+		calls.clear()
+		env_step = env.step(_pick_action(env.action_mask, rng))
+
+		# Assert that the opponent is asked a few times, then moves at random so that the agent is to act again
+		assert len(calls) == MAX_OPPONENT_ERRORS
+		assert env_step.done or env.state.turn_number == turn_number + 2
+
+
+def test_actions_round_trip_through_indices() -> None:
+	env = CaravanEnv(8)
+	env.reset()
+	rng = default_rng(1)
+
+	for _ in range(30):
+		for move in generate_legal_moves(env.state):
+			# Assert that every legal move has an index that decodes back to it
+			assert action_index_to_move(env.state, move_to_action_index(env.state, move)) == move
+
+		env.step(_pick_action(fill_action_mask(env.state), rng))
+
+
+def test_vec_env_steps_the_same_across_workers() -> None:
+	rng = default_rng(0)
+	results = list()
+
+	for workers in (0, 2):
+		with VecEnv(6, seed=21, workers=workers) as vec_env:
+			observations = [vec_env.reset().copy()]
+			rewards = list()
+
+			for _ in range(40):
+				actions = sample_action_indices(vec_env.buffers.action_masks[:, :DISCARD_CARAVAN_OFFSET], rng)
+				buffers = vec_env.step(actions)
+
+				observations.append(buffers.observations.copy())
+				rewards.append(buffers.rewards.copy())
+
+				# Assert that actions drawn from the masks are all legal
+				assert not buffers.illegal.any()
+
+			results.append((np.array(observations), np.array(rewards)))
+
+		rng = default_rng(0)
+
+	# Assert that the subprocesses write the same observations and rewards as in-process environments
+	assert np.array_equal(results[0][0], results[1][0])
+	assert np.array_equal(results[0][1], results[1][1])
@@ -0,0 +1,89 @@
+import time
+
+from numpy.random import default_rng
+
+from game.agents.ismcts_agent import IsmctsAgent
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import MoveType, PlayCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from test.functions import create_numeric_card, create_player, initialise_caravans, create_game_state, \
+	enumerate_legal_moves
+
+
+def _mid_game_state(seed: int) -> GameState:
+	rng = default_rng(seed)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+
+	for _ in range(30):
+		apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0}))
+
+	return state
+
+
+def test_agent_plays_the_winning_move() -> None:
+	caravans = initialise_caravans()
+	piles = {
+		CaravanId.P1_A: [(Rank.TEN, Suit.CLUBS), (Rank.NINE, Suit.CLUBS), (Rank.FIVE, Suit.CLUBS)],
+		CaravanId.P1_B: [(Rank.TEN, Suit.HEARTS), (Rank.SIX, Suit.HEARTS), (Rank.FOUR, Suit.HEARTS)],
+		CaravanId.P1_C: [(Rank.TEN, Suit.DIAMONDS), (Rank.EIGHT, Suit.DIAMONDS), (Rank.FOUR, Suit.DIAMONDS)],
+	}
+
+	for caravan_id, cards in piles.items():
+		for rank, suit in cards:
+			caravans[caravan_id].add_base_card(create_numeric_card(rank, suit))
+
+	three = create_numeric_card(Rank.THREE, Suit.HEARTS)
+	hand = [create_numeric_card(Rank.NINE, Suit.HEARTS), three, create_numeric_card(Rank.EIGHT, Suit.SPADES)]
+	deck = [create_numeric_card(Rank.SEVEN, Suit.SPADES) for _ in range(5)]
+	opponent_cards = [create_numeric_card(Rank.EIGHT, Suit.SPADES) for _ in range(8)]
+	state = create_game_state([create_player(deck, hand), create_player(opponent_cards[3:], opponent_cards[:3])],
+							  caravans, PlayerId.P1, GamePhase.MAIN, 20)
+
+	move = IsmctsAgent(default_rng(0), iterations=200)(state)
+
+	# Assert that the only move selling the last route is found
+	assert move == PlayCard(player_id=PlayerId.P1, card_id=three.id, caravan_id=CaravanId.P1_B)
+
+
+def test_agent_keeps_to_its_budget() -> None:
+	state = _mid_game_state(5)
+	agent = IsmctsAgent(default_rng(1), time_budget=0.05)
+
+	start = time.perf_counter()
+	move = agent(state)
+
+	# Assert that the decision is legal and taken within the time budget, give or take one iteration
+	assert move in enumerate_legal_moves(state)
+	assert time.perf_counter() - start < 0.2
+
+	# Assert that an iteration budget gives the same move for the same seed
+	assert IsmctsAgent(default_rng(3), iterations=30)(state) == IsmctsAgent(default_rng(3), iterations=30)(state)
+
+
+def test_root_parallel_search_merges_trees() -> None:
+	state = _mid_game_state(7)
+	agent = IsmctsAgent(default_rng(1), iterations=20, workers=2)
+
+	try:
+		# Assert that the pool is running before the first decision
+		# noinspection PyProtectedMember
+		assert len(agent._executor._processes) == 1
+
+		moves = [agent(state), agent(state)]
+	finally:
+		agent.close()
+
+	# Assert that moves searched across processes are legal, the pool being reused for the second one
+	assert all(move in enumerate_legal_moves(state) for move in moves)
+
+	# Assert that closing the agent shuts its pool down
+	# noinspection PyProtectedMember
+	assert agent._executor is None
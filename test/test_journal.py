@@ -0,0 +1,136 @@
+import json
+
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import make_move
+from game.engine.journal import undo_move
+from game.moves.types import Concede, AttachFaceCard, DiscardCaravan
+from game.player.enums import PlayerId
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from network.shared.card_ids import CardIdMap
+from network.shared.serializers import game_state_to_payload
+from test.functions import enumerate_legal_moves, create_numeric_card, create_player, initialise_caravans, \
+	create_game_state, create_move
+
+_CARD_IDS = CardIdMap()
+
+
+def _snapshot(state: GameState) -> str:
+	return json.dumps(game_state_to_payload(state, _CARD_IDS))
+
+
+def _assert_caches_in_sync(state: GameState) -> None:
+	rebuilt_state = GameState(
+		players=state.players,
+		caravans={caravan_id: caravan for caravan_id, caravan in state.caravans.items()},
+		current_player=state.current_player,
+		turn_number=state.turn_number,
+		game_phase=state.game_phase,
+	)
+
+	# Assert that the card index and caravan scores match those of a freshly built state
+	assert rebuilt_state.card_index == state.card_index
+	assert all(caravan.score == sum(played_card.score for played_card in caravan.pile)
+			   for caravan in state.caravans.values())
+
+	# Hand the caravans back to the state under test.
+	for caravan in state.caravans.values():
+		caravan.listener = state
+
+
+def test_random_game_unwinds_to_initial_state() -> None:
+	rng = default_rng(11)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(3)))
+
+	history = list()
+
+	for _ in range(150):
+		moves = [move for move in enumerate_legal_moves(state) if not isinstance(move, Concede)]
+
+		if not moves:
+			break
+
+		snapshot = _snapshot(state)
+		game_result, record = make_move(state, moves[rng.integers(len(moves))])
+		history.append((snapshot, record))
+
+		if game_result is not None:
+			break
+
+	# Assert that the game went past setup so that face cards and discards have been journaled
+	assert len(history) > 10
+
+	if state.game_phase != GamePhase.FINISHED:
+		snapshot = _snapshot(state)
+		_, record = make_move(state, Concede(player_id=state.current_player))
+
+		# Assert that conceding finished the game and undoing it brings the game back
+		assert state.game_phase == GamePhase.FINISHED
+		undo_move(state, record)
+		assert _snapshot(state) == snapshot
+
+	while history:
+		snapshot, record = history.pop()
+
+		undo_move(state, record)
+
+		# Assert that undoing restores the exact serialized state, hand and deck order included
+		assert _snapshot(state) == snapshot
+
+	_assert_caches_in_sync(state)
+
+
+def test_undo_joker_restores_removed_cards() -> None:
+	joker = create_numeric_card(Rank.JOKER, None)
+	target = create_numeric_card(Rank.ACE, Suit.SPADES)
+	spade_eight = create_numeric_card(Rank.EIGHT, Suit.SPADES)
+	spade_king = create_numeric_card(Rank.KING, Suit.SPADES)
+	heart_three = create_numeric_card(Rank.THREE, Suit.HEARTS)
+	spade_two = create_numeric_card(Rank.TWO, Suit.SPADES)
+	deck_card = create_numeric_card(Rank.FIVE, Suit.HEARTS)
+	other_hand_card = create_numeric_card(Rank.NINE, Suit.CLUBS)
+
+	state = create_game_state(
+		players=[create_player([deck_card], [other_hand_card, joker]),
+				 create_player([], [create_numeric_card(Rank.TEN, Suit.CLUBS)])],
+		caravans=initialise_caravans(),
+		current_player=PlayerId.P1,
+		game_phase=GamePhase.MAIN,
+		turn_number=12
+	)
+
+	state.get_caravan(CaravanId.P1_B).add_base_card(target)
+	state.get_caravan(CaravanId.P2_B).add_base_card(spade_eight)
+	state.get_caravan(CaravanId.P2_B).add_base_card(heart_three)
+	state.get_caravan(CaravanId.P2_B).add_base_card(spade_two)
+	state.get_caravan(CaravanId.P2_B).attach(spade_eight.id, spade_king)
+
+	snapshot = _snapshot(state)
+	score = state.get_caravan(CaravanId.P2_B).score
+
+	_, record = make_move(state, create_move(AttachFaceCard, player_id=PlayerId.P1, card_id=joker.id,
+											 caravan_id=CaravanId.P1_B, target_base_id=target.id))
+
+	# Assert that both Spades were journaled as removed, and the drawn card as drawn
+	assert [removed.played_card.base_card for removed in record.removed_base_cards] == [spade_two, spade_eight]
+	assert record.drawn_card == deck_card
+
+	undo_move(state, record)
+
+	# Assert that the Spades are back in place with the King, and that the hand is back in its original order
+	assert _snapshot(state) == snapshot
+	assert state.get_caravan(CaravanId.P2_B).score == score
+	assert list(state.players[PlayerId.P1].hand) == [other_hand_card.id, joker.id]
+	_assert_caches_in_sync(state)
+
+	_, record = make_move(state, create_move(DiscardCaravan, player_id=PlayerId.P1, caravan_id=CaravanId.P1_B))
+	undo_move(state, record)
+
+	# Assert that a discarded caravan is restored as well
+	assert _snapshot(state) == snapshot
@@ -0,0 +1,100 @@
+from collections import Counter
+
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import MoveType, Concede, PlayCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import generate_legal_moves, sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from test.functions import enumerate_legal_moves, create_numeric_card, create_player, initialise_caravans, \
+	create_game_state
+
+
+def test_generated_moves_match_rule_predicates() -> None:
+	for seed in range(6):
+		rng = default_rng(seed)
+		state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(100 + seed)))
+
+		while state.game_phase != GamePhase.FINISHED:
+			generated_moves = generate_legal_moves(state)
+
+			# Assert that exactly the moves passing the "can_*" predicates are generated, each of them once
+			assert Counter(generated_moves) == Counter(enumerate_legal_moves(state))
+
+			moves = [move for move in generated_moves if not isinstance(move, Concede)]
+			apply_move(state, moves[rng.integers(len(moves))])
+
+		# Assert that no moves are generated once the game is over
+		assert generate_legal_moves(state) == []
+
+
+def test_generated_moves_follow_direction_and_suit() -> None:
+	ten = create_numeric_card(Rank.TEN, Suit.HEARTS)
+	six = create_numeric_card(Rank.SIX, Suit.SPADES)
+	four_of_spades = create_numeric_card(Rank.FOUR, Suit.SPADES)
+	eight_of_spades = create_numeric_card(Rank.EIGHT, Suit.SPADES)
+	eight_of_clubs = create_numeric_card(Rank.EIGHT, Suit.CLUBS)
+	six_of_clubs = create_numeric_card(Rank.SIX, Suit.CLUBS)
+	two_of_clubs = create_numeric_card(Rank.TWO, Suit.CLUBS)
+
+	state = create_game_state(
+		players=[create_player([], [four_of_spades, eight_of_spades, eight_of_clubs, six_of_clubs, two_of_clubs]),
+				 create_player([], [create_numeric_card(Rank.TWO, Suit.HEARTS)])],
+		caravans=initialise_caravans(),
+		current_player=PlayerId.P1,
+		game_phase=GamePhase.MAIN,
+		turn_number=9
+	)
+
+	state.get_caravan(CaravanId.P1_A).add_base_card(ten)
+	state.get_caravan(CaravanId.P1_A).add_base_card(six)
+
+	plays_on_descending_caravan = {move.card_id for move in generate_legal_moves(state)
+								   if isinstance(move, PlayCard) and move.caravan_id == CaravanId.P1_A}
+
+	# Assert that lower cards and cards of the current suit can be played, but not another Six or a higher card off suit
+	assert plays_on_descending_caravan == {four_of_spades.id, eight_of_spades.id, two_of_clubs.id}
+
+
+def test_sampled_moves_are_legal_and_uniform() -> None:
+	rng = default_rng(8)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(8)))
+
+	while state.turn_number < 20:
+		moves = [move for move in generate_legal_moves(state) if not isinstance(move, Concede)]
+		apply_move(state, moves[rng.integers(len(moves))])
+
+	legal_moves = generate_legal_moves(state)
+	samples = Counter(sample_legal_move(state, rng) for _ in range(200 * len(legal_moves)))
+
+	# Assert that every legal move, and only those, gets sampled about as often as the others
+	assert set(samples) == set(legal_moves)
+	assert all(100 < count < 300 for count in samples.values())
+
+	weights = {MoveType.CONCEDE: 0.0, MoveType.DISCARD_CARAVAN: 0.0}
+	samples = Counter(sample_legal_move(state, rng, weights) for _ in range(2000))
+
+	# Assert that move types weighted down to zero are never sampled
+	assert set(samples) == {move for move in legal_moves if weights.get(move.move_type, 1.0) > 0}
+
+
+def test_sampled_moves_play_out_games() -> None:
+	for seed in range(4):
+		rng = default_rng(seed)
+		state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=rng))
+
+		while state.game_phase != GamePhase.FINISHED:
+			move = sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0})
+
+			# Assert that the sampled move passes the "can_*" predicates
+			assert move in enumerate_legal_moves(state)
+			apply_move(state, move)
+
+		# Assert that nothing is sampled once the game is over
+		assert sample_legal_move(state, rng) is None
@@ -0,0 +1,64 @@
+from game.caravan.caravan import Caravan
+from game.caravan.enums import CaravanId
+from game.cards.card import PlayedCard
+from game.cards.enums import Rank, Suit
+from game.engine.loop import CAPPED_REASONS, run
+from game.moves.types import DiscardCaravan, DiscardCard, Move
+from game.player.enums import PlayerId
+from game.state.enums import GamePhase, WinReason
+from game.state.game_state import GameResult, GameState
+from test.functions import create_numeric_card, create_player, initialise_caravans, create_game_state
+
+_EMPTY_CARAVANS = {PlayerId.P1: CaravanId.P1_B, PlayerId.P2: CaravanId.P2_A}
+
+
+# Both players keep a card in hand and one in their deck, P1 having sold route A, and do nothing but discard an empty
+# caravan, which goes on forever.
+def _create_cycling_state() -> GameState:
+	caravans = initialise_caravans()
+	caravans[CaravanId.P1_A] = Caravan(id=CaravanId.P1_A, pile=[
+		PlayedCard(base_card=create_numeric_card(rank, Suit.HEARTS)) for rank in (Rank.TEN, Rank.EIGHT, Rank.FIVE)])
+	players = [create_player([create_numeric_card(Rank.TWO, Suit.CLUBS)], [create_numeric_card(Rank.SIX, Suit.CLUBS)])
+			   for _ in PlayerId]
+
+	return create_game_state(players, caravans, PlayerId.P1, GamePhase.MAIN, 10)
+
+
+def _discard_empty_caravan(state: GameState) -> Move:
+	return DiscardCaravan(player_id=state.current_player, caravan_id=_EMPTY_CARAVANS[state.current_player])
+
+
+def test_repeated_positions_end_the_game() -> None:
+	state = _create_cycling_state()
+	game_ends = list()
+
+	result = run(state, _discard_empty_caravan, max_repetitions=3,
+				 on_game_end=lambda _, game_result: game_ends.append(game_result))
+
+	# Assert that the game stops when its starting position comes back a second time, won by the player ahead
+	assert result == GameResult(winner_id=PlayerId.P1, reason=WinReason.REPETITION, end_turn_number=14)
+	assert game_ends == [result]
+	assert state.game_phase == GamePhase.FINISHED
+
+
+def test_turn_cap_ends_the_game() -> None:
+	state = _create_cycling_state()
+
+	result = run(state, _discard_empty_caravan, max_turns=13)
+
+	# Assert that the game stops at the cap, and is told apart from the games played to their end
+	assert result == GameResult(winner_id=PlayerId.P1, reason=WinReason.TURN_LIMIT, end_turn_number=13)
+	assert result.reason in CAPPED_REASONS
+
+
+def test_illegal_moves_count_toward_the_turn_cap() -> None:
+	state = _create_cycling_state()
+	errors = list()
+
+	result = run(state, lambda game_state: DiscardCard(player_id=game_state.current_player, card_id=-1), max_turns=13,
+				 on_error=lambda _, error: errors.append(error))
+
+	# Assert that a player who only makes illegal moves is stopped at the cap, every rejected move counting as a turn
+	assert result == GameResult(winner_id=PlayerId.P1, reason=WinReason.TURN_LIMIT, end_turn_number=10)
+	assert len(errors) == 3
+	assert state.game_phase == GamePhase.FINISHED
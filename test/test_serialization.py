@@ -1,8 +1,9 @@
 import json
+from functools import partial
 from typing import Callable, TypeVar, Tuple
-from uuid import UUID
 
 from game.caravan.enums import CaravanId
+from game.cards.card_id import CardId
 from game.cards.enums import Rank, Suit
 from game.moves.types import Move, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
 from game.player.enums import PlayerId
@@ -14,12 +15,14 @@ from game.setup.game_initializer import init_game
 from game.state.enums import WinReason
 from game.state.game_state import GameResult, GameState
 
+from network.server.functions import create_dumped_state_messages
+from network.shared.card_ids import CardIdMap
 # noinspection PyProtectedMember
 from network.shared.serializers import _game_result_to_payload, _players_to_payload, _caravans_to_payload, \
-	game_state_to_payload, move_to_payload
+	game_state_to_payload, game_state_to_view, move_to_payload
 # noinspection PyProtectedMember
 from network.shared.deserializers import _payload_to_game_result, _payload_to_current_player, _payload_to_game_phase, \
-	_payload_to_players, _payload_to_caravans, payload_to_game_state, payload_to_move
+	_payload_to_players, _payload_to_caravans, payload_to_game_state, payload_to_game_view, payload_to_move
 from test.functions import create_numeric_card, create_move
 
 
@@ -35,7 +38,7 @@ def _init_game_state() -> GameState:
 	return init_game(game_config)
 
 
-def _make_move_prereq() -> Tuple[PlayerId, UUID, CaravanId, UUID]:
+def _make_move_prereq() -> Tuple[PlayerId, CardId, CaravanId, CardId]:
 	hand_card = create_numeric_card(Rank.EIGHT, Suit.HEARTS)
 	hand_card_2 = create_numeric_card(Rank.KING, Suit.HEARTS)
 
@@ -111,9 +114,11 @@ def test_turn_number_serialization() -> None:
 
 
 def test_players_serialization() -> None:
+	card_ids = CardIdMap()
 	state = _init_game_state()
 
-	deserialized_players = _serialize_deserialize(_payload_to_players, _players_to_payload, state.players)
+	deserialized_players = _serialize_deserialize(partial(_payload_to_players, card_ids=card_ids),
+												  partial(_players_to_payload, card_ids=card_ids), state.players)
 
 	# Assert the serialized and deserialized players stay the same.
 	assert state.players == deserialized_players
@@ -128,9 +133,11 @@ def test_players_serialization() -> None:
 
 
 def test_caravans_serialization() -> None:
+	card_ids = CardIdMap()
 	state = _init_game_state()
 
-	deserialized_caravans = _serialize_deserialize(_payload_to_caravans, _caravans_to_payload, state.caravans)
+	deserialized_caravans = _serialize_deserialize(partial(_payload_to_caravans, card_ids=card_ids),
+												   partial(_caravans_to_payload, card_ids=card_ids), state.caravans)
 
 	# Assert the serialized and deserialized caravans stay the same.
 	assert state.caravans == deserialized_caravans
@@ -151,9 +158,11 @@ def test_caravans_serialization() -> None:
 
 
 def test_game_state_serialization() -> None:
+	card_ids = CardIdMap()
 	state = _init_game_state()
 
-	deserialized_game_state = _serialize_deserialize(payload_to_game_state, game_state_to_payload, state)
+	deserialized_game_state = _serialize_deserialize(partial(payload_to_game_state, card_ids=card_ids),
+													 partial(game_state_to_payload, card_ids=card_ids), state)
 
 	# Assert the serialized and deserialized game state stays the same.
 	assert state == deserialized_game_state
@@ -162,13 +171,48 @@ def test_game_state_serialization() -> None:
 								   reason=WinReason.TWO_CARAVANS,
 								   end_turn_number=state.turn_number)
 
-	deserialized_game_state = _serialize_deserialize(payload_to_game_state, game_state_to_payload, state)
+	deserialized_game_state = _serialize_deserialize(partial(payload_to_game_state, card_ids=card_ids),
+													 partial(game_state_to_payload, card_ids=card_ids), state)
 
 	# Assert the serialized and deserialized game state, with a game result, stays the same.
 	assert state == deserialized_game_state
 
 
+def test_game_view_serialization() -> None:
+	card_ids = CardIdMap()
+	state = _init_game_state()
+
+	player_view = _serialize_deserialize(partial(payload_to_game_view, card_ids=card_ids),
+										 partial(game_state_to_view, viewer=PlayerId.P1, card_ids=card_ids), state)
+	spectator_view = _serialize_deserialize(partial(payload_to_game_view, card_ids=card_ids),
+										   partial(game_state_to_view, viewer=None, card_ids=card_ids), state)
+
+	# Assert that a player sees their own hand, and only the sizes of the other hand and of the decks
+	assert player_view.players[PlayerId.P1].hand == state.players[PlayerId.P1].hand
+	assert player_view.players[PlayerId.P2].hand is None
+	assert player_view.players[PlayerId.P2].hand_size == len(state.players[PlayerId.P2].hand)
+	assert player_view.players[PlayerId.P2].deck_size == len(state.players[PlayerId.P2].deck)
+	assert player_view.caravans == state.caravans
+
+	# Assert that a spectator sees no hand at all
+	assert spectator_view.viewer is None
+	assert all(player.hand is None for player in spectator_view.players.values())
+
+
+def test_state_messages_are_dumped_once_per_viewer() -> None:
+	card_ids = CardIdMap()
+	state = _init_game_state()
+
+	messages = create_dumped_state_messages(state, [PlayerId.P1, PlayerId.P2, None, None, None], card_ids)
+
+	# Assert that spectators share one message, and that every view is far smaller than the full state
+	assert set(messages) == {PlayerId.P1, PlayerId.P2, None}
+	assert all(len(message) * 4 < len(json.dumps(game_state_to_payload(state, card_ids))) for message in messages.values())
+	assert card_ids.to_str(next(iter(state.players[PlayerId.P2].hand))) not in messages[PlayerId.P1]
+
+
 def test_play_base_serialization() -> None:
+	card_ids = CardIdMap()
 	player_id, card_id, caravan_id, _ = _make_move_prereq()
 
 	move = create_move(
@@ -178,13 +222,15 @@ def test_play_base_serialization() -> None:
 		caravan_id=caravan_id,
 	)
 
-	deserialized_move = _serialize_deserialize(payload_to_move, move_to_payload, move)
+	deserialized_move = _serialize_deserialize(partial(payload_to_move, card_ids=card_ids), partial(move_to_payload, card_ids=card_ids),
+												move)
 
 	# Assert that the serialized and deserialized move stays the same.
 	assert move == deserialized_move
 
 
 def test_attach_face_serialization() -> None:
+	card_ids = CardIdMap()
 	player_id, card_id, caravan_id, target_card_id = _make_move_prereq()
 
 	move = create_move(
@@ -195,13 +241,15 @@ def test_attach_face_serialization() -> None:
 		target_base_id=target_card_id,
 	)
 
-	deserialized_move = _serialize_deserialize(payload_to_move, move_to_payload, move)
+	deserialized_move = _serialize_deserialize(partial(payload_to_move, card_ids=card_ids), partial(move_to_payload, card_ids=card_ids),
+												move)
 
 	# Assert that the serialized and deserialized move stays the same.
 	assert move == deserialized_move
 
 
 def test_discard_card_serialization() -> None:
+	card_ids = CardIdMap()
 	player_id, card_id, _, _ = _make_move_prereq()
 
 	move = create_move(
@@ -210,13 +258,15 @@ def test_discard_card_serialization() -> None:
 		card_id=card_id,
 	)
 
-	deserialized_move = _serialize_deserialize(payload_to_move, move_to_payload, move)
+	deserialized_move = _serialize_deserialize(partial(payload_to_move, card_ids=card_ids), partial(move_to_payload, card_ids=card_ids),
+												move)
 
 	# Assert that the serialized and deserialized move stays the same.
 	assert move == deserialized_move
 
 
 def test_discard_caravan_serialization() -> None:
+	card_ids = CardIdMap()
 	player_id, _, caravan_id, _ = _make_move_prereq()
 
 	move = create_move(
@@ -225,13 +275,15 @@ def test_discard_caravan_serialization() -> None:
 		caravan_id=caravan_id,
 	)
 
-	deserialized_move = _serialize_deserialize(payload_to_move, move_to_payload, move)
+	deserialized_move = _serialize_deserialize(partial(payload_to_move, card_ids=card_ids), partial(move_to_payload, card_ids=card_ids),
+												move)
 
 	# Assert that the serialized and deserialized move stays the same.
 	assert move == deserialized_move
 
 
 def test_concede_serialization() -> None:
+	card_ids = CardIdMap()
 	player_id, _, _, _ = _make_move_prereq()
 
 	move = create_move(
@@ -239,7 +291,8 @@ def test_concede_serialization() -> None:
 		player_id=player_id,
 	)
 
-	deserialized_move = _serialize_deserialize(payload_to_move, move_to_payload, move)
+	deserialized_move = _serialize_deserialize(partial(payload_to_move, card_ids=card_ids), partial(move_to_payload, card_ids=card_ids),
+												move)
 
 	# Assert that the serialized and deserialized move stays the same.
 	assert move == deserialized_move
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from numpy.random import Generator
+
+from game.agents.random_agent import make_random_agent
+from game.agents.registry import AGENT_FACTORIES
+from game.moves.types import Move
+from game.player.enums import PlayerId
+from game.simulation import simulate as simulate_module
+from game.simulation.simulate import simulate, write_records, main
+from game.state.game_state import GameState
+
+_AGENTS = {PlayerId.P1: "random", PlayerId.P2: "random"}
+
+
+def test_games_replay_the_same_across_workers() -> None:
+	in_process = sorted(simulate(6, _AGENTS, master_seed=7, workers=1, batch_size=4), key=lambda r: r.game_index)
+	in_pool = sorted(simulate(6, _AGENTS, master_seed=7, workers=2, batch_size=2), key=lambda r: r.game_index)
+
+	# Assert that every game is played once, and plays out the same whichever worker picks it up
+	assert [record.game_index for record in in_process] == list(range(6))
+	assert in_process == in_pool
+
+	# Assert that games are complete, with every move accounted to a player
+	assert all(record.move_count == record.p1_move_count + record.p2_move_count > 0 for record in in_process)
+	assert all(record.illegal_move_count == 0 for record in in_process)
+
+	# Assert that another master seed deals other games
+	assert in_process != sorted(simulate(6, _AGENTS, master_seed=8, workers=1), key=lambda r: r.game_index)
+
+
+def test_records_are_written_as_jsonl_and_csv() -> None:
+	records = list(simulate(3, _AGENTS, master_seed=1, workers=1))
+
+	jsonl_stream = io.StringIO()
+	summary = write_records(records, jsonl_stream, "jsonl")
+	rows = [json.loads(line) for line in jsonl_stream.getvalue().splitlines()]
+
+	# Assert that one line is written per game, and that the summary counts every game as won by someone
+	assert [row["game_index"] for row in rows] == [record.game_index for record in records]
+	assert summary.game_count == sum(summary.wins.values()) == 3
+	assert summary.capped_count == sum(row["reason"] in ("turn_limit", "repetition") for row in rows)
+
+	csv_stream = io.StringIO()
+	write_records(records, csv_stream, "csv")
+	csv_rows = list(csv.DictReader(io.StringIO(csv_stream.getvalue())))
+
+	# Assert that the CSV holds the same values under a header
+	assert [int(row["end_turn_number"]) for row in csv_rows] == [row["end_turn_number"] for row in rows]
+	assert [int(row["winner_id"]) for row in csv_rows] == [row["winner_id"] for row in rows]
+
+
+def test_agents_are_closed_after_their_game(monkeypatch: pytest.MonkeyPatch) -> None:
+	closed_agents = list()
+
+	class ClosingAgent:
+		def __init__(self, rng: Generator) -> None:
+			self.get_move = make_random_agent(rng)
+
+		def __call__(self, state: GameState) -> Move:
+			return self.get_move(state)
+
+		def close(self) -> None:
+			closed_agents.append(self)
+
+	monkeypatch.setitem(AGENT_FACTORIES, "closing", ClosingAgent)
+	records = list(simulate(2, {PlayerId.P1: "closing", PlayerId.P2: "random"}, master_seed=3, workers=1))
+
+	# Assert that the agent of every game is closed once the game is over
+	assert len(records) == len(closed_agents) == 2
+
+
+def test_command_line_limits_reach_the_games(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+	output = tmp_path / "records.jsonl"
+	monkeypatch.setattr(sys, "argv", ["simulate", "--games", "3", "--workers", "1", "--max-turns", "6",
+									  "--output", str(output)])
+	main()
+	rows = [json.loads(line) for line in output.read_text().splitlines()]
+
+	# Assert that every game is stopped at the turn cap given on the command line
+	assert len(rows) == 3
+	assert all(row["reason"] == "turn_limit" and row["end_turn_number"] == 6 for row in rows)
+
+	limits = dict()
+
+	def record_limits(*_, max_turns: int | None, max_repetitions: int | None, **__) -> list:
+		limits.update(max_turns=max_turns, max_repetitions=max_repetitions)
+		return list()
+
+	monkeypatch.setattr(simulate_module, "simulate", record_limits)
+	monkeypatch.setattr(sys, "argv", ["simulate", "--max-turns", "0", "--max-repetitions", "0", "--output",
+									  str(output)])
+	main()
+
+	# Assert that 0 turns either check off
+	assert limits == {"max_turns": None, "max_repetitions": None}
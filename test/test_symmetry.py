@@ -0,0 +1,107 @@
+from itertools import permutations
+
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId, RouteId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import apply_move
+from game.moves.types import Concede, MoveType, PlayCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.search.symmetry import IDENTITY, Symmetry, apply_symmetry, canonicalize
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from test.functions import enumerate_legal_moves, create_numeric_card, create_player, initialise_caravans, \
+	create_game_state
+
+
+def _create_played_state(seed: int, move_count: int = 40) -> GameState:
+	rng = default_rng(seed)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+
+	for _ in range(move_count):
+		if apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0})) is not None:
+			break
+
+	return state
+
+
+def test_symmetric_positions_share_their_canonical_form() -> None:
+	state = _create_played_state(3)
+	form = canonicalize(state)
+
+	# Assert that the key is the hash of the representative
+	assert apply_symmetry(state, form.symmetry).zobrist_hash == form.key
+
+	for routes in permutations(RouteId):
+		for suits in permutations(Suit):
+			other_state = apply_symmetry(state, Symmetry(routes=routes, suits=suits))
+			other_form = canonicalize(other_state)
+
+			# Assert that renaming suits and reordering routes leads to the same representative
+			assert other_form.key == form.key
+			assert apply_symmetry(other_state, other_form.symmetry).compute_zobrist_hash() == form.key
+
+
+def test_moves_map_to_the_representative_and_back() -> None:
+	state = apply_symmetry(_create_played_state(5), Symmetry(routes=(RouteId.C, RouteId.A, RouteId.B),
+																   suits=tuple(reversed(Suit))))
+	symmetry = canonicalize(state).symmetry
+	moves = enumerate_legal_moves(state)
+	canonical_moves = [symmetry.to_canonical_move(move) for move in moves]
+
+	# Assert that the moves of the position are those of its representative, and come back as they were
+	assert set(canonical_moves) == set(enumerate_legal_moves(apply_symmetry(state, symmetry)))
+	assert [symmetry.from_canonical_move(move) for move in canonical_moves] == moves
+
+	for move in moves:
+		if isinstance(move, Concede):
+			continue
+
+		moved_state = state.clone()
+		representative = apply_symmetry(state, symmetry)
+		apply_move(moved_state, move)
+		apply_move(representative, symmetry.to_canonical_move(move))
+
+		# Assert that a move and its canonical one lead to symmetric positions
+		assert canonicalize(moved_state).key == canonicalize(representative).key
+
+
+def test_only_symmetric_positions_share_a_key() -> None:
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(4)))
+	keys = dict()
+
+	for move in enumerate_legal_moves(state):
+		if isinstance(move, PlayCard):
+			moved_state = state.clone()
+			apply_move(moved_state, move)
+			keys.setdefault(move.card_id, set()).add(canonicalize(moved_state).key)
+
+	ranks = {state.players[PlayerId.P1].hand[card_id].rank: card_keys for card_id, card_keys in keys.items()}
+
+	# Assert that a card opening any of the routes leads to one class, which differs for cards of other ranks
+	assert all(len(card_keys) == 1 for card_keys in keys.values())
+	assert len(set.union(*ranks.values())) == len(ranks)
+
+
+def test_custom_cards_keep_their_suits() -> None:
+	p1_hand = [create_numeric_card(Rank.FIVE, Suit.HEARTS)]
+	p2_hand = [create_numeric_card(Rank.NINE, Suit.CLUBS)]
+	state = create_game_state([create_player([], p1_hand), create_player([], p2_hand)], initialise_caravans(),
+							  PlayerId.P1, GamePhase.MAIN, 10)
+	moves = [PlayCard(player_id=PlayerId.P1, card_id=p1_hand[0].id, caravan_id=caravan_id)
+			 for caravan_id in (CaravanId.P1_A, CaravanId.P1_C)]
+	forms = list()
+
+	for move in moves:
+		moved_state = state.clone()
+		apply_move(moved_state, move)
+		forms.append(canonicalize(moved_state))
+
+	# Assert that routes are still reordered, with suits left as they are
+	assert forms[0].key == forms[1].key
+	assert forms[1].symmetry.suits == IDENTITY.suits
+	assert forms[1].symmetry.to_canonical_move(moves[1]) == forms[0].symmetry.to_canonical_move(moves[0])
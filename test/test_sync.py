@@ -0,0 +1,124 @@
+import json
+
+from numpy.random import default_rng
+
+from game.moves.types import MoveType, DiscardCard
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from network.client.mirror import StateMirror
+from network.server.sync import StateSync
+from network.shared.deserializers import payload_to_game_view, payload_to_state_delta
+from network.shared.serializers import game_state_to_view
+from network.shared.views import compute_state_digest, apply_state_delta
+
+_VIEWERS = (PlayerId.P1, PlayerId.P2, None)
+
+
+def test_mirrors_follow_the_host_through_deltas() -> None:
+	rng = default_rng(9)
+	sync = StateSync(init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(9))))
+	mirrors = {viewer: StateMirror() for viewer in _VIEWERS}
+	delta_size = 0
+	snapshot_size = 0
+
+	for viewer, message in sync.create_snapshot_messages(_VIEWERS).items():
+		# Assert that snapshots match their digest
+		assert mirrors[viewer].load_snapshot(json.loads(message))
+
+	game_result = None
+
+	while game_result is None:
+		game_result, messages = sync.apply_move(sample_legal_move(sync.state, rng, {MoveType.CONCEDE: 0.0}), _VIEWERS)
+
+		for viewer, mirror in mirrors.items():
+			# Assert that every delta applies, and leaves the mirror as the host's state looks to the viewer
+			assert mirror.apply_delta(json.loads(messages[viewer]))
+			assert mirror.view == payload_to_game_view(json.loads(json.dumps(
+				game_state_to_view(sync.state, viewer, sync.card_ids))), mirror.card_ids)
+
+			# Assert that the digest kept up to date matches the host's, and the one computed from scratch
+			assert mirror.view.digest == compute_state_digest(sync.state, viewer, sync.card_ids)
+			assert mirror.view.digest == mirror.view.compute_digest()
+
+		delta_size += len(messages[None])
+		snapshot_size += len(sync.create_snapshot_messages([None])[None])
+
+	# Assert that the game result reaches the mirrors, and that deltas weigh a fraction of snapshots
+	assert all(mirror.view.game_result == game_result for mirror in mirrors.values())
+	assert delta_size * 4 < snapshot_size
+
+
+def test_missed_deltas_ask_for_a_snapshot() -> None:
+	rng = default_rng(2)
+	sync = StateSync(init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(2))))
+	mirror = StateMirror()
+
+	_, first_messages = sync.apply_move(sample_legal_move(sync.state, rng), [PlayerId.P1])
+
+	# Assert that a delta cannot be applied before a snapshot
+	assert not mirror.apply_delta(json.loads(first_messages[PlayerId.P1]))
+
+	mirror.load_snapshot(json.loads(sync.create_snapshot_messages([PlayerId.P1])[PlayerId.P1]))
+	_, second_messages = sync.apply_move(sample_legal_move(sync.state, rng), [PlayerId.P1])
+	_, third_messages = sync.apply_move(sample_legal_move(sync.state, rng), [PlayerId.P1])
+
+	# Assert that a delta already in the snapshot is skipped, and that a gap is reported
+	assert mirror.apply_delta(json.loads(first_messages[PlayerId.P1]))
+	assert not mirror.apply_delta(json.loads(third_messages[PlayerId.P1]))
+	assert mirror.apply_delta(json.loads(second_messages[PlayerId.P1]))
+	assert mirror.apply_delta(json.loads(third_messages[PlayerId.P1]))
+	assert mirror.view == payload_to_game_view(json.loads(json.dumps(
+		game_state_to_view(sync.state, PlayerId.P1, sync.card_ids))), mirror.card_ids)
+
+
+def test_mirrors_out_of_step_ask_for_a_snapshot() -> None:
+	rng = default_rng(4)
+	sync = StateSync(init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(4))))
+	mirror = StateMirror()
+	mirror.load_snapshot(json.loads(sync.create_snapshot_messages([None])[None]))
+
+	_, messages = sync.apply_move(sample_legal_move(sync.state, rng), [None])
+	assert mirror.apply_delta(json.loads(messages[None]))
+
+	# A move played twice by the client, which no sequence number can tell
+	apply_state_delta(mirror.view, payload_to_state_delta(json.loads(messages[None])["delta"], mirror.card_ids))
+	_, messages = sync.apply_move(sample_legal_move(sync.state, rng), [None])
+
+	# Assert that the next delta shows the mirror is out of step, and that it waits for a snapshot
+	assert not mirror.apply_delta(json.loads(messages[None]))
+	assert mirror.view is None
+
+	message = json.loads(sync.create_snapshot_messages([None])[None])
+	message["digest"] = "0" * 16
+
+	# Assert that a snapshot not matching its digest is refused too
+	assert not mirror.load_snapshot(message)
+
+
+def test_discarded_cards_are_hidden_from_other_viewers() -> None:
+	rng = default_rng(6)
+	sync = StateSync(init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(6))))
+	discard_count = 0
+	game_result = None
+
+	while game_result is None:
+		move = sample_legal_move(sync.state, rng, {MoveType.CONCEDE: 0.0, MoveType.DISCARD_CARD: 4.0})
+		game_result, messages = sync.apply_move(move, _VIEWERS)
+
+		if not isinstance(move, DiscardCard):
+			continue
+
+		discard_count += 1
+		card_str = sync.card_ids.to_str(move.card_id)
+
+		# Assert that the mover is told which card went, and that neither their opponent nor spectators get its id
+		assert json.loads(messages[move.player_id])["delta"]["move"]["card_id"] == card_str
+		assert all(card_str not in messages[viewer] for viewer in _VIEWERS if viewer != move.player_id)
+		assert all(json.loads(messages[viewer])["delta"]["move"]["card_id"] is None
+				   for viewer in _VIEWERS if viewer != move.player_id)
+
+	# Assert that the game had discards to check
+	assert discard_count > 0
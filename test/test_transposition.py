@@ -0,0 +1,34 @@
+from game.search.transposition import Bound, TableEntry, TranspositionTable
+
+
+def _entry(value: int, depth: int) -> TableEntry:
+	return TableEntry(value=value, bound=Bound.EXACT, move=None, depth=depth)
+
+
+def test_table_keeps_deeper_entries_until_the_next_search() -> None:
+	table = TranspositionTable(capacity=6)
+	first_hash, colliding_hash = 3, 3 + table.capacity
+
+	# Assert that the capacity is rounded up to a power of two
+	assert table.capacity == 8
+
+	table.store(first_hash, _entry(1, depth=10))
+	table.store(colliding_hash, _entry(-1, depth=2))
+
+	# Assert that a shallower entry of another position does not take the slot, and is not found
+	assert table.get(first_hash).value == 1
+	assert table.get(colliding_hash) is None
+	assert table.stats.rejections == 1
+
+	table.new_search()
+	table.store(colliding_hash, _entry(-1, depth=2))
+
+	# Assert that entries of an earlier search give way
+	assert table.get(colliding_hash).value == -1
+	assert table.get(first_hash) is None
+	assert table.stats.replacements == 1
+
+	# Assert that lookups are counted
+	assert (table.stats.hits, table.stats.misses) == (2, 2)
+	assert table.stats.hit_rate == 0.5
+	assert len(table) == 1
@@ -0,0 +1,86 @@
+import numpy as np
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.engine.apply import apply_move
+from game.moves.types import Move, MoveType, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from game.vector.actions import ACTION_COUNT, legal_action_masks, decode_actions, sample_action_indices
+from game.vector.batch import GameBatch, batch_from_states
+from game.vector.engine import ACTION_PLAY, ACTION_ATTACH, ACTION_DISCARD, ACTION_DISCARD_CARAVAN, legal_actions, \
+	step_batch
+from test.functions import enumerate_legal_moves
+
+
+def _action_to_move(batch: GameBatch, row: int, state: GameState, action: np.void) -> Move:
+	player_id = state.current_player
+	card_id = int(batch.hands[row, batch.current_players[row], action['slot']])
+	caravan_id = CaravanId(action['caravan'])
+
+	if action['kind'] == ACTION_PLAY:
+		return PlayCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id)
+	if action['kind'] == ACTION_ATTACH:
+		return AttachFaceCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id,
+							  target_base_id=int(batch.piles[row, caravan_id, action['target']]))
+	if action['kind'] == ACTION_DISCARD:
+		return DiscardCard(player_id=player_id, card_id=card_id)
+	if action['kind'] == ACTION_DISCARD_CARAVAN:
+		return DiscardCaravan(player_id=player_id, caravan_id=caravan_id)
+
+	return Concede(player_id=player_id)
+
+
+def _random_states(count: int) -> list[GameState]:
+	rng = default_rng(4)
+	states = list()
+
+	for seed in range(count):
+		state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+
+		# From setup to late game, finished games included.
+		for _ in range(rng.integers(0, 120)):
+			if state.game_phase == GamePhase.FINISHED:
+				break
+
+			apply_move(state, sample_legal_move(state, rng, {MoveType.CONCEDE: 0.0}))
+
+		states.append(state)
+
+	return states
+
+
+def test_masks_match_rule_predicates() -> None:
+	states = _random_states(40)
+	batch = batch_from_states(states)
+	masks = legal_action_masks(batch)
+
+	# Assert that the masks have a fixed width
+	assert masks.shape == (len(states), ACTION_COUNT)
+
+	for row, state in enumerate(states):
+		indices = np.flatnonzero(masks[row])
+		actions = decode_actions(batch_from_states([state] * len(indices)), indices)
+		moves = [_action_to_move(batch, row, state, action) for action in actions]
+
+		# Assert that the legal actions are exactly the moves passing the "can_*" predicates, each of them once
+		assert sorted(map(repr, moves)) == sorted(map(repr, enumerate_legal_moves(state)))
+
+
+def test_sampled_actions_are_legal() -> None:
+	rng = default_rng(9)
+	batch = batch_from_states(_random_states(40))
+	masks = np.zeros((batch.size, ACTION_COUNT), dtype=bool)
+
+	for _ in range(50):
+		legal_action_masks(batch, out=masks)
+		actions = decode_actions(batch, sample_action_indices(masks, rng))
+		playing = batch.phases != GamePhase.FINISHED
+
+		# Assert that every sampled action is accepted by the engine
+		assert legal_actions(batch, actions)[playing].all()
+		assert not step_batch(batch, actions).illegal.any()
@@ -0,0 +1,108 @@
+import numpy as np
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.engine.loop import step
+from game.moves.types import Move, MoveType, PlayCard, AttachFaceCard, DiscardCard, DiscardCaravan, Concede
+from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from game.vector.batch import GameBatch, NO_WINNER, batch_from_states, create_batch
+from game.vector.engine import ACTION_PLAY, ACTION_ATTACH, ACTION_DISCARD, ACTION_DISCARD_CARAVAN, ACTION_CONCEDE, \
+	create_actions, step_batch, reset_games
+from game.vector.tables import NO_CARD, REASON_CODES
+
+_KINDS = {PlayCard: ACTION_PLAY, AttachFaceCard: ACTION_ATTACH, DiscardCard: ACTION_DISCARD,
+		  DiscardCaravan: ACTION_DISCARD_CARAVAN, Concede: ACTION_CONCEDE}
+
+
+def _move_to_action(batch: GameBatch, row: int, move: Move, action: np.void) -> None:
+	action['kind'] = _KINDS[type(move)]
+	player = batch.current_players[row]
+
+	if isinstance(move, (PlayCard, AttachFaceCard, DiscardCard)):
+		action['slot'] = np.flatnonzero(batch.hands[row, player] == move.card_id)[0]
+	if isinstance(move, (PlayCard, AttachFaceCard, DiscardCaravan)):
+		action['caravan'] = move.caravan_id
+	if isinstance(move, AttachFaceCard):
+		action['target'] = np.flatnonzero(batch.piles[row, move.caravan_id] == move.target_base_id)[0]
+
+
+def _action_to_move(batch: GameBatch, row: int, state: GameState, action: np.void) -> Move:
+	player_id = state.current_player
+	card_id = int(batch.hands[row, batch.current_players[row], action['slot']])
+	caravan_id = CaravanId(action['caravan'])
+	target_base_id = int(batch.piles[row, caravan_id, action['target']])
+
+	if action['kind'] == ACTION_PLAY:
+		return PlayCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id)
+	if action['kind'] == ACTION_ATTACH:
+		return AttachFaceCard(player_id=player_id, card_id=card_id, caravan_id=caravan_id, target_base_id=target_base_id)
+	if action['kind'] == ACTION_DISCARD:
+		return DiscardCard(player_id=player_id, card_id=card_id)
+
+	return DiscardCaravan(player_id=player_id, caravan_id=caravan_id)
+
+
+def _assert_same_games(batch: GameBatch, states: list[GameState]) -> None:
+	expected = batch_from_states(states)
+
+	# Assert that both engines hold the same cards in the same places, hand slots following the order of the hands
+	for name in ('hands', 'decks', 'deck_sizes', 'piles', 'pile_sizes', 'kings', 'queens', 'last_queen_suits',
+				 'scores', 'current_players', 'turn_numbers', 'phases'):
+		assert np.array_equal(getattr(batch, name), getattr(expected, name)), name
+
+
+def test_batch_plays_like_the_engine() -> None:
+	rng = default_rng(21)
+	states = [init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(seed)))
+			  for seed in range(16)]
+	batch = batch_from_states(states)
+
+	while any(state.game_phase != GamePhase.FINISHED for state in states):
+		actions = create_actions(len(states))
+		moves = dict()
+
+		for row, state in enumerate(states):
+			if state.game_phase == GamePhase.FINISHED:
+				continue
+
+			# Now and then an action is drawn at random, most likely an illegal one.
+			if rng.random() < 0.2:
+				actions[row] = (rng.integers(4), rng.integers(8), rng.integers(6), rng.integers(6))
+				moves[row] = _action_to_move(batch, row, state, actions[row])
+			else:
+				moves[row] = sample_legal_move(state, rng, {MoveType.CONCEDE: 0.002})
+				_move_to_action(batch, row, moves[row], actions[row])
+
+		step_result = step_batch(batch, actions)
+
+		for row, move in moves.items():
+			expected_result = step(states[row], move)
+
+			# Assert that the same actions are turned down, and the same games won, for the same reasons
+			assert step_result.illegal[row] == (expected_result.error is not None)
+			assert step_result.finished[row] == (expected_result.game_result is not None)
+
+			if expected_result.game_result is not None:
+				assert batch.winners[row] == expected_result.game_result.winner_id - PlayerId.P1
+				assert batch.reasons[row] == REASON_CODES[expected_result.game_result.reason]
+				assert batch.end_turn_numbers[row] == expected_result.game_result.end_turn_number
+
+		_assert_same_games(batch, states)
+
+
+def test_reset_deals_like_init_game() -> None:
+	batch = create_batch(5)
+	reset_games(batch, np.arange(5), default_rng(3))
+
+	cards = np.concatenate([batch.decks[..., :46], batch.hands], axis=-1)
+
+	# Assert that every game starts in setup with two full standard decks dealt into hands of 8
+	assert np.array_equal(np.sort(cards, axis=-1), np.broadcast_to(np.arange(108).reshape(2, 54), (5, 2, 54)))
+	assert (batch.hands != NO_CARD).all() and (batch.deck_sizes == 46).all() and (batch.decks[..., 46:] == NO_CARD).all()
+	assert (batch.phases == GamePhase.SETUP).all() and (batch.winners == NO_WINNER).all()
@@ -1,10 +1,18 @@
+from numpy.random import default_rng
+
 from game.caravan.enums import CaravanId
 from game.cards.enums import Rank, Suit
-from game.engine.apply import apply_move
-from game.moves.types import Concede, PlayCard
+from game.engine.apply import apply_move, make_move
+from game.engine.journal import undo_move
+from game.moves.types import MoveType, Concede, PlayCard
 from game.player.enums import PlayerId
+from game.rules.legal_moves import sample_legal_move
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
 from game.state.enums import GamePhase, WinReason
 from game.state.game_state import GameResult
+from game.state.victory_cache import VictoryCache
 from test.functions import create_player, initialise_caravans, create_game_state, create_move, create_numeric_card
 
 
@@ -309,3 +317,24 @@ def test_player_sells_caravan_but_loses():
 
 	# Assert that the game phase has changed to FINISHED
 	assert game_state.game_phase == GamePhase.FINISHED
+
+
+def test_cached_victory_matches_full_check():
+	for seed in range(8):
+		rng = default_rng(seed)
+		game_state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=rng))
+
+		while game_state.game_phase != GamePhase.FINISHED:
+			move = sample_legal_move(game_state, rng, {MoveType.CONCEDE: 0.0})
+
+			uncached_state = game_state.clone()
+			uncached_state.victory_cache = VictoryCache()
+
+			game_result, record = make_move(game_state, move)
+
+			# Assert that the cached routes and card counts give the same result as checking everything again
+			assert game_result == apply_move(uncached_state, move)
+
+			# Taking back a move now and then marks the routes and players it touched as dirty as well.
+			if game_result is None and rng.random() < 0.2:
+				undo_move(game_state, record)
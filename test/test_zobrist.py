@@ -0,0 +1,82 @@
+from numpy.random import default_rng
+
+from game.caravan.enums import CaravanId
+from game.cards.enums import Rank, Suit
+from game.engine.apply import make_move, apply_move
+from game.engine.journal import undo_move
+from game.moves.types import Concede, PlayCard
+from game.player.enums import PlayerId
+from game.search.determinization import sample_determinizations
+from game.setup.deck_builder import build_standard_deck
+from game.setup.game_config import GameConfig
+from game.setup.game_initializer import init_game
+from game.state.enums import GamePhase
+from game.state.game_state import GameState
+from test.functions import enumerate_legal_moves, create_numeric_card, create_player, initialise_caravans, \
+	create_game_state
+
+
+def test_hash_follows_moves_and_undos() -> None:
+	rng = default_rng(6)
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(6)))
+	history = list()
+
+	for _ in range(200):
+		moves = [move for move in enumerate_legal_moves(state) if not isinstance(move, Concede)]
+
+		if not moves or state.game_phase == GamePhase.FINISHED:
+			break
+
+		previous_hash = state.zobrist_hash
+		game_result, record = make_move(state, moves[rng.integers(len(moves))])
+		history.append((previous_hash, record))
+
+		# Assert that the hash kept up to date matches the one computed from scratch, Jacks and Jokers included
+		assert state.zobrist_hash == state.compute_zobrist_hash()
+
+		if game_result is not None:
+			break
+
+	for previous_hash, record in reversed(history):
+		undo_move(state, record)
+
+		# Assert that undoing a move brings its hash back
+		assert state.zobrist_hash == previous_hash
+
+
+def _create_transposition_state() -> tuple[GameState, list[PlayCard]]:
+	p1_hand = [create_numeric_card(Rank.FIVE, Suit.HEARTS), create_numeric_card(Rank.SEVEN, Suit.SPADES)]
+	p2_hand = [create_numeric_card(Rank.NINE, Suit.CLUBS)]
+	p1_deck = [create_numeric_card(Rank.TWO, Suit.CLUBS) for _ in range(3)]
+	p2_deck = [create_numeric_card(Rank.THREE, Suit.CLUBS) for _ in range(3)]
+	state = create_game_state([create_player(p1_deck, p1_hand), create_player(p2_deck, p2_hand)], initialise_caravans(),
+							  PlayerId.P1, GamePhase.MAIN, 10)
+
+	moves = [PlayCard(player_id=PlayerId.P1, card_id=p1_hand[0].id, caravan_id=CaravanId.P1_A),
+			 PlayCard(player_id=PlayerId.P2, card_id=p2_hand[0].id, caravan_id=CaravanId.P2_A),
+			 PlayCard(player_id=PlayerId.P1, card_id=p1_hand[1].id, caravan_id=CaravanId.P1_B)]
+
+	return state, moves
+
+
+def test_same_position_reached_in_another_order_hashes_the_same() -> None:
+	state, moves = _create_transposition_state()
+	other_state = state.clone()
+
+	for move in moves:
+		apply_move(state, move)
+
+	for move in [moves[2], moves[1], moves[0]]:
+		apply_move(other_state, move)
+
+	# Assert that the positions transpose to the same hash, which differs from the starting one
+	assert state.zobrist_hash == other_state.zobrist_hash
+	assert state.zobrist_hash != _create_transposition_state()[0].zobrist_hash
+
+
+def test_determinizations_are_hashed() -> None:
+	state = init_game(GameConfig(deck_builder=build_standard_deck, random_generator=default_rng(2)))
+
+	for determinization in sample_determinizations(state, PlayerId.P1, 4, default_rng(0)):
+		# Assert that dealing the opponent a new hand updates the hash of the sample
+		assert determinization.zobrist_hash == determinization.compute_zobrist_hash()